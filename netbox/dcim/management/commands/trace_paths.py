@@ -1,10 +1,16 @@
+import multiprocessing
+import time
+from functools import partial
+
+from django.apps import apps
+from django.contrib.contenttypes.models import ContentType
 from django.core.management.base import BaseCommand
 from django.core.management.color import no_style
-from django.db import connection
+from django.db import connection, connections, transaction
 from django.db.models import Q
 
 from dcim.models import CablePath, ConsolePort, ConsoleServerPort, Interface, PowerFeed, PowerOutlet, PowerPort
-from dcim.signals import create_cablepath
+from dcim.utils import compile_path_node, create_cablepaths
 
 ENDPOINT_MODELS = (
     ConsolePort,
@@ -16,6 +22,19 @@ ENDPOINT_MODELS = (
 )
 
 
+def trace_origins(model_label, pks):
+    """
+    Trace and save the CablePaths originating from a batch of endpoints. Each batch is committed in its own
+    transaction, so that an interrupted run can be resumed without retracing completed batches.
+    """
+    model = apps.get_model(model_label)
+    ct = ContentType.objects.get_for_model(model)
+    with transaction.atomic():
+        create_cablepaths([[compile_path_node(ct.pk, pk)] for pk in pks])
+
+    return len(pks)
+
+
 class Command(BaseCommand):
     help = "Generate any missing cable paths among all cable termination objects in NetBox"
 
@@ -28,15 +47,39 @@ class Command(BaseCommand):
             "--no-input", action='store_true', dest='no_input',
             help="Do not prompt user for any input/confirmation"
         )
+        parser.add_argument(
+            "--workers", type=int, default=1,
+            help="Number of worker processes among which to divide tracing (default: 1)"
+        )
+        parser.add_argument(
+            "--batch-size", type=int, default=1000, dest='batch_size',
+            help="Number of endpoints to trace and save together (default: 1000)"
+        )
 
-    def draw_progress_bar(self, percentage):
+    def draw_progress_bar(self, percentage, rate=None):
         """
-        Draw a simple progress bar 20 increments wide illustrating the specified percentage.
+        Draw a simple progress bar 20 increments wide illustrating the specified percentage, followed by the current
+        throughput (if specified).
         """
         bar_size = int(percentage / 5)
-        self.stdout.write(f"\r  [{'#' * bar_size}{' ' * (20-bar_size)}] {int(percentage)}%", ending='')
+        throughput = f' ({rate:.0f} paths/sec)' if rate is not None else ''
+        self.stdout.write(f"\r  [{'#' * bar_size}{' ' * (20-bar_size)}] {int(percentage)}%{throughput}", ending='')
+
+    def trace_batches(self, model, batches, pool):
+        """
+        Trace each batch of origins, either in-process or using the given pool of worker processes. Yields the number of
+        origins traced as each batch completes.
+        """
+        func = partial(trace_origins, model._meta.label)
+        if pool is None:
+            yield from map(func, batches)
+        else:
+            yield from pool.imap_unordered(func, batches)
 
     def handle(self, *model_names, **options):
+        if options['workers'] < 1 or options['batch_size'] < 1:
+            self.stderr.write(self.style.ERROR("The number of workers and batch size must be positive integers."))
+            return
 
         # If --force was passed, first delete all existing CablePaths
         if options['force']:
@@ -66,25 +109,56 @@ class Command(BaseCommand):
                 for sql in sequence_sql:
                     cursor.execute(sql)
 
+        # Start worker processes (if any). Database connections are closed first so that none are inherited by the
+        # workers, each of which opens its own connection.
+        pool = None
+        if options['workers'] > 1:
+            connections.close_all()
+            pool = multiprocessing.get_context('fork').Pool(processes=options['workers'])
+            self.stdout.write(f"Tracing with {options['workers']} worker processes")
+
         # Retrace paths
-        for model in ENDPOINT_MODELS:
-            params = Q(cable__isnull=False)
-            if hasattr(model, 'wireless_link'):
-                params |= Q(wireless_link__isnull=False)
-            origins = model.objects.filter(params)
-            if not options['force']:
-                origins = origins.filter(_path__isnull=True)
-            origins_count = origins.count()
-            if not origins_count:
-                self.stdout.write(f'Found no missing {model._meta.verbose_name} paths; skipping')
-                continue
-            self.stdout.write(f'Retracing {origins_count} cabled {model._meta.verbose_name_plural}...')
-            i = 0
-            for i, obj in enumerate(origins, start=1):
-                create_cablepath([obj])
-                if not i % 100:
-                    self.draw_progress_bar(i * 100 / origins_count)
-            self.draw_progress_bar(100)
-            self.stdout.write(self.style.SUCCESS(f'\n  Retraced {i} {model._meta.verbose_name_plural}'))
+        try:
+            for model in ENDPOINT_MODELS:
+                params = Q(cable__isnull=False)
+                if hasattr(model, 'wireless_link'):
+                    params |= Q(wireless_link__isnull=False)
+                origins = model.objects.filter(params)
+                # Origins which already have a path are skipped (including those completed by an interrupted run)
+                if not options['force']:
+                    origins = origins.filter(_path__isnull=True)
+                origin_ids = list(origins.order_by('pk').values_list('pk', flat=True))
+                origins_count = len(origin_ids)
+                if not origins_count:
+                    self.stdout.write(f'Found no missing {model._meta.verbose_name} paths; skipping')
+                    continue
+                self.stdout.write(f'Retracing {origins_count} cabled {model._meta.verbose_name_plural}...')
+
+                batch_size = options['batch_size']
+                batches = [origin_ids[i:i + batch_size] for i in range(0, origins_count, batch_size)]
+                start = time.monotonic()
+                i = 0
+                for count in self.trace_batches(model, batches, pool):
+                    i += count
+                    self.draw_progress_bar(i * 100 / origins_count, rate=i / max(time.monotonic() - start, 0.001))
+                elapsed = max(time.monotonic() - start, 0.001)
+                self.stdout.write(self.style.SUCCESS(
+                    f'\n  Retraced {i} {model._meta.verbose_name_plural} in {elapsed:.2f} seconds '
+                    f'({i / elapsed:.0f} paths/sec)'
+                ))
+
+        except KeyboardInterrupt:
+            if pool is not None:
+                pool.terminate()
+            self.stdout.write(self.style.WARNING(
+                "\nInterrupted. Completed batches have been saved; run this command again (without --force) to "
+                "resume tracing the remaining paths."
+            ))
+            return
+
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
 
         self.stdout.write(self.style.SUCCESS('Finished.'))
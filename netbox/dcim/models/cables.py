@@ -3,6 +3,7 @@ from collections import defaultdict
 
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
+from django.contrib.postgres.indexes import GinIndex
 from django.core.exceptions import ValidationError
 from django.db import models
 from django.db.models import Sum
@@ -374,7 +375,8 @@ class CablePath(models.Model):
     if the instance represents a complete end-to-end path from origin(s) to destination(s). `is_split` is True if the
     path diverges across multiple cables.
 
-    `_nodes` retains a flattened list of all nodes within the path to enable simple filtering.
+    `_nodes` retains a flattened list of all nodes within the path to enable simple filtering. It is indexed (GIN) so
+    that the paths traversing any given node can be found without scanning the table.
     """
     path = models.JSONField(
         default=list
@@ -390,6 +392,11 @@ class CablePath(models.Model):
     )
     _nodes = PathField()
 
+    class Meta:
+        indexes = (
+            GinIndex(fields=('_nodes',), name='dcim_cablepath_nodes'),
+        )
+
     def __str__(self):
         return f"Path #{self.pk}: {len(self.path)} hops"
 
@@ -452,6 +459,9 @@ class CablePath(models.Model):
         Create a new CablePath instance as traced from the given termination objects. These can be any object to which a
         Cable or WirelessLink connects (interfaces, console ports, circuit termination, etc.). All terminations must be
         of the same type and must belong to the same parent object.
+
+        This method queries the database at each hop. To trace many paths efficiently, use CableGraph (in
+        dcim.tracing), which produces identical results from a few bulk queries.
         """
         from circuits.models import CircuitTermination
 
@@ -601,7 +611,9 @@ class CablePath(models.Model):
         """
         Retrace the path from the currently-defined originating termination(s)
         """
-        _new = self.from_origin(self.origins)
+        from dcim.tracing import CableGraph
+
+        _new = CableGraph().retrace_many([self])[0]
         if _new:
             self.path = _new.path
             self.is_complete = _new.is_complete
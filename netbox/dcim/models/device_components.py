@@ -516,7 +516,10 @@ class BaseInterface(models.Model):
 
         # Only "tagged" interfaces may have tagged VLANs assigned. ("tagged all" implies all VLANs are assigned.)
         if self.pk and self.mode != InterfaceModeChoices.MODE_TAGGED:
-            self.tagged_vlans.clear()
+            # Skip clearing tagged VLANs which have been prefetched and found to be empty
+            prefetched = getattr(self, '_prefetched_objects_cache', {}).get('tagged_vlans')
+            if prefetched is None or prefetched:
+                self.tagged_vlans.clear()
 
         return super().save(*args, **kwargs)
 
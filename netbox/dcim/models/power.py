@@ -7,6 +7,7 @@ from django.urls import reverse
 
 from dcim.choices import *
 from dcim.constants import *
+from dcim.querysets import PowerFeedQuerySet
 from netbox.config import ConfigItem
 from netbox.models import NetBoxModel
 from utilities.validators import ExclusionValidator
@@ -131,6 +132,8 @@ class PowerFeed(NetBoxModel, PathEndpoint, CabledObjectModel):
         blank=True
     )
 
+    objects = PowerFeedQuerySet.as_manager()
+
     clone_fields = (
         'power_panel', 'rack', 'status', 'type', 'mark_connected', 'supply', 'phase', 'voltage', 'amperage',
         'max_utilization',
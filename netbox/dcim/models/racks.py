@@ -13,12 +13,12 @@ from django.urls import reverse
 
 from dcim.choices import *
 from dcim.constants import *
+from dcim.querysets import RackQuerySet
 from dcim.svg import RackElevationSVG
 from netbox.models import OrganizationalModel, NetBoxModel
 from utilities.choices import ColorChoices
 from utilities.fields import ColorField, NaturalOrderingField
 from utilities.utils import array_to_string, drange
-from .device_components import PowerOutlet, PowerPort
 from .devices import Device
 from .power import PowerFeed
 
@@ -184,6 +184,8 @@ class Rack(NetBoxModel):
         to='extras.ImageAttachment'
     )
 
+    objects = RackQuerySet.as_manager()
+
     clone_fields = (
         'site', 'location', 'tenant', 'status', 'role', 'type', 'width', 'u_height', 'desc_units', 'outer_width',
         'outer_depth', 'outer_unit',
@@ -329,31 +331,38 @@ class Rack(NetBoxModel):
         :param rack_face: The face of the rack (front or rear) required; 'None' if device is full depth
         :param exclude: List of devices IDs to exclude (useful when moving a device within a rack)
         """
-        # Gather all devices which consume U space within the rack
-        devices = self.devices.prefetch_related('device_type').filter(position__gte=1)
-        if exclude is not None:
-            devices = devices.exclude(pk__in=exclude)
-
-        # Initialize the rack unit skeleton
-        units = list(self.units)
-
-        # Remove units consumed by installed devices
-        for d in devices:
-            if rack_face is None or d.face == rack_face or d.device_type.is_full_depth:
-                for u in drange(d.position, d.position + d.device_type.u_height, 0.5):
-                    try:
-                        units.remove(u)
-                    except ValueError:
-                        # Found overlapping devices in the rack!
-                        pass
-
-        # Remove units without enough space above them to accommodate a device of the specified height
-        available_units = []
-        for u in units:
-            if set(drange(u, u + u_height, 0.5)).issubset(units):
-                available_units.append(u)
-
-        return list(reversed(available_units))
+        free_units = ~self.get_occupied_units(rack_face=rack_face, exclude=exclude) & ((1 << self.u_height * 2) - 1)
+
+        # Find the units with enough free space above them to accommodate a device of the specified height
+        available_units = free_units
+        for i in range(1, int(u_height * 2)):
+            available_units &= free_units >> i
+
+        return [u for u in reversed(list(self.units)) if available_units >> int((u - 1) * 2) & 1]
+
+    def get_occupied_units(self, rack_face=None, exclude=None):
+        """
+        Return a bitmap of the half-units within the rack occupied by devices, as an integer in which bit n represents
+        unit 1 + n/2. (For example, bits 0 and 1 represent the lower and upper halves of U1.)
+
+        :param rack_face: The face of the rack (front or rear); 'None' to include devices mounted on either face
+        :param exclude: List of devices IDs to exclude
+        """
+        if hasattr(self, '_mounted_devices'):
+            # Devices have been prefetched (see RackQuerySet.prefetch_utilization())
+            devices = self._mounted_devices
+        else:
+            devices = self.devices.filter(position__gte=1).select_related('device_type')
+
+        occupied_units = 0
+        for device in devices:
+            if exclude is not None and device.pk in exclude:
+                continue
+            if rack_face is None or device.face == rack_face or device.device_type.is_full_depth:
+                height = int(device.device_type.u_height * 2)
+                occupied_units |= ((1 << height) - 1) << int((device.position - 1) * 2)
+
+        return occupied_units & ((1 << self.u_height * 2) - 1)
 
     def get_reserved_units(self):
         """
@@ -431,20 +440,16 @@ class Rack(NetBoxModel):
         """
         Determine the utilization rate of power in the rack and return it as a percentage.
         """
-        powerfeeds = PowerFeed.objects.filter(rack=self)
+        if hasattr(self, '_powerfeeds'):
+            # Power feeds have been prefetched (see RackQuerySet.prefetch_utilization())
+            powerfeeds = self._powerfeeds
+        else:
+            powerfeeds = PowerFeed.objects.filter(rack=self).annotate_allocated_draw()
         available_power_total = sum(pf.available_power for pf in powerfeeds)
         if not available_power_total:
             return 0
 
-        powerports = []
-        for powerfeed in powerfeeds:
-            powerports.extend([
-                peer for peer in powerfeed.link_peers if isinstance(peer, PowerPort)
-            ])
-
-        allocated_draw = sum([
-            powerport.get_power_draw()['allocated'] for powerport in powerports
-        ])
+        allocated_draw = sum(pf.allocated_draw for pf in powerfeeds)
 
         return int(allocated_draw / available_power_total * 100)
 
@@ -0,0 +1,84 @@
+from django.db.models import Case, Exists, Func, IntegerField, OuterRef, Prefetch, Q, Subquery, Value, When
+from django.db.models.functions import Coalesce
+
+from utilities.querysets import RestrictedQuerySet
+
+
+def _sum(queryset, field):
+    """
+    Return a subquery expression which sums the given field over a (correlated) queryset.
+    """
+    return Coalesce(
+        Subquery(
+            queryset.order_by().annotate(
+                total=Func(field, function='SUM', output_field=IntegerField())
+            ).values('total')[:1],
+            output_field=IntegerField()
+        ),
+        Value(0)
+    )
+
+
+class PowerFeedQuerySet(RestrictedQuerySet):
+
+    def annotate_allocated_draw(self):
+        """
+        Annotate the total allocated draw (in VA) of the PowerPorts connected to each PowerFeed by cable. This is
+        equivalent to summing PowerPort.get_power_draw()['allocated'] for the link peers of each feed: A PowerPort which
+        defines neither an allocated nor a maximum draw is attributed the allocated draw of the PowerPorts connected to
+        its PowerOutlets.
+        """
+        from dcim.models import PowerOutlet, PowerPort
+
+        # PowerPorts connected to the PowerOutlets of a PowerPort
+        downstream_powerports = PowerPort.objects.filter(
+            Exists(
+                PowerOutlet.objects.filter(
+                    ~Q(cable_end=OuterRef('cable_end')),
+                    power_port=OuterRef(OuterRef('pk')),
+                    cable=OuterRef('cable')
+                )
+            )
+        )
+
+        # PowerPorts connected to the PowerFeed
+        powerports = PowerPort.objects.filter(
+            ~Q(cable_end=OuterRef('cable_end')),
+            cable=OuterRef('cable')
+        ).annotate(
+            draw=Case(
+                When(allocated_draw__isnull=True, maximum_draw__isnull=True, then=_sum(
+                    downstream_powerports, 'allocated_draw'
+                )),
+                default=Coalesce('allocated_draw', Value(0)),
+                output_field=IntegerField()
+            )
+        )
+
+        return self.annotate(
+            allocated_draw=_sum(powerports, 'draw')
+        )
+
+
+class RackQuerySet(RestrictedQuerySet):
+
+    def prefetch_utilization(self):
+        """
+        Prefetch the devices, reservations, and power feeds of each Rack, such that its space and power utilization
+        can be determined without further queries (see Rack.get_utilization() and Rack.get_power_utilization()).
+        """
+        from dcim.models import Device, PowerFeed
+
+        return self.prefetch_related(
+            Prefetch(
+                'devices',
+                queryset=Device.objects.filter(position__gte=1).select_related('device_type'),
+                to_attr='_mounted_devices'
+            ),
+            'reservations',
+            Prefetch(
+                'powerfeed_set',
+                queryset=PowerFeed.objects.annotate_allocated_draw(),
+                to_attr='_powerfeeds'
+            )
+        )
@@ -6,7 +6,7 @@ from django.dispatch import receiver
 from .choices import CableEndChoices, LinkStatusChoices
 from .models import Cable, CablePath, CableTermination, Device, PathEndpoint, PowerPanel, Rack, Location, VirtualChassis
 from .models.cables import trace_paths
-from .utils import create_cablepath, rebuild_paths
+from .utils import create_cablepath, rebuild_paths, retrace_cablepaths
 
 
 #
@@ -109,8 +109,7 @@ def retrace_cable_paths(instance, **kwargs):
     """
     When a Cable is deleted, check for and update its connected endpoints
     """
-    for cablepath in CablePath.objects.filter(_nodes__contains=instance):
-        cablepath.retrace()
+    retrace_cablepaths(CablePath.objects.filter(_nodes__contains=instance))
 
 
 @receiver(post_delete, sender=CableTermination)
@@ -121,5 +120,4 @@ def nullify_connected_endpoints(instance, **kwargs):
     model = instance.termination_type.model_class()
     model.objects.filter(pk=instance.termination_id).update(cable=None, cable_end='')
 
-    for cablepath in CablePath.objects.filter(_nodes__contains=instance.cable):
-        cablepath.retrace()
+    retrace_cablepaths(CablePath.objects.filter(_nodes__contains=instance.cable))
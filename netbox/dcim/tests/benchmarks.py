@@ -0,0 +1,307 @@
+from django.contrib.auth.models import User
+from django.contrib.contenttypes.models import ContentType
+from django.test import Client, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from dcim.models import *
+from dcim.tracing import CableGraph
+from dcim.utils import rebuild_paths
+from extras.models import ExportTemplate, ObjectChange
+from tenancy.models import Tenant
+from users.models import Token
+from utilities.testing import BenchmarkTestCase, create_test_device
+
+
+class CablePathBenchmark(BenchmarkTestCase):
+    """
+    Compare CablePath.from_origin() with CableGraph on a synthetic topology of patch panels trunked in series:
+
+        [Device A] --- [Panel 1] === [Panel 2] --- [Panel 3] === [Panel 4] --- ... --- [Device B]
+
+    Each device interface is patched to a front port of the adjacent panel; each pair of panels is joined by a single
+    trunk cable between multi-position rear ports.
+    """
+    POSITIONS = 24
+    PANEL_PAIRS = 3
+
+    @classmethod
+    def setUpTestData(cls):
+        device_a = create_test_device('Device A')
+        device_b = create_test_device('Device B')
+        cls.interfaces = [
+            Interface.objects.create(device=device, name=f'Interface {i}')
+            for device in (device_a, device_b) for i in range(1, cls.POSITIONS + 1)
+        ]
+
+        # Create pairs of panels joined by a trunk cable
+        panels = []
+        cls.trunks = []
+        for i in range(1, cls.PANEL_PAIRS * 2 + 1):
+            panel = create_test_device(f'Panel {i}')
+            rear_port = RearPort.objects.create(device=panel, name='Trunk', positions=cls.POSITIONS)
+            panels.append([
+                FrontPort.objects.create(device=panel, name=f'Port {p}', rear_port=rear_port, rear_port_position=p)
+                for p in range(1, cls.POSITIONS + 1)
+            ])
+            if not i % 2:
+                trunk = Cable(a_terminations=[panels[-2][0].rear_port], b_terminations=[rear_port])
+                trunk.save()
+                cls.trunks.append(trunk)
+
+        # Patch devices and adjacent panels together
+        front_ports = [cls.interfaces[:cls.POSITIONS], *panels, cls.interfaces[cls.POSITIONS:]]
+        for a_ports, b_ports in zip(front_ports[::2], front_ports[1::2]):
+            for a_port, b_port in zip(a_ports, b_ports):
+                Cable(a_terminations=[a_port], b_terminations=[b_port]).save()
+
+        # Refresh interfaces to pick up their cable assignments
+        cls.interfaces = list(Interface.objects.filter(pk__in=[i.pk for i in cls.interfaces]))
+
+    def test_trace_single_path(self):
+        origins = self.interfaces[:1]
+
+        reference = self.benchmark('CablePath.from_origin() (1 path)', CablePath.from_origin, origins)
+        cablepath = self.benchmark('CableGraph.trace() (1 path)', CableGraph().trace, origins)
+        self.assertEqual(cablepath.path, reference.path)
+
+    def test_trace_all_paths(self):
+        origins = [[interface] for interface in self.interfaces]
+
+        reference = self.benchmark(
+            f'CablePath.from_origin() ({len(origins)} paths)',
+            lambda: [CablePath.from_origin(terminations) for terminations in origins]
+        )
+        cablepaths = self.benchmark(
+            f'CableGraph.trace_many() ({len(origins)} paths)',
+            CableGraph().trace_many, origins
+        )
+        for cablepath, ref in zip(cablepaths, reference):
+            self.assertTrue(cablepath.is_complete)
+            self.assertEqual(cablepath.path, ref.path)
+
+    def test_rebuild_paths(self):
+        self.benchmark(f'rebuild_paths() ({self.POSITIONS * 2} paths)', rebuild_paths, self.trunks[:1])
+        self.assertEqual(CablePath.objects.filter(is_complete=True).count(), self.POSITIONS * 2)
+
+    def test_delete_trunk_cable(self):
+        trunk = self.trunks[0]
+        cablepaths = list(CablePath.objects.filter(_nodes__contains=trunk))
+
+        self.benchmark(
+            f'CablePath.from_origin() retrace ({len(cablepaths)} paths)',
+            lambda: [CablePath.from_origin(cp.origins) for cp in cablepaths]
+        )
+        self.benchmark(f'Cable.delete() (trunk carrying {len(cablepaths)} paths)', trunk.delete)
+        self.assertFalse(CablePath.objects.filter(is_complete=True).exists())
+
+
+class InterfaceBulkAPIBenchmark(BenchmarkTestCase):
+    """
+    Measure bulk modification and deletion of many interfaces through the REST API.
+    """
+    INTERFACES = 1000
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_superuser(username='testuser')
+        cls.token = Token.objects.create(user=cls.user)
+        devices = [create_test_device(f'Device {i}') for i in range(10)]
+        Interface.objects.bulk_create([
+            Interface(device=devices[i % 10], name=f'Interface {i}', type='1000base-t') for i in range(cls.INTERFACES)
+        ])
+
+    def setUp(self):
+        self.client = APIClient()
+        self.header = {'HTTP_AUTHORIZATION': f'Token {self.token.key}'}
+
+    def test_bulk_update(self):
+        url = reverse('dcim-api:interface-list')
+        data = [{'id': pk, 'description': 'New description'} for pk in Interface.objects.values_list('pk', flat=True)]
+
+        response = self.benchmark(
+            f'Bulk update {self.INTERFACES} interfaces', self.client.patch, url, data, format='json', **self.header
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Interface.objects.filter(description='New description').count(), self.INTERFACES)
+        self.assertEqual(ObjectChange.objects.count(), self.INTERFACES)
+
+    def test_bulk_delete(self):
+        url = reverse('dcim-api:interface-list')
+        data = [{'id': pk} for pk in Interface.objects.values_list('pk', flat=True)]
+
+        response = self.benchmark(
+            f'Bulk delete {self.INTERFACES} interfaces', self.client.delete, url, data, format='json', **self.header
+        )
+        self.assertEqual(response.status_code, 204)
+        self.assertFalse(Interface.objects.exists())
+        self.assertEqual(ObjectChange.objects.count(), self.INTERFACES)
+
+
+@override_settings(EXEMPT_VIEW_PERMISSIONS=['*'])
+class BulkImportBenchmark(BenchmarkTestCase):
+    """
+    Measure the import of many objects from CSV data, each referencing related objects by name.
+    """
+    OBJECTS = 2000
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_superuser(username='testuser')
+        for i in range(10):
+            Region.objects.create(name=f'Region {i}', slug=f'region-{i}')
+            Tenant.objects.create(name=f'Tenant {i}', slug=f'tenant-{i}')
+            create_test_device(f'Device {i}')
+
+    def setUp(self):
+        self.client = Client()
+        self.client.force_login(self.user)
+
+    def test_import_sites(self):
+        csv_data = 'name,slug,status,region,tenant.slug\n' + '\n'.join(
+            f'Imported site {i},imported-site-{i},active,Region {i % 10},tenant-{i % 10}' for i in range(self.OBJECTS)
+        )
+        initial_count = Site.objects.count()
+
+        response = self.benchmark(
+            f'Import {self.OBJECTS} sites', self.client.post, reverse('dcim:site_import'), {'csv': csv_data}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Site.objects.count(), initial_count + self.OBJECTS)
+        self.assertEqual(ObjectChange.objects.filter(changed_object_type__model='site').count(), self.OBJECTS)
+
+    def test_import_interfaces(self):
+        csv_data = 'device,name,type\n' + '\n'.join(
+            f'Device {i % 10},Interface {i},1000base-t' for i in range(self.OBJECTS)
+        )
+
+        response = self.benchmark(
+            f'Import {self.OBJECTS} interfaces', self.client.post, reverse('dcim:interface_import'), {'csv': csv_data}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Interface.objects.count(), self.OBJECTS)
+
+
+@override_settings(EXEMPT_VIEW_PERMISSIONS=['*'])
+class RackUtilizationBenchmark(BenchmarkTestCase):
+    """
+    Measure the computation of space and power utilization for many racks within a site, each populated with devices,
+    a reservation, and a power feed supplying a PDU.
+    """
+    RACKS = 500
+    DEVICES_PER_RACK = 10
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_superuser(username='testuser')
+        site = Site.objects.create(name='Site 1', slug='site-1')
+        manufacturer = Manufacturer.objects.create(name='Manufacturer 1', slug='manufacturer-1')
+        device_type = DeviceType.objects.create(manufacturer=manufacturer, model='Device Type 1', slug='device-type-1')
+        device_role = DeviceRole.objects.create(name='Device Role 1', slug='device-role-1')
+        power_panel = PowerPanel.objects.create(site=site, name='Power Panel 1')
+
+        racks = Rack.objects.bulk_create([Rack(site=site, name=f'Rack {i}') for i in range(cls.RACKS)])
+        RackReservation.objects.bulk_create([
+            RackReservation(rack=rack, units=[40, 41, 42], user=cls.user, description='Reserved') for rack in racks
+        ])
+        devices = Device.objects.bulk_create([
+            Device(
+                site=site, rack=rack, name=f'Device {rack.pk}-{i}', device_type=device_type, device_role=device_role,
+                position=i * 2 + 1, face='front'
+            ) for rack in racks for i in range(cls.DEVICES_PER_RACK)
+        ])
+
+        # Supply the first device in each rack from the rack's power feed
+        cables = Cable.objects.bulk_create([Cable() for _ in racks])
+        powerfeeds = PowerFeed.objects.bulk_create([
+            PowerFeed(
+                power_panel=power_panel, rack=rack, name=f'Power Feed {rack.pk}', available_power=2000, cable=cable,
+                cable_end='A'
+            ) for rack, cable in zip(racks, cables)
+        ])
+        powerports = PowerPort.objects.bulk_create([
+            PowerPort(device=device, name='PSU', allocated_draw=200, cable=cable, cable_end='B')
+            for device, cable in zip(devices[::cls.DEVICES_PER_RACK], cables)
+        ])
+        CableTermination.objects.bulk_create([
+            CableTermination(cable=cable, cable_end=end, termination=termination)
+            for cable, powerfeed, powerport in zip(cables, powerfeeds, powerports)
+            for end, termination in (('A', powerfeed), ('B', powerport))
+        ])
+
+    def setUp(self):
+        self.client = Client()
+        self.client.force_login(self.user)
+
+    def test_rack_list(self):
+        url = reverse('dcim:rack_list')
+        params = {'per_page': self.RACKS}
+
+        response = self.benchmark(f'Rack list ({self.RACKS} racks)', self.client.get, url, params)
+        self.assertEqual(response.status_code, 200)
+        self.benchmark(
+            f'Rack list CSV export ({self.RACKS} racks)', self.client.get, url, {**params, 'export': 'table'}
+        )
+
+    def test_rack_utilization(self):
+        racks = self.benchmark(
+            f'Rack.get_utilization() ({self.RACKS} racks)',
+            lambda: [(rack.get_utilization(), rack.get_power_utilization()) for rack in Rack.objects.all()]
+        )
+        prefetched_racks = self.benchmark(
+            f'Rack.get_utilization() prefetched ({self.RACKS} racks)',
+            lambda: [
+                (rack.get_utilization(), rack.get_power_utilization()) for rack in Rack.objects.prefetch_utilization()
+            ]
+        )
+        self.assertEqual(prefetched_racks, racks)
+        self.assertEqual(racks[0][1], 10)
+
+    def test_rack_view(self):
+        rack = Rack.objects.first()
+
+        response = self.benchmark('Rack view', self.client.get, rack.get_absolute_url())
+        self.assertEqual(response.status_code, 200)
+
+
+@override_settings(EXEMPT_VIEW_PERMISSIONS=['*'])
+class ExportBenchmark(BenchmarkTestCase):
+    """
+    Measure the export of many interfaces as CSV table data and by way of an export template.
+    """
+    INTERFACES = 10000
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_superuser(username='testuser')
+        devices = [create_test_device(f'Device {i}') for i in range(10)]
+        Interface.objects.bulk_create([
+            Interface(device=devices[i % 10], name=f'Interface {i}', type='1000base-t', description=f'Interface {i}')
+            for i in range(cls.INTERFACES)
+        ])
+        cls.export_template = ExportTemplate.objects.create(
+            content_type=ContentType.objects.get_for_model(Interface),
+            name='Export Template 1',
+            template_code=(
+                '{% for i in queryset %}{{ i.device.name }},{{ i.name }},{{ i.get_type_display() }}\n{% endfor %}'
+            )
+        )
+
+    def setUp(self):
+        self.client = Client()
+        self.client.force_login(self.user)
+
+    def export(self, params):
+        response = self.client.get(reverse('dcim:interface_list'), params)
+        self.assertEqual(response.status_code, 200)
+        return response.getvalue()
+
+    def test_export_table(self):
+        content = self.benchmark(f'Interface CSV export ({self.INTERFACES} rows)', self.export, {'export': 'table'})
+        self.assertEqual(content.count(b'\r\n'), self.INTERFACES + 1)
+
+    def test_export_template(self):
+        content = self.benchmark(
+            f'Interface export template ({self.INTERFACES} rows)', self.export, {'export': self.export_template.name}
+        )
+        self.assertEqual(content.count(b'\n'), self.INTERFACES)
@@ -1,10 +1,13 @@
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 
 from circuits.models import *
 from dcim.choices import LinkStatusChoices
 from dcim.models import *
 from dcim.svg import CableTraceSVG
-from dcim.utils import object_to_path_node
+from dcim.tracing import CableGraph
+from dcim.utils import create_cablepaths, object_to_path_node
 
 
 class CablePathTestCase(TestCase):
@@ -15,6 +18,7 @@ class CablePathTestCase(TestCase):
         1XX: Test direct connections between different endpoint types
         2XX: Test different cable topologies
         3XX: Test responses to changes in existing objects
+        4XX: Test bulk tracing
     """
     @classmethod
     def setUpTestData(cls):
@@ -52,6 +56,13 @@ class CablePathTestCase(TestCase):
         cablepath = CablePath.objects.filter(path=path, **kwargs).first()
         self.assertIsNotNone(cablepath, msg='CablePath not found')
 
+        # Verify that the per-hop tracer arrives at the same result as CableGraph
+        reference = CablePath.from_origin(cablepath.origins)
+        self.assertEqual(reference.path, cablepath.path)
+        self.assertEqual(reference.is_complete, cablepath.is_complete)
+        self.assertEqual(reference.is_active, cablepath.is_active)
+        self.assertEqual(reference.is_split, cablepath.is_split)
+
         return cablepath
 
     def assertPathIsSet(self, origin, cablepath, msg=None):
@@ -1803,3 +1814,69 @@ class CablePathTestCase(TestCase):
             is_active=True
         )
         self.assertEqual(CablePath.objects.count(), 2)
+
+    def test_401_trace_many_via_multiposition_rear_ports(self):
+        """
+        [IF1] --C1-- [FP1:1] [RP1] --C9-- [RP2] [FP2:1] --C5-- [IF5]
+        [IF2] --C2-- [FP1:2]                    [FP2:2] --C6-- [IF6]
+        [IF3] --C3-- [FP1:3]                    [FP2:3] --C7-- [IF7]
+        [IF4] --C4-- [FP1:4]                    [FP2:4] --C8-- [IF8]
+        """
+        rearport1 = RearPort.objects.create(device=self.device, name='Rear Port 1', positions=4)
+        rearport2 = RearPort.objects.create(device=self.device, name='Rear Port 2', positions=4)
+        Cable(a_terminations=[rearport1], b_terminations=[rearport2]).save()
+        interfaces = []
+        for i in range(1, 5):
+            frontport1 = FrontPort.objects.create(
+                device=self.device, name=f'Front Port 1:{i}', rear_port=rearport1, rear_port_position=i
+            )
+            frontport2 = FrontPort.objects.create(
+                device=self.device, name=f'Front Port 2:{i}', rear_port=rearport2, rear_port_position=i
+            )
+            interface1 = Interface.objects.create(device=self.device, name=f'Interface {i}')
+            interface2 = Interface.objects.create(device=self.device, name=f'Interface {i + 4}')
+            Cable(a_terminations=[interface1], b_terminations=[frontport1]).save()
+            Cable(a_terminations=[frontport2], b_terminations=[interface2]).save()
+            interfaces.extend([interface1, interface2])
+
+        # Tracing all paths together should require no more queries than tracing a single path
+        with CaptureQueriesContext(connection) as single_trace:
+            CableGraph().trace_many([interfaces[:1]])
+        with CaptureQueriesContext(connection) as bulk_trace:
+            cablepaths = CableGraph().trace_many([[interface] for interface in interfaces])
+        self.assertLessEqual(len(bulk_trace), len(single_trace))
+
+        # Results must match those of the per-hop tracer
+        for interface, cablepath in zip(interfaces, cablepaths):
+            reference = CablePath.from_origin([Interface.objects.get(pk=interface.pk)])
+            self.assertTrue(cablepath.is_complete)
+            self.assertEqual(cablepath.path, reference.path)
+            self.assertEqual(cablepath.is_active, reference.is_active)
+            self.assertEqual(cablepath.is_split, reference.is_split)
+
+    def test_402_create_cablepaths(self):
+        """
+        [IF1] --C1-- [IF2]
+        [IF3] --C2-- [IF4]
+        """
+        interfaces = [
+            Interface.objects.create(device=self.device, name=f'Interface {i}') for i in range(1, 5)
+        ]
+        cable1 = Cable(a_terminations=[interfaces[0]], b_terminations=[interfaces[1]])
+        cable1.save()
+        cable2 = Cable(a_terminations=[interfaces[2]], b_terminations=[interfaces[3]])
+        cable2.save()
+
+        # Delete all paths and recreate them in bulk
+        CablePath.objects.all().delete()
+        self.assertEqual(create_cablepaths([[interface] for interface in interfaces]), 4)
+        self.assertEqual(CablePath.objects.count(), 4)
+        for interface, cable, peer in (
+            (interfaces[0], cable1, interfaces[1]),
+            (interfaces[1], cable1, interfaces[0]),
+            (interfaces[2], cable2, interfaces[3]),
+            (interfaces[3], cable2, interfaces[2]),
+        ):
+            cablepath = self.assertPathExists((interface, cable, peer), is_complete=True, is_active=True)
+            interface.refresh_from_db()
+            self.assertPathIsSet(interface, cablepath)
@@ -1,3 +1,4 @@
+from django.contrib.auth.models import User
 from django.core.exceptions import ValidationError
 from django.test import TestCase
 
@@ -212,6 +213,94 @@ class RackTestCase(TestCase):
 
         self.assertEqual(len(rack.get_available_units()), rack.u_height * 2 - 3)
 
+    def test_get_available_units(self):
+        rack = Rack.objects.create(name='Rack 2', site=Site.objects.first(), u_height=10)
+        attrs = {
+            'device_role': DeviceRole.objects.first(),
+            'site': Site.objects.first(),
+            'rack': rack,
+        }
+        device_type = DeviceType.objects.create(
+            manufacturer=Manufacturer.objects.first(), model='Device Type 4', slug='device-type-4', u_height=2,
+            is_full_depth=False
+        )
+        device1 = Device.objects.create(
+            name='Device 1', device_type=device_type, position=3, face=DeviceFaceChoices.FACE_FRONT, **attrs
+        )
+        Device.objects.create(
+            name='Device 2', device_type=DeviceType.objects.get(u_height=0.5), position=7.5,
+            face=DeviceFaceChoices.FACE_REAR, **attrs
+        )
+
+        self.assertEqual(rack.get_available_units(), [1, 1.5, 2, 5, 5.5, 6, 6.5, 8, 8.5, 9, 9.5, 10])
+        self.assertEqual(rack.get_available_units(u_height=2), [1, 5, 5.5, 8, 8.5, 9])
+        self.assertEqual(
+            rack.get_available_units(u_height=0.5), [1, 1.5, 2, 2.5, 5, 5.5, 6, 6.5, 7, 8, 8.5, 9, 9.5, 10, 10.5]
+        )
+        self.assertEqual(
+            rack.get_available_units(rack_face=DeviceFaceChoices.FACE_REAR),
+            [*drange(1, 7, 0.5), *drange(8, 10.5, 0.5)]
+        )
+        self.assertEqual(rack.get_available_units(u_height=3, exclude=[device1.pk]), [*drange(1, 5, 0.5), 8])
+
+        # Units should be listed in the reverse order of the rack's units
+        rack.desc_units = True
+        self.assertEqual(rack.get_available_units(u_height=2), [9, 8.5, 8, 5.5, 5, 1])
+
+    def test_get_power_utilization(self):
+        site = Site.objects.first()
+        rack = Rack.objects.first()
+        power_panel = PowerPanel.objects.create(site=site, name='Power Panel 1')
+        powerfeed = PowerFeed.objects.create(
+            power_panel=power_panel, rack=rack, name='Power Feed 1', voltage=100, amperage=10, max_utilization=100
+        )
+        pdu = Device.objects.create(
+            name='PDU 1', device_type=DeviceType.objects.first(), device_role=DeviceRole.objects.first(), site=site
+        )
+        device = Device.objects.create(
+            name='Device 1', device_type=DeviceType.objects.first(), device_role=DeviceRole.objects.first(), site=site
+        )
+
+        # A PDU which defines no draw is attributed the allocated draw of the power ports connected to its outlets
+        pdu_powerport = PowerPort.objects.create(device=pdu, name='Power Port 1')
+        poweroutlet = PowerOutlet.objects.create(device=pdu, name='Power Outlet 1', power_port=pdu_powerport)
+        powerports = (
+            PowerPort(device=device, name='Power Port 1', allocated_draw=100),
+            PowerPort(device=device, name='Power Port 2', allocated_draw=150, maximum_draw=200),
+        )
+        PowerPort.objects.bulk_create(powerports)
+        Cable(a_terminations=[powerfeed], b_terminations=[pdu_powerport]).save()
+        Cable(a_terminations=[poweroutlet], b_terminations=[powerports[0]]).save()
+        self.assertEqual(rack.get_power_utilization(), 10)
+
+        # A power port which defines its own draw is counted directly
+        Cable(a_terminations=[PowerFeed.objects.create(
+            power_panel=power_panel, rack=rack, name='Power Feed 2', voltage=100, amperage=10, max_utilization=100
+        )], b_terminations=[powerports[1]]).save()
+        self.assertEqual(rack.get_power_utilization(), 12)
+
+    def test_prefetch_utilization(self):
+        site = Site.objects.first()
+        power_panel = PowerPanel.objects.create(site=site, name='Power Panel 1')
+        for i in range(3):
+            rack = Rack.objects.create(name=f'Rack {i + 2}', site=site, u_height=10)
+            Device.objects.create(
+                name=f'Device {i}', device_type=DeviceType.objects.first(), device_role=DeviceRole.objects.first(),
+                site=site, rack=rack, position=1, face=DeviceFaceChoices.FACE_FRONT
+            )
+            RackReservation.objects.create(rack=rack, units=[2, 3], user=User.objects.create(username=f'User {i}'))
+            PowerFeed.objects.create(power_panel=power_panel, rack=rack, name=f'Power Feed {i}')
+
+        # Racks, devices, reservations, and power feeds
+        with self.assertNumQueries(4):
+            racks = list(Rack.objects.filter(site=site).prefetch_utilization())
+            for rack in racks:
+                rack.get_utilization()
+                rack.get_power_utilization()
+        for rack in racks:
+            self.assertEqual(rack.get_utilization(), Rack.objects.get(pk=rack.pk).get_utilization())
+            self.assertEqual(rack.get_power_utilization(), Rack.objects.get(pk=rack.pk).get_power_utilization())
+
     def test_change_rack_site(self):
         """
         Check that child Devices get updated when a Rack is moved to a new Site.
@@ -0,0 +1,476 @@
+import itertools
+from collections import defaultdict
+
+from django.contrib.contenttypes.models import ContentType
+from django.db.models import Q
+
+from .choices import CableEndChoices, LinkStatusChoices
+from .utils import compile_path_node, decompile_path_node, object_to_path_node
+
+__all__ = (
+    'CableGraph',
+)
+
+
+def _group_nodes(nodes):
+    """
+    Group an iterable of path nodes by content type, returning a dictionary mapping each ContentType ID to a list of
+    object IDs.
+    """
+    groups = defaultdict(list)
+    for node in nodes:
+        ct_id, object_id = decompile_path_node(node)
+        groups[ct_id].append(object_id)
+    return groups
+
+
+class CableGraph:
+    """
+    An in-memory map of the cables, cable terminations, and pass-through ports surrounding a set of origins, used to
+    trace CablePaths without querying the database at every hop.
+
+    Traces are advanced in lockstep: each round loads (in bulk) the link attached to every pending termination along
+    with the pass-through mappings of its far end, after which every pending trace advances as far as the loaded data
+    permits. The number of queries is therefore proportional to the length of the longest path being traced rather
+    than to the number of paths or hops.
+
+        graph = CableGraph()
+        cablepaths = graph.trace_many([[interface1], [interface2], [frontport1, frontport2]])
+
+    The results are identical to those of CablePath.from_origin().
+    """
+    def __init__(self):
+        # Link (Cable or WirelessLink) attached to each termination node, if any
+        self.links = {}
+        # The cable end (A or B) of each cabled termination node
+        self.cable_ends = {}
+        # Status of each link
+        self.link_status = {}
+        # Terminations of each Cable by end, ordered by CableTermination ID
+        self.cable_terminations = {}
+        # Interface nodes (A, B) of each WirelessLink
+        self.wireless_interfaces = {}
+        # (RearPort node, position) to which each FrontPort maps
+        self.front_ports = {}
+        # Number of positions of each RearPort
+        self.rear_ports = {}
+        # FrontPort nodes mapped to each RearPort position
+        self.rear_port_positions = defaultdict(lambda: defaultdict(list))
+        # Attributes of each CircuitTermination, and CircuitTermination nodes by (circuit ID, term side)
+        self.circuit_terminations = {}
+        self.circuit_sides = {}
+
+        self._linked = set()
+        self._resolved = set()
+        self._expanded = set()
+
+        self._init_content_types()
+
+    def _init_content_types(self):
+        from circuits.models import CircuitTermination, ProviderNetwork
+        from dcim.models import Cable, FrontPort, Interface, RearPort, Site
+        from wireless.models import WirelessLink
+
+        content_types = ContentType.objects.get_for_models(
+            Cable, CircuitTermination, FrontPort, Interface, ProviderNetwork, RearPort, Site, WirelessLink
+        )
+        self.cable_ct = content_types[Cable].pk
+        self.circuittermination_ct = content_types[CircuitTermination].pk
+        self.frontport_ct = content_types[FrontPort].pk
+        self.interface_ct = content_types[Interface].pk
+        self.providernetwork_ct = content_types[ProviderNetwork].pk
+        self.rearport_ct = content_types[RearPort].pk
+        self.site_ct = content_types[Site].pk
+        self.wirelesslink_ct = content_types[WirelessLink].pk
+
+    #
+    # Graph population
+    #
+
+    def expand(self, nodes):
+        """
+        Load the links attached to the given termination nodes, along with the far-end terminations of each link and
+        their pass-through mappings (front/rear ports and circuit terminations).
+        """
+        nodes = set(nodes) - self._expanded
+        if not nodes:
+            return
+
+        self._load_links(nodes - self._linked)
+
+        far_ends = set()
+        for node in nodes:
+            link = self.links.get(node)
+            if link in self.cable_terminations:
+                for terminations in self.cable_terminations[link].values():
+                    far_ends.update(terminations)
+            elif link in self.wireless_interfaces:
+                far_ends.update(self.wireless_interfaces[link])
+        self._load_pass_through(far_ends - self._resolved)
+
+        self._expanded.update(nodes)
+
+    def is_expanded(self, nodes):
+        return all(node in self._expanded for node in nodes)
+
+    def _load_links(self, nodes):
+        """
+        Retrieve every Cable attached to the given nodes (and all the Cable's terminations), and any WirelessLinks
+        attached to uncabled interfaces.
+        """
+        from dcim.models import CableTermination
+
+        if not nodes:
+            return
+        groups = _group_nodes(nodes)
+
+        query = Q()
+        for ct_id, object_ids in groups.items():
+            query |= Q(termination_type_id=ct_id, termination_id__in=object_ids)
+        cable_terminations = CableTermination.objects.filter(
+            cable__in=CableTermination.objects.filter(query).values('cable')
+        ).order_by('pk').values_list(
+            'cable_id', 'cable__status', 'cable_end', 'termination_type_id', 'termination_id'
+        )
+        for cable_id, status, cable_end, ct_id, object_id in cable_terminations:
+            link = compile_path_node(self.cable_ct, cable_id)
+            node = compile_path_node(ct_id, object_id)
+            self.links[node] = link
+            self.cable_ends[node] = cable_end
+            self.link_status[link] = status
+            self.cable_terminations.setdefault(link, {
+                CableEndChoices.SIDE_A: [],
+                CableEndChoices.SIDE_B: [],
+            })[cable_end].append(node)
+            self._linked.add(node)
+
+        # Check uncabled interfaces for wireless links
+        uncabled_interfaces = [
+            object_id for object_id in groups.get(self.interface_ct, [])
+            if compile_path_node(self.interface_ct, object_id) not in self.links
+        ]
+        if uncabled_interfaces:
+            self._load_wireless_links(uncabled_interfaces)
+
+        self._linked.update(nodes)
+
+    def _load_wireless_links(self, interface_ids):
+        from dcim.models import Interface
+
+        interfaces = Interface.objects.filter(
+            pk__in=interface_ids,
+            wireless_link__isnull=False
+        ).values_list(
+            'pk', 'wireless_link_id', 'wireless_link__status', 'wireless_link__interface_a_id',
+            'wireless_link__interface_b_id'
+        )
+        for interface_id, wirelesslink_id, status, interface_a_id, interface_b_id in interfaces:
+            link = compile_path_node(self.wirelesslink_ct, wirelesslink_id)
+            self.links[compile_path_node(self.interface_ct, interface_id)] = link
+            self.link_status[link] = status
+            self.wireless_interfaces[link] = (
+                compile_path_node(self.interface_ct, interface_a_id),
+                compile_path_node(self.interface_ct, interface_b_id),
+            )
+
+    def _load_pass_through(self, nodes):
+        """
+        Retrieve the next-hop mappings for any front ports, rear ports, and circuit terminations among the given nodes.
+        """
+        from circuits.models import CircuitTermination
+        from dcim.models import FrontPort, RearPort
+
+        if not nodes:
+            return
+        groups = _group_nodes(nodes)
+
+        # FrontPorts map to a position on a RearPort
+        if self.frontport_ct in groups:
+            front_ports = FrontPort.objects.filter(
+                pk__in=groups[self.frontport_ct]
+            ).values_list('pk', 'rear_port_id', 'rear_port_position', 'rear_port__positions')
+            for frontport_id, rearport_id, position, positions in front_ports:
+                rear_port = compile_path_node(self.rearport_ct, rearport_id)
+                self.front_ports[compile_path_node(self.frontport_ct, frontport_id)] = (rear_port, position)
+                self.rear_ports[rear_port] = positions
+
+        # RearPorts map to the FrontPorts assigned to each of their positions
+        if self.rearport_ct in groups:
+            rear_ports = RearPort.objects.filter(pk__in=groups[self.rearport_ct]).values_list('pk', 'positions')
+            for rearport_id, positions in rear_ports:
+                self.rear_ports[compile_path_node(self.rearport_ct, rearport_id)] = positions
+            front_ports = FrontPort.objects.filter(
+                rear_port_id__in=groups[self.rearport_ct]
+            ).order_by('pk').values_list('pk', 'rear_port_id', 'rear_port_position')
+            for frontport_id, rearport_id, position in front_ports:
+                front_port = compile_path_node(self.frontport_ct, frontport_id)
+                rear_port = compile_path_node(self.rearport_ct, rearport_id)
+                self.front_ports[front_port] = (rear_port, position)
+                self.rear_port_positions[rear_port][position].append(front_port)
+                self._resolved.add(front_port)
+
+        # CircuitTerminations map to the opposite termination of their circuit
+        if self.circuittermination_ct in groups:
+            circuit_terminations = CircuitTermination.objects.filter(
+                circuit__in=CircuitTermination.objects.filter(
+                    pk__in=groups[self.circuittermination_ct]
+                ).values('circuit')
+            ).values_list('pk', 'circuit_id', 'term_side', 'provider_network_id', 'site_id', 'cable_id')
+            for termination_id, circuit_id, term_side, providernetwork_id, site_id, cable_id in circuit_terminations:
+                node = compile_path_node(self.circuittermination_ct, termination_id)
+                self.circuit_terminations[node] = {
+                    'circuit_id': circuit_id,
+                    'term_side': term_side,
+                    'provider_network': providernetwork_id,
+                    'site': site_id,
+                    'cable': cable_id,
+                }
+                self.circuit_sides[(circuit_id, term_side)] = node
+
+        self._resolved.update(nodes)
+
+    def existing_nodes(self, nodes):
+        """
+        Return the subset of the given nodes which reference objects that still exist.
+        """
+        existing = set()
+        for ct_id, object_ids in _group_nodes(nodes).items():
+            model = ContentType.objects.get_for_id(ct_id).model_class()
+            object_ids = model.objects.filter(pk__in=object_ids).values_list('pk', flat=True)
+            existing.update(compile_path_node(ct_id, object_id) for object_id in object_ids)
+        return existing
+
+    #
+    # Tracing
+    #
+
+    def trace(self, terminations):
+        """
+        Return a new CablePath traced from the given termination objects (or None). Equivalent to
+        CablePath.from_origin().
+        """
+        return self.trace_many([terminations])[0]
+
+    def trace_many(self, origins):
+        """
+        Trace a CablePath from each of the given sets of originating terminations. Each set of terminations may be
+        given either as model instances or as path nodes. Returns a list of new (unsaved) CablePath instances, with
+        None in place of any set of terminations from which no path exists.
+        """
+        traces = []
+        for terminations in origins:
+            nodes = [t if type(t) is str else object_to_path_node(t) for t in terminations]
+            traces.append(_PathTrace(nodes))
+
+        pending = [t for t in traces if not t.finished]
+        while pending:
+            self.expand(set().union(*[t.terminations for t in pending]))
+            for t in pending:
+                t.advance(self)
+            pending = [t for t in pending if not t.finished]
+
+        self._apply_ordering(traces)
+
+        return [t.to_cablepath() for t in traces]
+
+    def retrace_many(self, cablepaths):
+        """
+        Retrace existing CablePaths from their originating terminations, returning a list of new (unsaved) CablePath
+        instances (or None where no path remains).
+
+        Every near-end termination along the existing paths is loaded into the graph in a single round up front, so
+        that the unchanged portion of each path is traversed in memory and only the portion following a change incurs
+        additional queries.
+        """
+        cablepaths = list(cablepaths)
+
+        # Discard any origins which no longer exist
+        existing_nodes = self.existing_nodes(itertools.chain(*[cp.path[0] for cp in cablepaths if cp.path]))
+        origins = [
+            [node for node in cp.path[0] if node in existing_nodes] if cp.path else [] for cp in cablepaths
+        ]
+
+        self.expand(itertools.chain(*[
+            itertools.chain(*cp.path[::3]) for cp in cablepaths
+        ]))
+
+        return self.trace_many(origins)
+
+    def _apply_ordering(self, traces):
+        """
+        Sort any sets of front or rear ports reached through a pass-through mapping into the default ordering of their
+        model, as retrieved from the database by CablePath.from_origin().
+        """
+        from dcim.models import FrontPort, RearPort
+
+        to_order = defaultdict(set)
+        for t in traces:
+            for i in t.ordered_steps:
+                for ct_id, object_ids in _group_nodes(t.path[i]).items():
+                    to_order[ct_id].update(object_ids)
+        if not to_order:
+            return
+
+        ranks = {}
+        for model, ct_id in ((FrontPort, self.frontport_ct), (RearPort, self.rearport_ct)):
+            if ct_id in to_order:
+                object_ids = model.objects.filter(pk__in=to_order[ct_id]).values_list('pk', flat=True)
+                for i, object_id in enumerate(object_ids):
+                    ranks[compile_path_node(ct_id, object_id)] = i
+
+        for t in traces:
+            for i in t.ordered_steps:
+                t.path[i].sort(key=lambda node: ranks.get(node, 0))
+
+
+class _PathTrace:
+    """
+    The state of a single path being traced through a CableGraph.
+    """
+    def __init__(self, terminations):
+        self.terminations = terminations
+        self.path = []
+        self.position_stack = []
+        self.is_complete = False
+        self.is_active = True
+        self.is_split = False
+        self.is_null = False
+        self.finished = not terminations
+
+        # Indices of path steps which must be sorted by database ordering
+        self.ordered_steps = []
+        self._ordered = False
+
+    def to_cablepath(self):
+        from dcim.models import CablePath
+
+        if self.is_null or not self.path:
+            return None
+        return CablePath(
+            path=self.path,
+            is_complete=self.is_complete,
+            is_active=self.is_active,
+            is_split=self.is_split
+        )
+
+    def advance(self, graph):
+        """
+        Follow the path for as many hops as the data already loaded into the graph permits.
+        """
+        while not self.finished and graph.is_expanded(self.terminations):
+            self._step(graph)
+
+    def _finish(self):
+        self.finished = True
+
+    def _step(self, graph):
+        terminations = self.terminations
+        if not terminations:
+            return self._finish()
+
+        # Check for a split path (e.g. rear port fanning out to multiple front ports with different cables attached)
+        if len(set(graph.links.get(t) for t in terminations)) > 1:
+            self.is_split = True
+            return self._finish()
+
+        # Step 1: Record the near-end termination(s)
+        if self._ordered and len(terminations) > 1:
+            self.ordered_steps.append(len(self.path))
+        self.path.append(list(terminations))
+
+        # Step 2: Determine the attached link (Cable or WirelessLink), if any
+        link = graph.links.get(terminations[0])
+        if link is None:
+            # If this is the start of the path and no link exists, there is no path
+            if len(self.path) == 1:
+                self.is_null = True
+            return self._finish()
+
+        # Step 3: Record the link and update path status if not "connected"
+        self.path.append([link])
+        if graph.link_status[link] != LinkStatusChoices.STATUS_CONNECTED:
+            self.is_active = False
+
+        # Step 4: Determine the far-end terminations
+        if link in graph.cable_terminations:
+            # Terminations must all belong to same end of Cable
+            local_cable_end = graph.cable_ends[terminations[0]]
+            assert all(graph.cable_ends[t] == local_cable_end for t in terminations[1:])
+            remote_cable_end = 'A' if local_cable_end == 'B' else 'B'
+            remote_terminations = list(graph.cable_terminations[link][remote_cable_end])
+        else:
+            # WirelessLink
+            interface_a, interface_b = graph.wireless_interfaces[link]
+            remote_terminations = [interface_b] if interface_a == terminations[0] else [interface_a]
+
+        # Step 5: Record the far-end termination(s)
+        self.path.append(remote_terminations)
+
+        # Step 6: Determine the "next hop" terminations, if applicable
+        if not remote_terminations:
+            return self._finish()
+        remote_ct, _ = decompile_path_node(remote_terminations[0])
+
+        if remote_ct == graph.frontport_ct:
+            # Follow FrontPorts to their corresponding RearPorts
+            rear_ports = list(dict.fromkeys(graph.front_ports[fp][0] for fp in remote_terminations))
+            if len(rear_ports) > 1:
+                assert all(graph.rear_ports[rp] == 1 for rp in rear_ports)
+            elif graph.rear_ports[rear_ports[0]] > 1:
+                self.position_stack.append([graph.front_ports[fp][1] for fp in remote_terminations])
+
+            self._next_hop(rear_ports, ordered=True)
+
+        elif remote_ct == graph.rearport_ct:
+
+            if len(remote_terminations) > 1 or graph.rear_ports[remote_terminations[0]] == 1:
+                front_ports = [
+                    fp for rp in remote_terminations for fp in graph.rear_port_positions[rp].get(1, [])
+                ]
+            elif self.position_stack:
+                positions = dict.fromkeys(self.position_stack.pop())
+                front_ports = [
+                    fp for position in positions
+                    for fp in graph.rear_port_positions[remote_terminations[0]].get(position, [])
+                ]
+            else:
+                # No position indicated: path has split, so we stop at the RearPorts
+                self.is_split = True
+                return self._finish()
+
+            self._next_hop(front_ports, ordered=True)
+
+        elif remote_ct == graph.circuittermination_ct:
+            # Follow a CircuitTermination to its corresponding CircuitTermination (A to Z or vice versa)
+            termination = graph.circuit_terminations[remote_terminations[0]]
+            term_side = termination['term_side']
+            assert all(graph.circuit_terminations[ct]['term_side'] == term_side for ct in remote_terminations[1:])
+            peer = graph.circuit_sides.get((termination['circuit_id'], 'Z' if term_side == 'A' else 'A'))
+            if peer is None:
+                return self._finish()
+            peer_termination = graph.circuit_terminations[peer]
+            if peer_termination['provider_network']:
+                # Circuit terminates to a ProviderNetwork
+                self.path.extend([
+                    [peer],
+                    [compile_path_node(graph.providernetwork_ct, peer_termination['provider_network'])],
+                ])
+                return self._finish()
+            elif peer_termination['site'] and not peer_termination['cable']:
+                # Circuit terminates to a Site
+                self.path.extend([
+                    [peer],
+                    [compile_path_node(graph.site_ct, peer_termination['site'])],
+                ])
+                return self._finish()
+
+            self._next_hop([peer])
+
+        # Anything else marks the end of the path
+        else:
+            self.is_complete = True
+            return self._finish()
+
+    def _next_hop(self, terminations, ordered=False):
+        self.terminations = terminations
+        self._ordered = ordered
@@ -1,4 +1,5 @@
 import itertools
+from collections import defaultdict
 
 from django.contrib.contenttypes.models import ContentType
 from django.db import transaction
@@ -38,23 +39,81 @@ def create_cablepath(terminations):
 
     :param terminations: Iterable of CableTermination objects
     """
-    from dcim.models import CablePath
+    from dcim.tracing import CableGraph
 
-    cp = CablePath.from_origin(terminations)
+    cp = CableGraph().trace(terminations)
     if cp:
         cp.save()
 
 
+def create_cablepaths(origins, batch_size=None):
+    """
+    Trace and save CablePaths from each of the given sets of originating terminations in bulk. Returns the number of
+    CablePaths created.
+
+    :param origins: Iterable of lists of termination objects (or their path nodes)
+    :param batch_size: Maximum number of objects to write per query (optional)
+    """
+    from dcim.models import CablePath
+    from dcim.tracing import CableGraph
+
+    cable_paths = [cp for cp in CableGraph().trace_many(origins) if cp]
+    for cp in cable_paths:
+        cp._nodes = list(itertools.chain(*cp.path))
+    CablePath.objects.bulk_create(cable_paths, batch_size=batch_size)
+
+    # Record a direct reference to each CablePath on its originating object(s)
+    origins_by_type = defaultdict(list)
+    for cp in cable_paths:
+        for node in cp.path[0]:
+            ct_id, object_id = decompile_path_node(node)
+            origins_by_type[ct_id].append((object_id, cp.pk))
+    for ct_id, origin_paths in origins_by_type.items():
+        origin_model = ContentType.objects.get_for_id(ct_id).model_class()
+        origin_model.objects.bulk_update(
+            [origin_model(pk=object_id, _path_id=path_id) for object_id, path_id in origin_paths],
+            fields=['_path'],
+            batch_size=batch_size
+        )
+
+    return len(cable_paths)
+
+
+def retrace_cablepaths(cable_paths):
+    """
+    Retrace the specified CablePaths in bulk. Each path is updated in place if it has changed, or deleted if no path
+    remains.
+    """
+    from dcim.models import CablePath
+    from dcim.tracing import CableGraph
+
+    cable_paths = list(cable_paths)
+    if not cable_paths:
+        return
+
+    fields = ('path', 'is_complete', 'is_active', 'is_split')
+    to_update = []
+    to_delete = []
+    for cp, new_cp in zip(cable_paths, CableGraph().retrace_many(cable_paths)):
+        if new_cp is None:
+            to_delete.append(cp.pk)
+        elif any(getattr(cp, field) != getattr(new_cp, field) for field in fields):
+            for field in fields:
+                setattr(cp, field, getattr(new_cp, field))
+            cp._nodes = list(itertools.chain(*cp.path))
+            to_update.append(cp)
+
+    with transaction.atomic():
+        if to_delete:
+            CablePath.objects.filter(pk__in=to_delete).delete()
+        CablePath.objects.bulk_update(to_update, fields=(*fields, '_nodes'))
+
+
 def rebuild_paths(terminations):
     """
     Rebuild all CablePaths which traverse the specified nodes.
     """
     from dcim.models import CablePath
 
-    for obj in terminations:
-        cable_paths = CablePath.objects.filter(_nodes__contains=obj)
-
-        with transaction.atomic():
-            for cp in cable_paths:
-                cp.delete()
-                create_cablepath(cp.origins)
+    nodes = [object_to_path_node(obj) for obj in terminations]
+    retrace_cablepaths(CablePath.objects.filter(_nodes__overlap=nodes))
@@ -572,7 +572,7 @@ class RackRoleBulkDeleteView(generic.BulkDeleteView):
 class RackListView(generic.ObjectListView):
     queryset = Rack.objects.annotate(
         device_count=count_related(Device, 'rack')
-    )
+    ).prefetch_utilization()
     filterset = filtersets.RackFilterSet
     filterset_form = forms.RackFilterForm
     table = tables.RackTable
@@ -621,7 +621,7 @@ class RackElevationListView(generic.ObjectListView):
 
 
 class RackView(generic.ObjectView):
-    queryset = Rack.objects.prefetch_related('site__region', 'tenant__group', 'location', 'role')
+    queryset = Rack.objects.prefetch_related('site__region', 'tenant__group', 'location', 'role').prefetch_utilization()
 
     def get_extra_context(self, request, instance):
         # Get 0U devices located within the rack
@@ -43,7 +43,10 @@ class ConfigRevisionAdmin(admin.ModelAdmin):
             'fields': ('DEFAULT_USER_PREFERENCES',),
         }),
         ('Miscellaneous', {
-            'fields': ('MAINTENANCE_MODE', 'GRAPHQL_ENABLED', 'CHANGELOG_RETENTION', 'JOBRESULT_RETENTION', 'MAPS_URL'),
+            'fields': (
+                'MAINTENANCE_MODE', 'GRAPHQL_ENABLED', 'CHANGELOG_RETENTION', 'JOBRESULT_RETENTION',
+                'HOMEPAGE_STATS_CACHE_TIMEOUT', 'BULK_IMPORT_BACKGROUND_THRESHOLD', 'MAPS_URL',
+            ),
         }),
         ('Config Revision', {
             'fields': ('comment',),
@@ -27,6 +27,7 @@ from virtualization.models import Cluster, ClusterGroup, ClusterType
 from .nested_serializers import *
 
 __all__ = (
+    'CachedValueSerializer',
     'ConfigContextSerializer',
     'ContentTypeSerializer',
     'CustomFieldSerializer',
@@ -58,12 +59,13 @@ class WebhookSerializer(ValidatedModelSerializer):
         queryset=ContentType.objects.filter(FeatureQuery('webhooks').get_query()),
         many=True
     )
+    delivery = ChoiceField(choices=WebhookDeliveryChoices, required=False)
 
     class Meta:
         model = Webhook
         fields = [
             'id', 'url', 'display', 'content_types', 'name', 'type_create', 'type_update', 'type_delete', 'payload_url',
-            'enabled', 'http_method', 'http_content_type', 'additional_headers', 'body_template', 'secret',
+            'enabled', 'http_method', 'http_content_type', 'additional_headers', 'body_template', 'delivery', 'secret',
             'conditions', 'ssl_verification', 'ca_file_path', 'created', 'last_updated',
         ]
 
@@ -481,6 +483,38 @@ class ObjectChangeSerializer(BaseModelSerializer):
         return data
 
 
+#
+# Search
+#
+
+class CachedValueSerializer(serializers.ModelSerializer):
+    object_type = ContentTypeField(
+        read_only=True
+    )
+    object = serializers.SerializerMethodField(
+        read_only=True
+    )
+
+    class Meta:
+        model = CachedValue
+        fields = ['object_type', 'object_id', 'object', 'field', 'value', 'weight']
+
+    @swagger_serializer_method(serializer_or_field=serializers.DictField)
+    def get_object(self, obj):
+        """
+        Serialize a nested representation of the matched object.
+        """
+        if obj.object is None:
+            return None
+
+        serializer = get_serializer_for_model(obj.object, prefix=NESTED_SERIALIZER_PREFIX)
+        context = {
+            'request': self.context['request']
+        }
+
+        return serializer(obj.object, context=context).data
+
+
 #
 # ContentTypes
 #
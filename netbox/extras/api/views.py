@@ -12,6 +12,7 @@ from rq import Worker
 
 from extras import filtersets
 from extras.choices import JobResultStatusChoices
+from extras.exports import get_export_response
 from extras.models import *
 from extras.models import CustomField
 from extras.reports import get_report, get_reports, run_report
@@ -358,6 +359,18 @@ class JobResultViewSet(ReadOnlyModelViewSet):
     serializer_class = serializers.JobResultSerializer
     filterset_class = filtersets.JobResultFilterSet
 
+    @action(detail=True)
+    def download(self, request, pk):
+        """
+        Download the file produced by a background export. Only the user who requested the export (or a superuser) may
+        download it.
+        """
+        job_result = self.get_object()
+        if job_result.user != request.user and not request.user.is_superuser:
+            raise Http404
+
+        return get_export_response(job_result)
+
 
 #
 # ContentTypes
@@ -0,0 +1,88 @@
+from functools import partial
+
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+
+from .models import ObjectChange
+
+__all__ = (
+    'ObjectChangeBuffer',
+)
+
+OBJECTCHANGE_BATCH_SIZE = 1000
+
+
+def _mark_committed(objectchange):
+    objectchange._committed = True
+
+
+class ObjectChangeBuffer(list):
+    """
+    Holds the ObjectChanges recorded during a request so that they can be written with a single bulk_create() once the
+    request has completed, rather than being saved individually as each change is made.
+
+    An ObjectChange recorded within a transaction is written only if that transaction (or savepoint) has not been
+    rolled back. The commit of a transaction is tracked by registering an on_commit() hook for each change, which runs
+    once the change has been committed. Savepoints are tracked by track_savepoints(): Any changes recorded within a
+    savepoint are discarded if it is rolled back.
+    """
+    def __init__(self):
+        super().__init__()
+        self._latest = {}
+        # Maps the ID of each open savepoint to the number of changes recorded before it was created
+        self._savepoints = {}
+
+    def add(self, objectchange):
+        """
+        Buffer an ObjectChange. The user name is recorded here, as ObjectChange.save() is bypassed by bulk_create().
+        """
+        objectchange.user_name = objectchange.user.username
+        objectchange._committed = False
+        transaction.on_commit(partial(_mark_committed, objectchange))
+
+        self.append(objectchange)
+        self._latest[(objectchange.changed_object_type_id, objectchange.changed_object_id)] = objectchange
+
+    def get_latest(self, instance):
+        """
+        Return the most recently buffered ObjectChange for the given object (or None).
+        """
+        content_type = ContentType.objects.get_for_model(instance)
+        return self._latest.get((content_type.pk, instance.pk))
+
+    def track_savepoints(self, execute, sql, params, many, context):
+        """
+        A database execute wrapper (see change_logging()) which follows the creation, release, and rollback of
+        savepoints. When a savepoint is rolled back, the changes recorded since its creation are discarded.
+        """
+        result = execute(sql, params, many, context)
+
+        if sql.startswith('SAVEPOINT '):
+            self._savepoints[sql.split()[-1]] = len(self)
+        elif sql.startswith('ROLLBACK TO SAVEPOINT '):
+            count = self._savepoints.get(sql.split()[-1])
+            if count is not None and count < len(self):
+                del self[count:]
+                self._latest = {
+                    (oc.changed_object_type_id, oc.changed_object_id): oc for oc in self
+                }
+        elif sql.startswith('RELEASE SAVEPOINT '):
+            self._savepoints.pop(sql.split()[-1], None)
+
+        return result
+
+    def flush(self):
+        """
+        Write all ObjectChanges which have not been rolled back to the database and empty the buffer. Changes made
+        within a transaction which remains open (e.g. one enclosing the entire request) are written within it.
+        """
+        in_transaction = not transaction.get_autocommit()
+        objectchanges = [oc for oc in self if oc._committed or in_transaction]
+        self.clear()
+        self._savepoints.clear()
+        self._latest.clear()
+
+        if objectchanges:
+            ObjectChange.objects.bulk_create(objectchanges, batch_size=OBJECTCHANGE_BATCH_SIZE)
+
+        return objectchanges
@@ -178,3 +178,16 @@ class WebhookHttpMethodChoices(ChoiceSet):
         (METHOD_PATCH, 'PATCH'),
         (METHOD_DELETE, 'DELETE'),
     )
+
+
+class WebhookDeliveryChoices(ChoiceSet):
+
+    DELIVERY_INDIVIDUAL = 'individual'
+    DELIVERY_BATCHED = 'batched'
+    DELIVERY_ARRAY = 'array'
+
+    CHOICES = (
+        (DELIVERY_INDIVIDUAL, 'Individual'),
+        (DELIVERY_BATCHED, 'Batched'),
+        (DELIVERY_ARRAY, 'Batched (array payload)'),
+    )
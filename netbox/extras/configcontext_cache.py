@@ -0,0 +1,212 @@
+import time
+
+from django.apps import apps
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.db.models import Exists, OuterRef, Q
+from django_rq import get_queue
+
+from utilities.constants import ADVISORY_LOCK_KEYS
+from .models import CachedConfigContext, ConfigContext
+
+__all__ = (
+    'invalidate_config_context',
+    'invalidate_dependent_objects',
+    'invalidate_objects',
+    'rebuild_cache',
+)
+
+REBUILD_BATCH_SIZE = 1000
+
+# The minimum interval (in seconds) between enqueuing rebuild jobs for a model from a single process
+REBUILD_ENQUEUE_INTERVAL = 1
+
+# Models for which config context data is cached, mapped to the fields which determine the ConfigContexts that apply
+# to each object
+CONFIG_CONTEXT_MODELS = {
+    'dcim.device': ('site', 'location', 'device_type', 'device_role', 'platform', 'cluster', 'tenant'),
+    'virtualization.virtualmachine': ('site', 'cluster', 'role', 'platform', 'tenant'),
+}
+
+# Models which determine the ConfigContexts that apply to an object indirectly. Each is mapped to the fields on which
+# this depends, and to the lookup relating it to each of the CONFIG_CONTEXT_MODELS.
+CONFIG_CONTEXT_DEPENDENCIES = {
+    'dcim.region': (
+        ('parent',), {'dcim.device': 'site__region', 'virtualization.virtualmachine': 'cluster__site__region'},
+    ),
+    'dcim.sitegroup': (
+        ('parent',), {'dcim.device': 'site__group', 'virtualization.virtualmachine': 'cluster__site__group'},
+    ),
+    'dcim.site': (
+        ('region', 'group'), {'dcim.device': 'site', 'virtualization.virtualmachine': 'cluster__site'},
+    ),
+    'dcim.platform': (
+        (), {'dcim.device': 'platform', 'virtualization.virtualmachine': 'platform'},
+    ),
+    'virtualization.cluster': (
+        ('type', 'group', 'site'), {'dcim.device': 'cluster', 'virtualization.virtualmachine': 'cluster'},
+    ),
+    'tenancy.tenantgroup': (
+        (), {'dcim.device': 'tenant__group', 'virtualization.virtualmachine': 'tenant__group'},
+    ),
+    'tenancy.tenant': (
+        ('group',), {'dcim.device': 'tenant', 'virtualization.virtualmachine': 'tenant'},
+    ),
+    'extras.tag': (
+        (), {'dcim.device': 'tags', 'virtualization.virtualmachine': 'tags'},
+    ),
+}
+
+_enqueued_at = {}
+
+
+def _lock(shared=True):
+    """
+    Acquire the advisory lock which serializes rebuilding the cache with invalidating it. Invalidations acquire it in
+    shared mode, so they do not block one another. The lock is held until the end of the current transaction.
+    """
+    function = 'pg_advisory_xact_lock_shared' if shared else 'pg_advisory_xact_lock'
+    with connection.cursor() as cursor:
+        cursor.execute(f'SELECT {function}(%s)', [ADVISORY_LOCK_KEYS['config-context-cache']])
+
+
+def _has_changed(instance, fields):
+    """
+    Return True if any of the given fields may have changed since the object's pre-change snapshot was taken.
+    """
+    snapshot = getattr(instance, '_prechange_snapshot', None)
+    if snapshot is None:
+        return True
+
+    return any(snapshot.get(field) != getattr(instance, f'{field}_id') for field in fields)
+
+
+def _enqueue_rebuild(label):
+    # Avoid enqueuing redundant jobs while one is pending
+    now = time.time()
+    if now - _enqueued_at.get(label, 0) < REBUILD_ENQUEUE_INTERVAL:
+        return
+    _enqueued_at[label] = now
+    if cache.add(f'config_context_rebuild_{label}', True, None):
+        get_queue('default').enqueue('extras.configcontext_cache.rebuild_cache', label)
+
+
+def enqueue_rebuild(model):
+    """
+    Enqueue a background job to rebuild the cached config context data for the given model, once the current
+    transaction has been committed.
+    """
+    transaction.on_commit(lambda: _enqueue_rebuild(model._meta.label_lower))
+
+
+def invalidate_objects(queryset):
+    """
+    Clear the cached config context data for all objects in the given queryset.
+    """
+    content_type = ContentType.objects.get_for_model(queryset.model)
+
+    with transaction.atomic():
+        _lock()
+        CachedConfigContext.objects.filter(
+            object_type=content_type,
+            object_id__in=queryset.values('pk'),
+            data__isnull=False
+        ).update(data=None)
+
+    enqueue_rebuild(queryset.model)
+
+
+def invalidate_config_context(config_context):
+    """
+    Clear the cached config context data for all objects to which the given ConfigContext applies, or applied when
+    the data was cached.
+    """
+    for label in CONFIG_CONTEXT_MODELS:
+        model = apps.get_model(label)
+        content_type = ContentType.objects.get_for_model(model)
+        config_context_filters = model.objects.all()._get_config_context_filters()
+        matching_objects = model.objects.filter(
+            Exists(ConfigContext.objects.filter(config_context_filters, pk=config_context.pk))
+        )
+
+        with transaction.atomic():
+            _lock()
+            CachedConfigContext.objects.filter(
+                Q(config_contexts__contains=[config_context.pk]) | Q(object_id__in=matching_objects.values('pk')),
+                object_type=content_type,
+                data__isnull=False
+            ).update(data=None)
+
+        enqueue_rebuild(model)
+
+
+def invalidate_dependent_objects(instance, created=False, deleted=False):
+    """
+    Clear the cached config context data for any objects to which the applicable ConfigContexts might have changed as
+    a result of the given object being saved or deleted.
+    """
+    label = instance._meta.label_lower
+
+    # A Device or VirtualMachine
+    if label in CONFIG_CONTEXT_MODELS:
+        if deleted:
+            content_type = ContentType.objects.get_for_model(instance)
+            CachedConfigContext.objects.filter(object_type=content_type, object_id=instance.pk).delete()
+        elif created:
+            enqueue_rebuild(type(instance))
+        elif _has_changed(instance, CONFIG_CONTEXT_MODELS[label]):
+            invalidate_objects(type(instance).objects.filter(pk=instance.pk))
+
+    # An object related to Devices and/or VirtualMachines
+    elif label in CONFIG_CONTEXT_DEPENDENCIES:
+        fields, lookups = CONFIG_CONTEXT_DEPENDENCIES[label]
+        if created or not (deleted or _has_changed(instance, fields)):
+            return
+        # Include the descendants of a nested object (e.g. a Region)
+        if hasattr(instance, 'get_descendants'):
+            instances = instance.get_descendants(include_self=True)
+        else:
+            instances = [instance]
+        for model_label, lookup in lookups.items():
+            invalidate_objects(apps.get_model(model_label).objects.filter(**{f'{lookup}__in': instances}))
+
+
+def rebuild_cache(label):
+    """
+    Compute and cache the config context data for all objects of the given model which have none cached. Returns
+    the number of objects processed.
+    """
+    cache.delete(f'config_context_rebuild_{label}')
+    model = apps.get_model(label)
+    content_type = ContentType.objects.get_for_model(model)
+    cached = CachedConfigContext.objects.filter(object_type=content_type, object_id=OuterRef('pk'), data__isnull=False)
+
+    count = 0
+    last_pk = 0
+    while True:
+        with transaction.atomic():
+            _lock(shared=False)
+            pks = list(
+                model.objects.filter(~Exists(cached), pk__gt=last_pk).order_by('pk').values_list('pk', flat=True)[
+                    :REBUILD_BATCH_SIZE
+                ]
+            )
+            if not pks:
+                break
+            objects = model.objects.filter(pk__in=pks).annotate_uncached_config_context_data().values_list(
+                'pk', 'config_context_data', 'config_context_ids'
+            )
+            CachedConfigContext.objects.filter(object_type=content_type, object_id__in=pks).delete()
+            CachedConfigContext.objects.bulk_create([
+                CachedConfigContext(
+                    object_type=content_type,
+                    object_id=pk,
+                    data=data or [],
+                    config_contexts=config_context_ids or []
+                ) for pk, data, config_context_ids in objects
+            ])
+        count += len(pks)
+        last_pk = pks[-1]
+
+    return count
@@ -1,11 +1,13 @@
 from contextlib import contextmanager
 
+from django.db import connection
 from django.db.models.signals import m2m_changed, pre_delete, post_save
 
 from extras.signals import clear_webhooks, clear_webhook_queue, handle_changed_object, handle_deleted_object
 from netbox import thread_locals
 from netbox.request_context import set_request
-from .webhooks import flush_webhooks
+from .changelog import ObjectChangeBuffer
+from .webhooks import WebhookQueue, flush_webhooks
 
 
 @contextmanager
@@ -17,7 +19,8 @@ def change_logging(request):
     :param request: WSGIRequest object with a unique `id` set
     """
     set_request(request)
-    thread_locals.webhook_queue = []
+    thread_locals.objectchange_buffer = ObjectChangeBuffer()
+    thread_locals.webhook_queue = WebhookQueue()
 
     # Connect our receivers to the post_save and post_delete signals.
     post_save.connect(handle_changed_object, dispatch_uid='handle_changed_object')
@@ -25,7 +28,9 @@ def change_logging(request):
     pre_delete.connect(handle_deleted_object, dispatch_uid='handle_deleted_object')
     clear_webhooks.connect(clear_webhook_queue, dispatch_uid='clear_webhook_queue')
 
-    yield
+    # Follow savepoints, so that changes which are rolled back are not recorded
+    with connection.execute_wrapper(thread_locals.objectchange_buffer.track_savepoints):
+        yield
 
     # Disconnect change logging signals. This is necessary to avoid recording any errant
     # changes during test cleanup.
@@ -34,6 +39,10 @@ def change_logging(request):
     pre_delete.disconnect(handle_deleted_object, dispatch_uid='handle_deleted_object')
     clear_webhooks.disconnect(clear_webhook_queue, dispatch_uid='clear_webhook_queue')
 
+    # Record all buffered ObjectChanges
+    thread_locals.objectchange_buffer.flush()
+    del thread_locals.objectchange_buffer
+
     # Flush queued webhooks to RQ
     flush_webhooks(thread_locals.webhook_queue)
     del thread_locals.webhook_queue
@@ -0,0 +1,171 @@
+import gzip
+import logging
+import tempfile
+import time
+from itertools import chain
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+from django.http import FileResponse, Http404
+from django.urls import reverse
+from django.utils.module_loading import import_string
+
+from utilities.querysets import chunked_iterator
+from utilities.utils import csv_rows
+from .choices import JobResultStatusChoices
+from .models import ExportTemplate, JobResult
+
+__all__ = (
+    'delete_export',
+    'enqueue_export',
+    'get_export_response',
+    'run_export',
+)
+
+# The minimum interval (in seconds) between updates to the recorded progress of an export job
+PROGRESS_INTERVAL = 2
+
+logger = logging.getLogger('netbox.exports')
+
+
+def get_export_storage():
+    """
+    Return the storage for exported files. Exports are stored outside MEDIA_ROOT, such that they can be retrieved only
+    by way of the download views (which are restricted to the user who requested the export).
+    """
+    return FileSystemStorage(location=settings.EXPORTS_ROOT)
+
+
+def get_export_path(job_result):
+    """
+    Return the storage path of the file exported by a job.
+    """
+    return f'{job_result.job_id}.gz'
+
+
+def get_export_response(job_result):
+    """
+    Return a response serving the file exported by a completed job, or raise Http404 if none exists.
+    """
+    if job_result.status != JobResultStatusChoices.STATUS_COMPLETED or 'filename' not in (job_result.data or {}):
+        raise Http404
+    storage = get_export_storage()
+    path = get_export_path(job_result)
+    if not storage.exists(path):
+        raise Http404
+
+    return FileResponse(
+        storage.open(path, 'rb'),
+        as_attachment=True,
+        filename=job_result.data['filename'],
+        content_type='application/gzip'
+    )
+
+
+def delete_export(job_result):
+    """
+    Delete the file exported by a job (if any).
+    """
+    if 'filename' in (job_result.data or {}):
+        get_export_storage().delete(get_export_path(job_result))
+
+
+def enqueue_export(queryset, user, export_template=None, table=None, columns=None):
+    """
+    Enqueue a background job to export the given QuerySet, and return its JobResult. The objects are exported by
+    rendering an ExportTemplate (if one is given), as CSV table data (if a table is given), or otherwise as YAML.
+
+    :param queryset: The QuerySet of objects to export
+    :param user: The user requesting the export
+    :param export_template: The ExportTemplate to render
+    :param table: The Table class used to export CSV data
+    :param columns: The names of the table columns to export. If None, all columns will be exported.
+    """
+    model = queryset.model
+
+    return JobResult.enqueue_job(
+        run_export,
+        f'Export {model._meta.verbose_name_plural}',
+        ContentType.objects.get_for_model(model),
+        user,
+        query=queryset.query,
+        prefetch_related_lookups=queryset._prefetch_related_lookups,
+        export_template=export_template.pk if export_template else None,
+        table=f'{table.__module__}.{table.__name__}' if table else None,
+        columns=columns
+    )
+
+
+def run_export(job_result, query, prefetch_related_lookups, export_template=None, table=None, columns=None):
+    """
+    Export a set of objects to a gzip-compressed file saved to storage. The progress of the export (the number of
+    objects exported and bytes written) is recorded on the JobResult as it runs. Once completed, the file can be
+    downloaded (by the user who requested the export) from the URL recorded in the JobResult's data.
+    """
+    model = job_result.obj_type.model_class()
+    queryset = model.objects.all()
+    queryset.query = query
+    queryset = queryset.prefetch_related(*prefetch_related_lookups)
+
+    job_result.set_status(JobResultStatusChoices.STATUS_RUNNING)
+    job_result.data = {'total': queryset.count(), 'exported': 0, 'written': 0}
+    job_result.save()
+    last_update = time.monotonic()
+
+    def count_exported(objects):
+        for obj in objects:
+            job_result.data['exported'] += 1
+            yield obj
+
+    try:
+        if export_template:
+            export_template = ExportTemplate.objects.get(pk=export_template)
+            filename = export_template.get_filename(model)
+            # The objects iterated by the template cannot be counted
+            job_result.data['exported'] = None
+            content = export_template.render_stream(queryset)
+        elif table:
+            table = import_string(table)(queryset, user=job_result.user)
+            exclude_columns = {'pk', 'actions'}
+            if columns:
+                exclude_columns.update({
+                    column.name for column in table.columns.iterall() if column.name not in columns
+                })
+            filename = f'netbox_{model._meta.verbose_name_plural}.csv'
+            rows = table.as_values(exclude_columns=exclude_columns)
+            content = csv_rows(chain([next(rows)], count_exported(rows)))
+        else:
+            filename = f'netbox_{model._meta.verbose_name_plural}.yaml'
+            content = (
+                obj.to_yaml() if not i else f'---\n{obj.to_yaml()}'
+                for i, obj in enumerate(count_exported(chunked_iterator(queryset)))
+            )
+
+        with tempfile.TemporaryFile() as temp_file:
+            with gzip.GzipFile(filename=filename, mode='wb', fileobj=temp_file) as gzip_file:
+                for chunk in content:
+                    job_result.data['written'] += gzip_file.write(chunk.encode())
+                    if time.monotonic() - last_update >= PROGRESS_INTERVAL:
+                        job_result.save(update_fields=['data'])
+                        last_update = time.monotonic()
+            temp_file.seek(0)
+            storage = get_export_storage()
+            path = storage.save(get_export_path(job_result), File(temp_file))
+
+        job_result.data.update({
+            'filename': f'{filename}.gz',
+            'size': storage.size(path),
+            'url': reverse('extras-api:jobresult-download', kwargs={'pk': job_result.pk}),
+        })
+        job_result.set_status(JobResultStatusChoices.STATUS_COMPLETED)
+        logger.info(f"Exported {model._meta.verbose_name_plural} to {path}")
+
+    except Exception as e:
+        logger.error(f"Exception raised during export: {e}")
+        job_result.data['error'] = str(e)
+        job_result.set_status(JobResultStatusChoices.STATUS_ERRORED)
+
+    finally:
+        job_result.save()
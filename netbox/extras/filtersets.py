@@ -39,6 +39,9 @@ class WebhookFilterSet(BaseFilterSet):
     http_method = django_filters.MultipleChoiceFilter(
         choices=WebhookHttpMethodChoices
     )
+    delivery = django_filters.MultipleChoiceFilter(
+        choices=WebhookDeliveryChoices
+    )
 
     class Meta:
         model = Webhook
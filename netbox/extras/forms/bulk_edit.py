@@ -136,6 +136,10 @@ class WebhookBulkEditForm(BulkEditForm):
         required=False,
         label='Payload URL'
     )
+    delivery = forms.ChoiceField(
+        choices=add_blank_choice(WebhookDeliveryChoices),
+        required=False
+    )
     ssl_verification = forms.NullBooleanField(
         required=False,
         widget=BulkEditNullBooleanSelect(),
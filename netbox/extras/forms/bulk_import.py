@@ -3,7 +3,7 @@ from django.contrib.contenttypes.models import ContentType
 from django.contrib.postgres.forms import SimpleArrayField
 from django.utils.safestring import mark_safe
 
-from extras.choices import CustomFieldTypeChoices
+from extras.choices import CustomFieldTypeChoices, WebhookDeliveryChoices
 from extras.models import *
 from extras.utils import FeatureQuery
 from utilities.forms import CSVChoiceField, CSVContentTypeField, CSVModelForm, CSVMultipleContentTypeField, SlugField
@@ -83,13 +83,18 @@ class WebhookCSVForm(CSVModelForm):
         limit_choices_to=FeatureQuery('webhooks'),
         help_text="One or more assigned object types"
     )
+    delivery = CSVChoiceField(
+        choices=WebhookDeliveryChoices,
+        required=False,
+        help_text='Delivery mode (defaults to individual)'
+    )
 
     class Meta:
         model = Webhook
         fields = (
             'name', 'enabled', 'content_types', 'type_create', 'type_update', 'type_delete', 'payload_url',
-            'http_method', 'http_content_type', 'additional_headers', 'body_template', 'secret', 'ssl_verification',
-            'ca_file_path'
+            'http_method', 'http_content_type', 'additional_headers', 'body_template', 'delivery', 'secret',
+            'ssl_verification', 'ca_file_path'
         )
 
 
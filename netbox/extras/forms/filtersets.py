@@ -120,7 +120,7 @@ class ExportTemplateFilterForm(FilterForm):
 class WebhookFilterForm(FilterForm):
     fieldsets = (
         (None, ('q',)),
-        ('Attributes', ('content_type_id', 'http_method', 'enabled')),
+        ('Attributes', ('content_type_id', 'http_method', 'delivery', 'enabled')),
         ('Events', ('type_create', 'type_update', 'type_delete')),
     )
     content_type_id = ContentTypeMultipleChoiceField(
@@ -134,6 +134,10 @@ class WebhookFilterForm(FilterForm):
         required=False,
         label=_('HTTP method')
     )
+    delivery = MultipleChoiceField(
+        choices=WebhookDeliveryChoices,
+        required=False
+    )
     enabled = forms.NullBooleanField(
         required=False,
         widget=StaticSelect(
@@ -120,6 +120,7 @@ class WebhookForm(BootstrapMixin, forms.ModelForm):
         ('HTTP Request', (
             'payload_url', 'http_method', 'http_content_type', 'additional_headers', 'body_template', 'secret',
         )),
+        ('Delivery', ('delivery',)),
         ('Conditions', ('conditions',)),
         ('SSL', ('ssl_verification', 'ca_file_path')),
     )
@@ -134,6 +135,7 @@ class WebhookForm(BootstrapMixin, forms.ModelForm):
         }
         widgets = {
             'http_method': StaticSelect(),
+            'delivery': StaticSelect(),
             'additional_headers': forms.Textarea(attrs={'class': 'font-monospace'}),
             'body_template': forms.Textarea(attrs={'class': 'font-monospace'}),
             'conditions': forms.Textarea(attrs={'class': 'font-monospace'}),
@@ -3,6 +3,7 @@ from django.contrib.contenttypes.models import ContentType
 from graphene.types.generic import GenericScalar
 
 from extras.models import ObjectChange
+from netbox.graphql.optimizer import restrict_queryset
 
 __all__ = (
     'ChangelogMixin',
@@ -51,7 +52,7 @@ class JournalEntriesMixin:
     journal_entries = graphene.List('extras.graphql.types.JournalEntryType')
 
     def resolve_journal_entries(self, info):
-        return self.journal_entries.restrict(info.context.user, 'view')
+        return restrict_queryset(self.journal_entries.all(), info)
 
 
 class TagsMixin:
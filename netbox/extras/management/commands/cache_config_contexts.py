@@ -0,0 +1,22 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand
+
+from extras.configcontext_cache import CONFIG_CONTEXT_MODELS, rebuild_cache
+
+
+class Command(BaseCommand):
+    help = "Compute and cache the config context data for all devices and virtual machines which have none cached"
+
+    def handle(self, *args, **options):
+
+        for label in CONFIG_CONTEXT_MODELS:
+            model = apps.get_model(label)
+            if options['verbosity']:
+                self.stdout.write(f"{model._meta.verbose_name_plural.capitalize()}... ", ending='')
+                self.stdout.flush()
+            count = rebuild_cache(label)
+            if options['verbosity']:
+                self.stdout.write(self.style.SUCCESS(f"{count} cached"))
+
+        if options['verbosity']:
+            self.stdout.write(self.style.SUCCESS("Done."))
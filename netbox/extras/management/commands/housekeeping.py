@@ -9,6 +9,7 @@ from django.db import DEFAULT_DB_ALIAS
 from django.utils import timezone
 from packaging import version
 
+from extras.exports import delete_export
 from extras.models import JobResult
 from extras.models import ObjectChange
 from netbox.config import Config
@@ -81,6 +82,9 @@ class Command(BaseCommand):
                         ending=""
                     )
                     self.stdout.flush()
+                # Delete any files exported by expired jobs
+                for job_result in JobResult.objects.filter(created__lt=cutoff, data__filename__isnull=False):
+                    delete_export(job_result)
                 JobResult.objects.filter(created__lt=cutoff)._raw_delete(using=DEFAULT_DB_ALIAS)
                 if options['verbosity']:
                     self.stdout.write("Done.", self.style.SUCCESS)
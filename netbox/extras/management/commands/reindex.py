@@ -0,0 +1,55 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+
+from extras.search import get_indexed_models, rebuild_index
+
+
+class Command(BaseCommand):
+    help = "Rebuild the global search index for the specified models"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'args', metavar='app_label.ModelName', nargs='*',
+            help='One or more specific models (each prefixed with its app_label) to reindex',
+        )
+
+    def _get_models(self, names):
+        """
+        Compile a list of models to be reindexed. If no names are specified, all indexed models will be included.
+        """
+        indexed_models = get_indexed_models()
+
+        if not names:
+            return list(indexed_models)
+
+        models = []
+        for name in names:
+            try:
+                model = apps.get_model(name)
+            except (LookupError, ValueError):
+                raise CommandError(f"Unknown model: {name}. Models must be specified in the form app_label.ModelName.")
+            if model not in indexed_models:
+                raise CommandError(f"Invalid model: {name} is not included in the search index")
+            models.append(model)
+
+        return models
+
+    def handle(self, *args, **options):
+
+        models = self._get_models(args)
+
+        if options['verbosity']:
+            self.stdout.write(f"Reindexing {len(models)} models.")
+
+        total = 0
+        for model in models:
+            if options['verbosity']:
+                self.stdout.write(f"{model._meta.label}... ", ending='')
+                self.stdout.flush()
+            count = rebuild_index(model)
+            total += count
+            if options['verbosity']:
+                self.stdout.write(self.style.SUCCESS(f"{count} values cached"))
+
+        if options['verbosity']:
+            self.stdout.write(self.style.SUCCESS(f"Done. ({total} values cached)"))
@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('extras', '0077_customlink_extend_text_and_url'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='webhook',
+            name='delivery',
+            field=models.CharField(default='individual', max_length=30),
+        ),
+    ]
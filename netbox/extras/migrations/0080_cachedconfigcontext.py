@@ -0,0 +1,33 @@
+import django.contrib.postgres.fields
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('extras', '0079_cachedvalue'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CachedConfigContext',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False)),
+                ('object_id', models.PositiveBigIntegerField()),
+                ('data', models.JSONField(blank=True, null=True)),
+                ('config_contexts', django.contrib.postgres.fields.ArrayField(base_field=models.BigIntegerField(), default=list, size=None)),
+                ('object_type', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='contenttypes.contenttype')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='cachedconfigcontext',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['config_contexts'], name='extras_cachedcc_contexts'),
+        ),
+        migrations.AddConstraint(
+            model_name='cachedconfigcontext',
+            constraint=models.UniqueConstraint(fields=('object_type', 'object_id'), name='extras_cachedconfigcontext_object'),
+        ),
+    ]
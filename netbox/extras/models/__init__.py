@@ -1,10 +1,13 @@
 from .change_logging import ObjectChange
-from .configcontexts import ConfigContext, ConfigContextModel
+from .configcontexts import CachedConfigContext, ConfigContext, ConfigContextModel
 from .customfields import CustomField
 from .models import *
+from .search import CachedValue
 from .tags import Tag, TaggedItem
 
 __all__ = (
+    'CachedConfigContext',
+    'CachedValue',
     'ConfigContext',
     'ConfigContextModel',
     'ConfigRevision',
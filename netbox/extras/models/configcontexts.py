@@ -1,3 +1,7 @@
+from django.contrib.contenttypes.fields import GenericForeignKey
+from django.contrib.contenttypes.models import ContentType
+from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex
 from django.core.validators import ValidationError
 from django.db import models
 from django.urls import reverse
@@ -9,6 +13,7 @@ from utilities.utils import deepmerge
 
 
 __all__ = (
+    'CachedConfigContext',
     'ConfigContext',
     'ConfigContextModel',
 )
@@ -126,6 +131,46 @@ class ConfigContext(WebhooksMixin, ChangeLoggedModel):
             )
 
 
+class CachedConfigContext(models.Model):
+    """
+    The config context data which applies to a device or virtual machine, as computed by
+    ConfigContextModelQuerySet.annotate_config_context_data(). `data` is cleared when the object or any of the
+    ConfigContexts which apply to it are modified, pending recomputation by a background job.
+    """
+    object_type = models.ForeignKey(
+        to=ContentType,
+        on_delete=models.CASCADE,
+        related_name='+'
+    )
+    object_id = models.PositiveBigIntegerField()
+    object = GenericForeignKey(
+        ct_field='object_type',
+        fk_field='object_id'
+    )
+    data = models.JSONField(
+        blank=True,
+        null=True
+    )
+    config_contexts = ArrayField(
+        base_field=models.BigIntegerField(),
+        default=list
+    )
+
+    class Meta:
+        constraints = (
+            models.UniqueConstraint(
+                fields=('object_type', 'object_id'),
+                name='extras_cachedconfigcontext_object'
+            ),
+        )
+        indexes = (
+            GinIndex(fields=('config_contexts',), name='extras_cachedcc_contexts'),
+        )
+
+    def __str__(self):
+        return f'{self.object_type.model} {self.object_id}'
+
+
 class ConfigContextModel(models.Model):
     """
     A model which includes local configuration context data. This local data will override any inherited data from
@@ -1,5 +1,8 @@
 import json
+import threading
 import uuid
+from collections import OrderedDict
+from itertools import chain
 
 from django.contrib import admin
 from django.contrib.auth.models import User
@@ -8,7 +11,7 @@ from django.contrib.contenttypes.models import ContentType
 from django.core.cache import cache
 from django.core.validators import ValidationError
 from django.db import models
-from django.http import HttpResponse
+from django.http import StreamingHttpResponse
 from django.urls import reverse
 from django.utils import timezone
 from django.utils.formats import date_format
@@ -23,8 +26,8 @@ from netbox.models import ChangeLoggedModel
 from netbox.models.features import (
     CustomFieldsMixin, CustomLinksMixin, ExportTemplatesMixin, JobResultsMixin, TagsMixin, WebhooksMixin,
 )
-from utilities.querysets import RestrictedQuerySet
-from utilities.utils import render_jinja2
+from utilities.querysets import ChunkedQuerySet, RestrictedQuerySet
+from utilities.utils import compile_jinja2, render_jinja2
 
 __all__ = (
     'ConfigRevision',
@@ -38,6 +41,9 @@ __all__ = (
     'Webhook',
 )
 
+# The maximum number of Webhooks for which compiled conditions and templates are cached by each process
+WEBHOOK_CACHE_SIZE = 256
+
 
 class Webhook(ExportTemplatesMixin, WebhooksMixin, ChangeLoggedModel):
     """
@@ -45,6 +51,10 @@ class Webhook(ExportTemplatesMixin, WebhooksMixin, ChangeLoggedModel):
     delete in NetBox. The request will contain a representation of the object, which the remote application can act on.
     Each Webhook can be limited to firing only on certain actions or certain object types.
     """
+    # Compiled conditions and templates, keyed by PK and last updated time
+    _compiled_cache = OrderedDict()
+    _compiled_cache_lock = threading.Lock()
+
     content_types = models.ManyToManyField(
         to=ContentType,
         related_name='webhooks',
@@ -102,6 +112,14 @@ class Webhook(ExportTemplatesMixin, WebhooksMixin, ChangeLoggedModel):
                   'included. Available context data includes: <code>event</code>, <code>model</code>, '
                   '<code>timestamp</code>, <code>username</code>, <code>request_id</code>, and <code>data</code>.'
     )
+    delivery = models.CharField(
+        max_length=30,
+        choices=WebhookDeliveryChoices,
+        default=WebhookDeliveryChoices.DELIVERY_INDIVIDUAL,
+        help_text="Individual delivery processes each event as a separate background job. Batched delivery processes "
+                  "all events resulting from a request in a single job; an array payload delivers them in a single "
+                  "HTTP request."
+    )
     secret = models.CharField(
         max_length=255,
         blank=True,
@@ -158,6 +176,42 @@ class Webhook(ExportTemplatesMixin, WebhooksMixin, ChangeLoggedModel):
                 'ca_file_path': 'Do not specify a CA certificate file if SSL verification is disabled.'
             })
 
+    def get_compiled(self):
+        """
+        Return a dictionary of the webhook's compiled ConditionSet and Jinja2 templates (keyed by field name). These are
+        cached by the process, with the least recently used webhooks evicted first, so that processing a stream of
+        events does not recompile them for each event. Saving a Webhook (which updates last_updated) invalidates its
+        entry.
+        """
+        key = (self.pk, self.last_updated)
+        with self._compiled_cache_lock:
+            if key in self._compiled_cache:
+                self._compiled_cache.move_to_end(key)
+                return self._compiled_cache[key]
+
+        compiled = {
+            'conditions': ConditionSet(self.conditions) if self.conditions else None,
+            'additional_headers': compile_jinja2(self.additional_headers) if self.additional_headers else None,
+            'body_template': compile_jinja2(self.body_template) if self.body_template else None,
+            'payload_url': compile_jinja2(self.payload_url),
+        }
+
+        # Unsaved instances are not cached
+        if self.pk is not None:
+            with self._compiled_cache_lock:
+                self._compiled_cache[key] = compiled
+                if len(self._compiled_cache) > WEBHOOK_CACHE_SIZE:
+                    self._compiled_cache.popitem(last=False)
+
+        return compiled
+
+    def eval_conditions(self, data):
+        """
+        Test whether the given data meets the webhook's conditions (if any).
+        """
+        condition_set = self.get_compiled()['conditions']
+        return condition_set is None or condition_set.eval(data)
+
     def render_headers(self, context):
         """
         Render additional_headers and return a dict of Header: Value pairs.
@@ -165,7 +219,7 @@ class Webhook(ExportTemplatesMixin, WebhooksMixin, ChangeLoggedModel):
         if not self.additional_headers:
             return {}
         ret = {}
-        data = render_jinja2(self.additional_headers, context)
+        data = self.get_compiled()['additional_headers'].render(**context)
         for line in data.splitlines():
             header, value = line.split(':', 1)
             ret[header.strip()] = value.strip()
@@ -176,15 +230,24 @@ class Webhook(ExportTemplatesMixin, WebhooksMixin, ChangeLoggedModel):
         Render the body template, if defined. Otherwise, jump the context as a JSON object.
         """
         if self.body_template:
-            return render_jinja2(self.body_template, context)
+            return self.get_compiled()['body_template'].render(**context)
         else:
             return json.dumps(context, cls=JSONEncoder)
 
+    def render_batch_body(self, context):
+        """
+        Render the body template for a batch of events, if defined. Otherwise, dump the list of events as a JSON array.
+        """
+        if self.body_template:
+            return self.get_compiled()['body_template'].render(**context)
+        else:
+            return json.dumps(context['events'], cls=JSONEncoder)
+
     def render_payload_url(self, context):
         """
         Render the payload URL.
         """
-        return render_jinja2(self.payload_url, context)
+        return self.get_compiled()['payload_url'].render(**context)
 
 
 class CustomLink(ExportTemplatesMixin, WebhooksMixin, ChangeLoggedModel):
@@ -315,34 +378,52 @@ class ExportTemplate(ExportTemplatesMixin, WebhooksMixin, ChangeLoggedModel):
         """
         Render the contents of the template.
         """
-        context = {
-            'queryset': queryset
-        }
-        output = render_jinja2(self.template_code, context)
-
-        # Replace CRLF-style line terminators
-        output = output.replace('\r\n', '\n')
+        return ''.join(self.render_stream(queryset))
 
-        return output
+    def render_stream(self, queryset):
+        """
+        Render the contents of the template incrementally, yielding chunks of output. The queryset is retrieved from
+        the database in chunks as the template iterates over it.
+        """
+        template = compile_jinja2(self.template_code)
+        pending = ''
+        for chunk in template.generate(queryset=ChunkedQuerySet(queryset)):
+            # Replace CRLF-style line terminators (holding back a trailing CR until the next chunk)
+            chunk = (pending + chunk).replace('\r\n', '\n')
+            pending = '\r' if chunk.endswith('\r') else ''
+            if pending:
+                chunk = chunk[:-1]
+            if chunk:
+                yield chunk
+        if pending:
+            yield pending
 
     def render_to_response(self, queryset):
         """
-        Render the template to an HTTP response, delivered as a named file attachment
+        Render the template to a streaming HTTP response, delivered as a named file attachment. The first chunk of
+        output is rendered immediately, such that any error raised by the template upon rendering is raised here.
         """
-        output = self.render(queryset)
+        output = self.render_stream(queryset)
+        first_chunk = next(output, '')
         mime_type = 'text/plain' if not self.mime_type else self.mime_type
 
         # Build the response
-        response = HttpResponse(output, content_type=mime_type)
+        response = StreamingHttpResponse(chain((first_chunk,), output), content_type=mime_type)
 
         if self.as_attachment:
-            basename = queryset.model._meta.verbose_name_plural.replace(' ', '_')
-            extension = f'.{self.file_extension}' if self.file_extension else ''
-            filename = f'netbox_{basename}{extension}'
-            response['Content-Disposition'] = f'attachment; filename="{filename}"'
+            response['Content-Disposition'] = f'attachment; filename="{self.get_filename(queryset.model)}"'
 
         return response
 
+    def get_filename(self, model):
+        """
+        Return the name of the file to which the template's output for the given model is saved.
+        """
+        basename = model._meta.verbose_name_plural.replace(' ', '_')
+        extension = f'.{self.file_extension}' if self.file_extension else ''
+
+        return f'netbox_{basename}{extension}'
+
 
 class ImageAttachment(WebhooksMixin, ChangeLoggedModel):
     """
@@ -0,0 +1,40 @@
+from django.contrib.contenttypes.fields import GenericForeignKey
+from django.contrib.contenttypes.models import ContentType
+from django.db import models
+
+__all__ = (
+    'CachedValue',
+)
+
+
+class CachedValue(models.Model):
+    """
+    A searchable value belonging to an object, copied from one of its fields into the global search index. A lower
+    weight indicates a more relevant match (e.g. an object's name versus its comments).
+    """
+    object_type = models.ForeignKey(
+        to=ContentType,
+        on_delete=models.CASCADE,
+        related_name='+'
+    )
+    object_id = models.PositiveBigIntegerField()
+    object = GenericForeignKey(
+        ct_field='object_type',
+        fk_field='object_id'
+    )
+    field = models.CharField(
+        max_length=200
+    )
+    value = models.TextField()
+    weight = models.PositiveSmallIntegerField(
+        default=1000
+    )
+
+    class Meta:
+        ordering = ('weight', 'object_type', 'object_id')
+        indexes = (
+            models.Index(fields=('object_type', 'object_id')),
+        )
+
+    def __str__(self):
+        return f'{self.object_type.model} {self.object_id}: {self.field}={self.value}'
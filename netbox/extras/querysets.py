@@ -1,5 +1,6 @@
 from django.contrib.postgres.aggregates import JSONBAgg
 from django.db.models import OuterRef, Subquery, Q
+from django.db.models.functions import Coalesce
 
 from extras.models.tags import TaggedItem
 from utilities.query_functions import EmptyGroupByJSONBAgg
@@ -75,19 +76,46 @@ class ConfigContextModelQuerySet(RestrictedQuerySet):
     """
     def annotate_config_context_data(self):
         """
-        Attach the subquery annotation to the base queryset
+        Attach the subquery annotation to the base queryset. The data cached for each object (see CachedConfigContext)
+        is used where available, and the subquery is evaluated only for objects which have no valid cached data.
+        """
+        from extras.models import CachedConfigContext
+        # The content type is matched by name (rather than resolved here) so that the database is not queried until the
+        # QuerySet is evaluated
+        cached_data = CachedConfigContext.objects.filter(
+            object_type__app_label=self.model._meta.app_label,
+            object_type__model=self.model._meta.model_name,
+            object_id=OuterRef('pk'),
+            data__isnull=False
+        ).values('data')
+
+        return self.annotate(
+            config_context_data=Coalesce(Subquery(cached_data), self._get_config_context_subquery('data'))
+        ).distinct()
+
+    def annotate_uncached_config_context_data(self):
+        """
+        Attach the subquery annotation to the base queryset, disregarding any cached data. The IDs of the applicable
+        ConfigContexts are annotated as well, as `config_context_ids`.
         """
-        from extras.models import ConfigContext
         return self.annotate(
-            config_context_data=Subquery(
-                ConfigContext.objects.filter(
-                    self._get_config_context_filters()
-                ).annotate(
-                    _data=EmptyGroupByJSONBAgg('data', ordering=['weight', 'name'])
-                ).values("_data").order_by()
-            )
+            config_context_data=self._get_config_context_subquery('data'),
+            config_context_ids=self._get_config_context_subquery('pk')
         ).distinct()
 
+    def _get_config_context_subquery(self, field):
+        """
+        Return a subquery which aggregates the given field of all ConfigContexts which apply to each object.
+        """
+        from extras.models import ConfigContext
+        return Subquery(
+            ConfigContext.objects.filter(
+                self._get_config_context_filters()
+            ).annotate(
+                _data=EmptyGroupByJSONBAgg(field, ordering=['weight', 'name'])
+            ).values("_data").order_by()
+        )
+
     def _get_config_context_filters(self):
         # Construct the set of Q objects for the specific object types
         tag_query_filters = {
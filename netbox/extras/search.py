@@ -0,0 +1,162 @@
+from functools import lru_cache
+
+from django.contrib.contenttypes.models import ContentType
+from django.db.models import OuterRef, Q, Subquery
+
+from .models import CachedValue
+
+__all__ = (
+    'cache_object',
+    'filter_queryset',
+    'get_indexed_models',
+    'get_matched_object_types',
+    'rebuild_index',
+    'remove_object',
+    'search',
+)
+
+SEARCH_INDEX_BATCH_SIZE = 1000
+
+
+@lru_cache(maxsize=None)
+def get_indexed_models():
+    """
+    Return a mapping of each searchable model to its indexed fields, as a tuple of (field name, weight) pairs.
+    """
+    from netbox.search import SEARCH_TYPES
+
+    return {
+        search_type['queryset'].model: search_type['fields'] for search_type in SEARCH_TYPES.values()
+    }
+
+
+def _get_cached_values(instance, content_type, fields):
+    """
+    Return a list of (unsaved) CachedValues for the populated fields of an object.
+    """
+    cached_values = []
+
+    for name, weight in fields:
+        value = getattr(instance, name)
+        if value is None or value == '':
+            continue
+        cached_values.append(CachedValue(
+            object_type=content_type,
+            object_id=instance.pk,
+            field=name,
+            value=str(value),
+            weight=weight
+        ))
+
+    return cached_values
+
+
+def cache_object(instance, created=False):
+    """
+    Replace any cached values for an object with its current field values. Objects of models which are not indexed
+    are ignored. If the object has just been created, it has no cached values to be replaced.
+    """
+    fields = get_indexed_models().get(type(instance))
+    if fields is None:
+        return
+
+    content_type = ContentType.objects.get_for_model(instance)
+    if not created:
+        CachedValue.objects.filter(object_type=content_type, object_id=instance.pk).delete()
+    CachedValue.objects.bulk_create(_get_cached_values(instance, content_type, fields))
+
+
+def remove_object(instance):
+    """
+    Delete all cached values for an object.
+    """
+    if type(instance) not in get_indexed_models():
+        return
+
+    content_type = ContentType.objects.get_for_model(instance)
+    CachedValue.objects.filter(object_type=content_type, object_id=instance.pk).delete()
+
+
+def rebuild_index(model):
+    """
+    Discard and recreate the cached values for all objects of the given model. Returns the number of values cached.
+    """
+    fields = get_indexed_models()[model]
+    content_type = ContentType.objects.get_for_model(model)
+    CachedValue.objects.filter(object_type=content_type).delete()
+
+    count = 0
+    cached_values = []
+    for instance in model.objects.iterator(chunk_size=SEARCH_INDEX_BATCH_SIZE):
+        cached_values.extend(_get_cached_values(instance, content_type, fields))
+        if len(cached_values) >= SEARCH_INDEX_BATCH_SIZE:
+            count += len(CachedValue.objects.bulk_create(cached_values))
+            cached_values = []
+    count += len(CachedValue.objects.bulk_create(cached_values))
+
+    return count
+
+
+def get_matched_object_types(value):
+    """
+    Return the IDs of all ContentTypes having at least one cached value which contains the given string.
+    """
+    return set(
+        CachedValue.objects.filter(value__icontains=value).order_by().values_list('object_type', flat=True).distinct()
+    )
+
+
+def filter_queryset(queryset, value):
+    """
+    Filter a queryset to objects having a cached value which contains the given string, ordered by the weight of
+    their most relevant match. The weight is annotated on each object as `search_weight`.
+    """
+    content_type = ContentType.objects.get_for_model(queryset.model)
+    matches = CachedValue.objects.filter(object_type=content_type, value__icontains=value)
+
+    return queryset.filter(
+        pk__in=matches.values('object_id')
+    ).annotate(
+        search_weight=Subquery(matches.filter(object_id=OuterRef('pk')).order_by('weight').values('weight')[:1])
+    ).order_by('search_weight', 'pk')
+
+
+def search(value, user, object_types=None):
+    """
+    Search the index for objects having a cached value which contains the given string. Only objects which the user
+    is permitted to view are returned.
+
+    Returns a queryset of CachedValues holding the most relevant (lowest weight) match for each object, ordered by
+    weight.
+
+    Args:
+        value: The string to search for (case-insensitive)
+        user: The User performing the search
+        object_types: An optional iterable of ContentTypes to which the search is limited
+    """
+    queryset = CachedValue.objects.filter(value__icontains=value)
+    if object_types is not None:
+        queryset = queryset.filter(object_type__in=object_types)
+
+    # Limit the results for each type of object to those objects which the user may view
+    indexed_models = get_indexed_models()
+    permitted = Q()
+    for content_type in ContentType.objects.filter(pk__in=queryset.values('object_type')):
+        model = content_type.model_class()
+        if model not in indexed_models:
+            continue
+        restricted_queryset = model.objects.restrict(user, 'view')
+        if restricted_queryset.query.is_empty():
+            continue
+        permitted |= Q(object_type=content_type, object_id__in=restricted_queryset.values('pk'))
+    if not permitted:
+        return queryset.none()
+
+    # Select the lowest-weight match for each object
+    best_matches = queryset.filter(permitted).order_by(
+        'object_type', 'object_id', 'weight'
+    ).distinct(
+        'object_type', 'object_id'
+    )
+
+    return CachedValue.objects.filter(pk__in=Subquery(best_matches.values('pk')))
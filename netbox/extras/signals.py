@@ -1,8 +1,9 @@
 import importlib
 import logging
 
+from django.apps import apps
 from django.contrib.contenttypes.models import ContentType
-from django.db.models.signals import m2m_changed, post_save, pre_delete
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
 from django.dispatch import receiver, Signal
 from django_prometheus.models import model_deletes, model_inserts, model_updates
 
@@ -12,8 +13,14 @@ from netbox.config import get_config
 from netbox.request_context import get_request
 from netbox.signals import post_clean
 from .choices import ObjectChangeActionChoices
-from .models import ConfigRevision, CustomField, ObjectChange
-from .webhooks import enqueue_object, get_snapshots, serialize_for_webhook
+from .configcontext_cache import (
+    CONFIG_CONTEXT_DEPENDENCIES, CONFIG_CONTEXT_MODELS, invalidate_config_context, invalidate_dependent_objects,
+    invalidate_objects,
+)
+from .exports import delete_export
+from .models import ConfigContext, ConfigRevision, CustomField, JobResult, TaggedItem
+from .search import cache_object, get_indexed_models, remove_object
+from .webhooks import enqueue_object
 
 #
 # Change logging/webhooks
@@ -33,13 +40,6 @@ def handle_changed_object(sender, instance, **kwargs):
     request = get_request()
     m2m_changed = False
 
-    def is_same_object(instance, webhook_data):
-        return (
-            ContentType.objects.get_for_model(instance) == webhook_data['content_type'] and
-            instance.pk == webhook_data['object_id'] and
-            request.id == webhook_data['request_id']
-        )
-
     # Determine the type of change being made
     if kwargs.get('created'):
         action = ObjectChangeActionChoices.ACTION_CREATE
@@ -52,30 +52,20 @@ def handle_changed_object(sender, instance, **kwargs):
     else:
         return
 
-    # Record an ObjectChange if applicable
+    # Record an ObjectChange if applicable. M2M changes are merged into the ObjectChange already buffered for the object.
     if hasattr(instance, 'to_objectchange'):
         if m2m_changed:
-            ObjectChange.objects.filter(
-                changed_object_type=ContentType.objects.get_for_model(instance),
-                changed_object_id=instance.pk,
-                request_id=request.id
-            ).update(
-                postchange_data=instance.to_objectchange(action).postchange_data
-            )
+            objectchange = thread_locals.objectchange_buffer.get_latest(instance)
+            if objectchange is not None:
+                objectchange.postchange_data = instance.to_objectchange(action).postchange_data
         else:
             objectchange = instance.to_objectchange(action)
             objectchange.user = request.user
             objectchange.request_id = request.id
-            objectchange.save()
+            thread_locals.objectchange_buffer.add(objectchange)
 
-    # If this is an M2M change, update the previously queued webhook (from post_save)
-    webhook_queue = thread_locals.webhook_queue
-    if m2m_changed and webhook_queue and is_same_object(instance, webhook_queue[-1]):
-        instance.refresh_from_db()  # Ensure that we're working with fresh M2M assignments
-        webhook_queue[-1]['data'] = serialize_for_webhook(instance)
-        webhook_queue[-1]['snapshots']['postchange'] = get_snapshots(instance, action)['postchange']
-    else:
-        enqueue_object(webhook_queue, instance, request.user, request.id, action)
+    # Enqueue webhooks. (Any M2M change is coalesced with the event previously queued by post_save.)
+    enqueue_object(thread_locals.webhook_queue, instance, request.user, request.id, action)
 
     # Increment metric counters
     if action == ObjectChangeActionChoices.ACTION_CREATE:
@@ -98,7 +88,7 @@ def handle_deleted_object(sender, instance, **kwargs):
         objectchange = instance.to_objectchange(ObjectChangeActionChoices.ACTION_DELETE)
         objectchange.user = request.user
         objectchange.request_id = request.id
-        objectchange.save()
+        thread_locals.objectchange_buffer.add(objectchange)
 
     # Enqueue webhooks
     webhook_queue = thread_locals.webhook_queue
@@ -160,6 +150,82 @@ m2m_changed.connect(handle_cf_added_obj_types, sender=CustomField.content_types.
 m2m_changed.connect(handle_cf_removed_obj_types, sender=CustomField.content_types.through)
 
 
+#
+# Search index
+#
+
+def cache_saved_object(sender, instance, created=False, raw=False, **kwargs):
+    """
+    Update the search index for an object when it is created or updated.
+    """
+    if not raw:
+        cache_object(instance, created=created)
+
+
+def remove_deleted_object(sender, instance, **kwargs):
+    """
+    Remove an object from the search index when it is deleted.
+    """
+    remove_object(instance)
+
+
+# Receivers are connected only for indexed models, so that other models remain eligible for fast deletion
+for model in get_indexed_models():
+    post_save.connect(cache_saved_object, sender=model)
+    post_delete.connect(remove_deleted_object, sender=model)
+
+
+#
+# Config context cache
+#
+
+def invalidate_config_context_cache(sender, instance, created=False, raw=False, **kwargs):
+    """
+    Invalidate any cached config context data affected by an object being created or updated.
+    """
+    if raw:
+        return
+    if sender is ConfigContext:
+        invalidate_config_context(instance)
+    else:
+        invalidate_dependent_objects(instance, created=created)
+
+
+def invalidate_config_context_cache_on_delete(sender, instance, **kwargs):
+    """
+    Invalidate any cached config context data affected by an object being deleted.
+    """
+    invalidate_dependent_objects(instance, deleted=True)
+
+
+def invalidate_deleted_config_context(sender, instance, **kwargs):
+    invalidate_config_context(instance)
+
+
+def invalidate_config_context_cache_on_m2m_change(sender, instance, action, **kwargs):
+    """
+    Invalidate any cached config context data affected by a change to the assignment of a ConfigContext, or to the
+    tags assigned to an object.
+    """
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if type(instance) is ConfigContext:
+        invalidate_config_context(instance)
+    elif sender is TaggedItem and instance._meta.label_lower in CONFIG_CONTEXT_MODELS:
+        invalidate_objects(type(instance).objects.filter(pk=instance.pk))
+
+
+# Receivers are connected only for the models which affect config context data, so that other models remain eligible
+# for fast deletion
+post_save.connect(invalidate_config_context_cache, sender=ConfigContext)
+post_delete.connect(invalidate_deleted_config_context, sender=ConfigContext)
+for label in (*CONFIG_CONTEXT_MODELS, *CONFIG_CONTEXT_DEPENDENCIES):
+    post_save.connect(invalidate_config_context_cache, sender=apps.get_model(label))
+    pre_delete.connect(invalidate_config_context_cache_on_delete, sender=apps.get_model(label))
+for model in {TaggedItem, *(field.remote_field.through for field in ConfigContext._meta.many_to_many)}:
+    m2m_changed.connect(invalidate_config_context_cache_on_m2m_change, sender=model)
+
+
 #
 # Custom validation
 #
@@ -184,6 +250,18 @@ def run_custom_validators(sender, instance, **kwargs):
         validator(instance)
 
 
+#
+# Background exports
+#
+
+@receiver(post_delete, sender=JobResult)
+def delete_exported_file(sender, instance, **kwargs):
+    """
+    Delete the file exported by a background job when its JobResult is deleted.
+    """
+    delete_export(instance)
+
+
 #
 # Dynamic configuration
 #
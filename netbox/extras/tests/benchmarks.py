@@ -0,0 +1,207 @@
+import uuid
+
+from django.contrib.auth.models import User
+from django.contrib.contenttypes.models import ContentType
+from django.db import connection
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from dcim.models import Device, DeviceRole, DeviceType, Manufacturer, Platform, Region, Site
+from extras.configcontext_cache import rebuild_cache
+from extras.changelog import ObjectChangeBuffer
+from extras.choices import ObjectChangeActionChoices
+from extras.models import CachedConfigContext, ConfigContext, ObjectChange, Tag, TaggedItem
+from extras.search import filter_queryset, get_indexed_models, get_matched_object_types, rebuild_index
+from ipam.models import Prefix
+from netbox.search import SEARCH_TYPES
+from tenancy.models import Tenant
+from users.models import Token
+from utilities.testing import BenchmarkTestCase
+
+
+class ObjectChangeBenchmark(BenchmarkTestCase):
+    """
+    Measure the recording of ObjectChanges for a bulk edit of many objects.
+    """
+    OBJECTS = 10000
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_superuser(username='testuser')
+        Tag.objects.bulk_create([Tag(name=f'Tag {i}', slug=f'tag-{i}') for i in range(cls.OBJECTS)])
+
+    def get_objectchanges(self):
+        request_id = uuid.uuid4()
+        objectchanges = []
+        for tag in Tag.objects.all():
+            tag.snapshot()
+            objectchange = tag.to_objectchange(ObjectChangeActionChoices.ACTION_UPDATE)
+            objectchange.user = self.user
+            objectchange.request_id = request_id
+            objectchanges.append(objectchange)
+
+        return objectchanges
+
+    def test_save_objectchanges(self):
+        objectchanges = self.get_objectchanges()
+
+        def save_individually():
+            for objectchange in objectchanges:
+                objectchange.save()
+
+        self.benchmark(f'ObjectChange.save() x{self.OBJECTS}', save_individually)
+        self.assertEqual(ObjectChange.objects.count(), self.OBJECTS)
+
+    def test_buffer_objectchanges(self):
+        objectchanges = self.get_objectchanges()
+
+        def buffer():
+            buffer = ObjectChangeBuffer()
+            for objectchange in objectchanges:
+                buffer.add(objectchange)
+            buffer.flush()
+
+        self.benchmark(f'ObjectChangeBuffer.flush() x{self.OBJECTS}', buffer)
+        self.assertEqual(ObjectChange.objects.count(), self.OBJECTS)
+
+    def test_bulk_edit(self):
+        client = APIClient()
+        header = {'HTTP_AUTHORIZATION': f'Token {Token.objects.create(user=self.user).key}'}
+        data = [{'id': pk, 'description': 'Updated'} for pk in Tag.objects.values_list('pk', flat=True)]
+
+        response = self.benchmark(
+            f'REST API bulk PATCH ({self.OBJECTS} objects)',
+            client.patch, reverse('extras-api:tag-list'), data, format='json', **header
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(ObjectChange.objects.count(), self.OBJECTS)
+
+
+class SearchBenchmark(BenchmarkTestCase):
+    """
+    Compare a global search using the filterset of each object type with a search of the search index.
+    """
+    OBJECTS = 5000
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_superuser(username='testuser')
+        Site.objects.bulk_create([
+            Site(name=f'Site {i}', slug=f'site-{i}', description=f'Site number {i}') for i in range(cls.OBJECTS)
+        ])
+        Tenant.objects.bulk_create([
+            Tenant(name=f'Tenant {i}', slug=f'tenant-{i}', comments=f'Located at site {i}') for i in range(cls.OBJECTS)
+        ])
+        Prefix.objects.bulk_create([
+            Prefix(prefix=f'10.{i // 256}.{i % 256}.0/24', description=f'Site {i} prefix') for i in range(cls.OBJECTS)
+        ])
+        for model in get_indexed_models():
+            rebuild_index(model)
+
+        # Collect planner statistics for the new rows, as autovacuum would
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+
+    def test_search(self):
+        value = 'site 123'
+
+        def filterset_search():
+            results = {}
+            for name, search_type in SEARCH_TYPES.items():
+                queryset = search_type['queryset'].restrict(self.user, 'view')
+                queryset = search_type['filterset']({'q': value}, queryset=queryset).qs
+                if count := queryset.count():
+                    results[name] = (count, [obj.pk for obj in queryset[:15]])
+            return results
+
+        def index_search():
+            results = {}
+            matched_object_types = get_matched_object_types(value)
+            for name, search_type in SEARCH_TYPES.items():
+                queryset = search_type['queryset'].restrict(self.user, 'view')
+                if ContentType.objects.get_for_model(queryset.model).pk not in matched_object_types:
+                    continue
+                queryset = filter_queryset(queryset, value)
+                if count := queryset.count():
+                    results[name] = (count, [obj.pk for obj in queryset[:15]])
+            return results
+
+        legacy_results = self.benchmark(f'Filterset search ({len(SEARCH_TYPES)} object types)', filterset_search)
+        results = self.benchmark(f'Search index ({len(SEARCH_TYPES)} object types)', index_search)
+        self.assertEqual(
+            {name: count for name, (count, pks) in results.items()},
+            {name: count for name, (count, pks) in legacy_results.items()}
+        )
+
+
+class ConfigContextBenchmark(BenchmarkTestCase):
+    """
+    Compare listing devices with their config context data computed per request and retrieved from the cache.
+    """
+    DEVICES = 1000
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_superuser(username='testuser')
+        manufacturer = Manufacturer.objects.create(name='Manufacturer 1', slug='manufacturer-1')
+        device_type = DeviceType.objects.create(manufacturer=manufacturer, model='Device Type 1', slug='device-type-1')
+        device_role = DeviceRole.objects.create(name='Device Role 1', slug='device-role-1')
+        regions = [Region.objects.create(name=f'Region {i}', slug=f'region-{i}') for i in range(5)]
+        sites = Site.objects.bulk_create([
+            Site(name=f'Site {i}', slug=f'site-{i}', region=regions[i % 5]) for i in range(20)
+        ])
+        platforms = Platform.objects.bulk_create([
+            Platform(name=f'Platform {i}', slug=f'platform-{i}') for i in range(5)
+        ])
+        tags = Tag.objects.bulk_create([Tag(name=f'Tag {i}', slug=f'tag-{i}') for i in range(5)])
+
+        devices = Device.objects.bulk_create([
+            Device(
+                name=f'Device {i}', device_type=device_type, device_role=device_role, site=sites[i % 20],
+                platform=platforms[i % 5]
+            ) for i in range(cls.DEVICES)
+        ])
+        content_type = ContentType.objects.get_for_model(Device)
+        TaggedItem.objects.bulk_create([
+            TaggedItem(content_type=content_type, object_id=device.pk, tag=tags[i % 5])
+            for i, device in enumerate(devices)
+        ])
+
+        for i, objects in enumerate((regions, sites, platforms, tags)):
+            for j, obj in enumerate(objects):
+                config_context = ConfigContext.objects.create(name=f'Context {i}-{j}', weight=i, data={f'key{i}': j})
+                getattr(config_context, f'{obj._meta.model_name}s').add(obj)
+
+        # Collect planner statistics for the new rows, as autovacuum would
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+
+    def test_device_list(self):
+        client = APIClient()
+        header = {'HTTP_AUTHORIZATION': f'Token {Token.objects.create(user=self.user).key}'}
+        url = f'{reverse("dcim-api:device-list")}?limit={self.DEVICES}'
+        client.get(f'{url}&exclude=config_context', **header)
+
+        response = self.benchmark(f'GET {url} (uncached)', client.get, url, **header)
+        uncached_results = response.json()['results']
+
+        self.benchmark('rebuild_cache()', rebuild_cache, 'dcim.device')
+        self.assertEqual(CachedConfigContext.objects.count(), self.DEVICES)
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE extras_cachedconfigcontext')
+
+        response = self.benchmark(f'GET {url} (cached)', client.get, url, **header)
+        self.assertEqual(response.json()['results'], uncached_results)
+
+    def test_annotate_config_context_data(self):
+        def get_config_context_data():
+            return list(Device.objects.annotate_config_context_data().values_list('pk', 'config_context_data'))
+
+        uncached_data = self.benchmark('annotate_config_context_data() (uncached)', get_config_context_data)
+
+        rebuild_cache('dcim.device')
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE extras_cachedconfigcontext')
+
+        data = self.benchmark('annotate_config_context_data() (cached)', get_config_context_data)
+        self.assertEqual(data, uncached_data)
@@ -46,12 +46,14 @@ class WebhookTest(APIViewTestCases.APIViewTestCase):
             'name': 'Webhook 5',
             'type_update': True,
             'payload_url': 'http://example.com/?5',
+            'delivery': 'batched',
         },
         {
             'content_types': ['dcim.device', 'dcim.devicetype'],
             'name': 'Webhook 6',
             'type_delete': True,
             'payload_url': 'http://example.com/?6',
+            'delivery': 'array',
         },
     ]
     bulk_update_data = {
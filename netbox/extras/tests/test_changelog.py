@@ -1,14 +1,20 @@
+import uuid
+
 from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
 from django.urls import reverse
 from rest_framework import status
 
 from dcim.choices import SiteStatusChoices
 from dcim.models import Site
 from extras.choices import *
+from extras.context_managers import change_logging
 from extras.models import CustomField, ObjectChange, Tag
+from utilities.exceptions import AbortTransaction
 from utilities.testing import APITestCase
 from utilities.testing.utils import create_tags, post_data
 from utilities.testing.views import ModelViewTestCase
+from utilities.utils import NetBoxFakeRequest
 
 
 class ChangeLogViewTest(ModelViewTestCase):
@@ -406,6 +412,52 @@ class ChangeLogAPITest(APITestCase):
         self.assertEqual(objectchange.postchange_data['name'], data[0]['name'])
         self.assertEqual(objectchange.postchange_data['slug'], data[0]['slug'])
 
+    def test_bulk_edit_objects_rolled_back(self):
+        sites = (
+            Site(name='Site 1', slug='site-1'),
+            Site(name='Site 2', slug='site-2'),
+            Site(name='Site 3', slug='site-3'),
+        )
+        Site.objects.bulk_create(sites)
+
+        # The second change is invalid (duplicate name), so the entire transaction is rolled back
+        data = (
+            {
+                'id': sites[0].pk,
+                'name': 'Site A',
+            },
+            {
+                'id': sites[1].pk,
+                'name': 'Site 3',
+            },
+        )
+        url = reverse('dcim-api:site-list')
+        self.add_permissions('dcim.change_site')
+
+        response = self.client.patch(url, data, format='json', **self.header)
+        self.assertHttpStatus(response, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Site.objects.get(pk=sites[0].pk).name, 'Site 1')
+        self.assertEqual(ObjectChange.objects.count(), 0)
+
+    def test_savepoint_rolled_back(self):
+        request = NetBoxFakeRequest({'id': uuid.uuid4(), 'user': self.user})
+
+        # Only the change made within the savepoint which was rolled back is discarded
+        with change_logging(request):
+            Site.objects.create(name='Site 1', slug='site-1')
+            try:
+                with transaction.atomic():
+                    Site.objects.create(name='Site 2', slug='site-2')
+                    raise AbortTransaction()
+            except AbortTransaction:
+                pass
+            Site.objects.create(name='Site 3', slug='site-3')
+
+        self.assertEqual(
+            sorted(ObjectChange.objects.values_list('object_repr', flat=True)),
+            ['Site 1', 'Site 3']
+        )
+
     def test_bulk_delete_objects(self):
         sites = (
             Site(name='Site 1', slug='site-1'),
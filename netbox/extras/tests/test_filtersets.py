@@ -106,6 +106,7 @@ class WebhookTestCase(TestCase, BaseFilterSetTests):
                 payload_url='http://example.com/?2',
                 enabled=True,
                 http_method='POST',
+                delivery=WebhookDeliveryChoices.DELIVERY_BATCHED,
                 ssl_verification=True,
             ),
             Webhook(
@@ -114,6 +115,7 @@ class WebhookTestCase(TestCase, BaseFilterSetTests):
                 payload_url='http://example.com/?3',
                 enabled=False,
                 http_method='PATCH',
+                delivery=WebhookDeliveryChoices.DELIVERY_ARRAY,
                 ssl_verification=False,
             ),
         )
@@ -152,6 +154,10 @@ class WebhookTestCase(TestCase, BaseFilterSetTests):
         params = {'http_method': ['GET', 'POST']}
         self.assertEqual(self.filterset(params, self.queryset).qs.count(), 2)
 
+    def test_delivery(self):
+        params = {'delivery': [WebhookDeliveryChoices.DELIVERY_BATCHED, WebhookDeliveryChoices.DELIVERY_ARRAY]}
+        self.assertEqual(self.filterset(params, self.queryset).qs.count(), 2)
+
     def test_ssl_verification(self):
         params = {'ssl_verification': True}
         self.assertEqual(self.filterset(params, self.queryset).qs.count(), 2)
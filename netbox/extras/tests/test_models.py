@@ -1,7 +1,13 @@
+import importlib
+import sys
+
+from django.contrib.contenttypes.models import ContentType
+from django.db.models.deletion import Collector
 from django.test import TestCase
 
 from dcim.models import Device, DeviceRole, DeviceType, Location, Manufacturer, Platform, Region, Site, SiteGroup
-from extras.models import ConfigContext, Tag
+from extras.configcontext_cache import rebuild_cache
+from extras.models import CachedConfigContext, CachedValue, ConfigContext, ExportTemplate, Tag
 from tenancy.models import Tenant, TenantGroup
 from virtualization.models import Cluster, ClusterGroup, ClusterType, VirtualMachine
 
@@ -15,6 +21,52 @@ class TagTest(TestCase):
         self.assertEqual(tag.slug, 'testing-unicode-台灣')
 
 
+class ExportTemplateTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        Site.objects.bulk_create([Site(name=f'Site {i}', slug=f'site-{i}') for i in range(1, 4)])
+
+    def test_render(self):
+        export_template = ExportTemplate(
+            content_type=ContentType.objects.get_for_model(Site),
+            name='Export Template 1',
+            template_code=(
+                '{% for site in queryset %}{{ site.name }}\r\n{% endfor %}{{ queryset|length }}'
+            )
+        )
+        queryset = Site.objects.order_by('name')
+
+        self.assertEqual(export_template.render(queryset), 'Site 1\nSite 2\nSite 3\n3')
+
+    def test_render_to_response(self):
+        export_template = ExportTemplate(
+            content_type=ContentType.objects.get_for_model(Site),
+            name='Export Template 1',
+            template_code='{% for site in queryset %}{{ site.name }},{{ site.slug }}\n{% endfor %}',
+            file_extension='csv'
+        )
+
+        response = export_template.render_to_response(Site.objects.order_by('name'))
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename="netbox_sites.csv"')
+        self.assertEqual(
+            b''.join(response.streaming_content),
+            b'Site 1,site-1\nSite 2,site-2\nSite 3,site-3\n'
+        )
+
+    def test_render_to_response_error(self):
+        export_template = ExportTemplate(
+            content_type=ContentType.objects.get_for_model(Site),
+            name='Export Template 1',
+            template_code='{{ queryset.foo() }}'
+        )
+
+        # Errors upon rendering the first chunk of output should be raised immediately
+        with self.assertRaises(Exception):
+            export_template.render_to_response(Site.objects.all())
+
+
 class ConfigContextTest(TestCase):
     """
     These test cases deal with the weighting, ordering, and deep merge logic of config context data.
@@ -388,3 +440,173 @@ class ConfigContextTest(TestCase):
         annotated_queryset = Device.objects.filter(name=device.name).annotate_config_context_data()
         self.assertEqual(ConfigContext.objects.get_for_object(device).count(), 2)
         self.assertEqual(device.get_config_context(), annotated_queryset[0].get_config_context())
+
+
+class CachedConfigContextTest(TestCase):
+    """
+    Test the caching of config context data for devices, and its invalidation.
+    """
+    def setUp(self):
+        manufacturer = Manufacturer.objects.create(name='Manufacturer 1', slug='manufacturer-1')
+        devicetype = DeviceType.objects.create(manufacturer=manufacturer, model='Device Type 1', slug='device-type-1')
+        devicerole = DeviceRole.objects.create(name='Device Role 1', slug='device-role-1')
+        self.region = Region.objects.create(name='Region 1', slug='region-1')
+        self.site = Site.objects.create(name='Site 1', slug='site-1')
+        self.platform = Platform.objects.create(name='Platform 1', slug='platform-1')
+        self.tag = Tag.objects.create(name='Tag 1', slug='tag-1')
+
+        self.device = Device.objects.create(
+            name='Device 1',
+            device_type=devicetype,
+            device_role=devicerole,
+            site=self.site
+        )
+
+        self.region_context = ConfigContext.objects.create(name='Region', weight=100, data={'region': 1})
+        self.region_context.regions.add(self.region)
+        self.platform_context = ConfigContext.objects.create(name='Platform', weight=200, data={'platform': 1})
+        self.platform_context.platforms.add(self.platform)
+        self.tag_context = ConfigContext.objects.create(name='Tag', weight=300, data={'tag': 1})
+        self.tag_context.tags.add(self.tag)
+        self.site_context = ConfigContext.objects.create(name='Site', weight=400, data={'site': 1})
+        self.site_context.sites.add(self.site)
+
+        rebuild_cache('dcim.device')
+
+    def get_cached_config_context(self, device):
+        return CachedConfigContext.objects.get(
+            object_type=ContentType.objects.get_for_model(Device),
+            object_id=device.pk
+        )
+
+    def get_annotated_config_context(self, device):
+        return Device.objects.filter(pk=device.pk).annotate_config_context_data().get().get_config_context()
+
+    def test_rebuild_cache(self):
+        cached = self.get_cached_config_context(self.device)
+        self.assertEqual(cached.data, [{'site': 1}])
+        self.assertEqual(cached.config_contexts, [self.site_context.pk])
+
+        # Nothing is rebuilt while the cache is valid
+        self.assertEqual(rebuild_cache('dcim.device'), 0)
+
+    def test_rebuild_cache_virtualmachine(self):
+        cluster_type = ClusterType.objects.create(name='Cluster Type 1', slug='cluster-type-1')
+        cluster = Cluster.objects.create(name='Cluster 1', type=cluster_type, site=self.site)
+        virtual_machine = VirtualMachine.objects.create(name='VM 1', cluster=cluster)
+
+        self.assertEqual(rebuild_cache('virtualization.virtualmachine'), 1)
+        cached = CachedConfigContext.objects.get(
+            object_type=ContentType.objects.get_for_model(VirtualMachine),
+            object_id=virtual_machine.pk
+        )
+        self.assertEqual(cached.data, [{'site': 1}])
+
+    def test_annotation_uses_cache(self):
+        CachedConfigContext.objects.update(data=[{'cached': 1}])
+        self.assertEqual(self.get_annotated_config_context(self.device), {'cached': 1})
+
+        # Invalidated data is ignored
+        CachedConfigContext.objects.update(data=None)
+        self.assertEqual(self.get_annotated_config_context(self.device), {'site': 1})
+
+    def test_config_context_changed(self):
+        self.site_context.data = {'site': 2}
+        self.site_context.save()
+
+        self.assertIsNone(self.get_cached_config_context(self.device).data)
+        self.assertEqual(self.get_annotated_config_context(self.device), {'site': 2})
+
+        rebuild_cache('dcim.device')
+        self.assertEqual(self.get_cached_config_context(self.device).data, [{'site': 2}])
+
+    def test_config_context_assigned(self):
+        # Assigning an unrelated object does not invalidate the cache
+        self.platform_context.platforms.add(Platform.objects.create(name='Platform 2', slug='platform-2'))
+        self.assertIsNotNone(self.get_cached_config_context(self.device).data)
+
+        # Removing the only assigned region applies the ConfigContext to all devices
+        self.region_context.regions.clear()
+        self.assertIsNone(self.get_cached_config_context(self.device).data)
+        self.assertEqual(self.get_annotated_config_context(self.device), {'region': 1, 'site': 1})
+
+    def test_config_context_unassigned(self):
+        self.site_context.sites.clear()
+        self.assertIsNone(self.get_cached_config_context(self.device).data)
+
+    def test_config_context_deleted(self):
+        self.site_context.delete()
+        self.assertIsNone(self.get_cached_config_context(self.device).data)
+        self.assertEqual(self.get_annotated_config_context(self.device), {})
+
+    def test_object_changed(self):
+        # Changing an unrelated attribute does not invalidate the cache
+        self.device.snapshot()
+        self.device.serial = '123'
+        self.device.save()
+        self.assertIsNotNone(self.get_cached_config_context(self.device).data)
+
+        self.device.snapshot()
+        self.device.platform = self.platform
+        self.device.save()
+        self.assertIsNone(self.get_cached_config_context(self.device).data)
+        self.assertEqual(self.get_annotated_config_context(self.device), {'platform': 1, 'site': 1})
+
+    def test_object_tagged(self):
+        self.device.tags.add(self.tag)
+        self.assertIsNone(self.get_cached_config_context(self.device).data)
+        self.assertEqual(self.get_annotated_config_context(self.device), {'tag': 1, 'site': 1})
+
+    def test_object_deleted(self):
+        self.device.delete()
+        self.assertFalse(CachedConfigContext.objects.exists())
+
+    def test_dependency_changed(self):
+        self.site.snapshot()
+        self.site.region = self.region
+        self.site.save()
+        self.assertIsNone(self.get_cached_config_context(self.device).data)
+        self.assertEqual(self.get_annotated_config_context(self.device), {'region': 1, 'site': 1})
+
+    def test_dependency_deleted(self):
+        self.platform_context.platforms.add(Platform.objects.create(name='Platform 2', slug='platform-2'))
+        self.device.platform = self.platform
+        self.device.save()
+        rebuild_cache('dcim.device')
+        self.assertEqual(self.get_cached_config_context(self.device).data, [{'platform': 1}, {'site': 1}])
+
+        self.platform.delete()
+        self.assertIsNone(self.get_cached_config_context(self.device).data)
+        self.assertEqual(self.get_annotated_config_context(self.device), {'site': 1})
+
+    def test_fast_delete(self):
+        """
+        Models which do not affect config context data should remain eligible for fast deletion.
+        """
+        collector = Collector(using='default')
+        self.assertTrue(collector.can_fast_delete(CachedConfigContext.objects.all()))
+        self.assertTrue(collector.can_fast_delete(CachedValue.objects.all()))
+        self.assertFalse(collector.can_fast_delete(Platform.objects.all()))
+
+    def test_import_urlconf(self):
+        """
+        Importing the URLconf (which annotates the querysets of some views) must not query the database.
+        """
+        ContentType.objects.clear_cache()
+        modules = {
+            name: sys.modules[name]
+            for name in ('netbox.urls', 'dcim.urls', 'dcim.views', 'virtualization.urls', 'virtualization.views')
+        }
+        try:
+            # Remove the modules (and their attributes on the parent packages) so that they are imported anew
+            for name in modules:
+                package, _, attr = name.rpartition('.')
+                del sys.modules[name]
+                delattr(sys.modules[package], attr)
+            with self.assertNumQueries(0):
+                importlib.import_module('netbox.urls')
+        finally:
+            for name, module in modules.items():
+                package, _, attr = name.rpartition('.')
+                sys.modules[name] = module
+                setattr(sys.modules[package], attr, module)
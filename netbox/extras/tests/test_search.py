@@ -0,0 +1,147 @@
+from io import StringIO
+
+from django.contrib.contenttypes.models import ContentType
+from django.core.management import call_command
+from django.db.models.signals import post_delete, post_save
+from django.test import override_settings
+from django.urls import reverse
+
+from dcim.models import Site
+from extras.models import CachedValue
+from extras.search import search
+from extras.signals import cache_saved_object, remove_deleted_object
+from ipam.models import Prefix
+from tenancy.models import Tenant
+from users.models import ObjectPermission
+from utilities.testing import APITestCase, TestCase
+
+
+class SearchIndexTestCase(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        Site.objects.create(name='Site 1', slug='site-1', description='Primary site')
+        Site.objects.create(name='Site 2', slug='site-2', description='Backup for Site 1')
+        Tenant.objects.create(name='Tenant 1', slug='tenant-1')
+        Prefix.objects.create(prefix='10.1.0.0/16', description='Site 1 prefix')
+
+    def test_cache_created_object(self):
+        site = Site.objects.get(name='Site 1')
+        cached_values = CachedValue.objects.filter(
+            object_type=ContentType.objects.get_for_model(Site),
+            object_id=site.pk
+        )
+        self.assertEqual(
+            {(cv.field, cv.value, cv.weight) for cv in cached_values},
+            {('name', 'Site 1', 100), ('description', 'Primary site', 500)}
+        )
+
+    def test_cache_updated_object(self):
+        site = Site.objects.get(name='Site 1')
+        site.name = 'Site X'
+        site.description = ''
+        site.save()
+
+        cached_values = CachedValue.objects.filter(
+            object_type=ContentType.objects.get_for_model(Site),
+            object_id=site.pk
+        )
+        self.assertEqual({(cv.field, cv.value) for cv in cached_values}, {('name', 'Site X')})
+
+    def test_remove_deleted_object(self):
+        site = Site.objects.get(name='Site 1')
+        site.delete()
+
+        self.assertFalse(CachedValue.objects.filter(
+            object_type=ContentType.objects.get_for_model(Site),
+            object_id=site.pk
+        ).exists())
+
+    def test_signal_receivers(self):
+        """
+        Search index receivers should be connected only for indexed models, such that others (including CachedValue
+        itself) remain eligible for fast deletion.
+        """
+        self.assertIn(remove_deleted_object, post_delete._live_receivers(Site))
+        self.assertNotIn(remove_deleted_object, post_delete._live_receivers(CachedValue))
+        self.assertNotIn(cache_saved_object, post_save._live_receivers(CachedValue))
+
+    def test_reindex(self):
+        CachedValue.objects.all().delete()
+        call_command('reindex', 'dcim.Site', 'ipam.Prefix', stdout=StringIO())
+
+        self.assertEqual(CachedValue.objects.filter(object_type=ContentType.objects.get_for_model(Site)).count(), 4)
+        self.assertEqual(CachedValue.objects.filter(object_type=ContentType.objects.get_for_model(Prefix)).count(), 2)
+        self.assertFalse(CachedValue.objects.filter(object_type=ContentType.objects.get_for_model(Tenant)).exists())
+
+    @override_settings(EXEMPT_VIEW_PERMISSIONS=['*'])
+    def test_search_ranking(self):
+        results = list(search('site 1', self.user))
+
+        # Each object appears once, ranked by its most relevant match
+        self.assertEqual(results[0].object, Site.objects.get(name='Site 1'))
+        self.assertEqual(results[0].field, 'name')
+        self.assertEqual(
+            {(cv.object, cv.field) for cv in results[1:]},
+            {(Site.objects.get(name='Site 2'), 'description'), (Prefix.objects.first(), 'description')}
+        )
+
+    def test_search_permissions(self):
+        site = Site.objects.get(name='Site 1')
+        obj_perm = ObjectPermission(
+            name='Test permission',
+            constraints={'pk': site.pk},
+            actions=['view']
+        )
+        obj_perm.save()
+        obj_perm.users.add(self.user)
+        obj_perm.object_types.add(ContentType.objects.get_for_model(Site))
+
+        self.assertEqual([cv.object for cv in search('site', self.user)], [site])
+
+
+class SearchViewTestCase(TestCase):
+    user_permissions = ['dcim.view_site']
+
+    @classmethod
+    def setUpTestData(cls):
+        Site.objects.create(name='Site 1', slug='site-1')
+        Site.objects.create(name='Site 2', slug='site-2', description='Near Site 1')
+        Tenant.objects.create(name='Tenant 1', slug='tenant-1')
+
+    def test_search(self):
+        response = self.client.get(reverse('search'), {'q': 'site 1'})
+        self.assertHttpStatus(response, 200)
+
+        results = response.context['results']
+        self.assertEqual(len(results), 1)
+        self.assertEqual(
+            [site.name for site in results[0]['table'].page.object_list.data],
+            ['Site 1', 'Site 2']
+        )
+
+
+class SearchAPITestCase(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        Site.objects.create(name='Site 1', slug='site-1')
+        Site.objects.create(name='Site 2', slug='site-2', description='Near Site 1')
+        Tenant.objects.create(name='Tenant 1', slug='tenant-1')
+
+    def test_search(self):
+        self.add_permissions('dcim.view_site')
+        url = reverse('api-search')
+
+        response = self.client.get(f'{url}?q=site 1', **self.header)
+        self.assertHttpStatus(response, 200)
+        self.assertEqual(response.data['count'], 2)
+        self.assertEqual(
+            [(result['object']['name'], result['field']) for result in response.data['results']],
+            [('Site 1', 'name'), ('Site 2', 'description')]
+        )
+
+    def test_search_without_query(self):
+        response = self.client.get(reverse('api-search'), **self.header)
+        self.assertHttpStatus(response, 200)
+        self.assertEqual(response.data['count'], 0)
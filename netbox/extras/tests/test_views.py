@@ -149,14 +149,15 @@ class WebhookTestCase(ViewTestCases.PrimaryObjectViewTestCase):
             'payload_url': 'http://example.com/?x',
             'http_method': 'GET',
             'http_content_type': 'application/foo',
+            'delivery': WebhookDeliveryChoices.DELIVERY_BATCHED,
             'conditions': None,
         }
 
         cls.csv_data = (
-            "name,content_types,type_create,payload_url,http_method,http_content_type",
-            "Webhook 4,dcim.site,True,http://example.com/?4,GET,application/json",
-            "Webhook 5,dcim.site,True,http://example.com/?5,GET,application/json",
-            "Webhook 6,dcim.site,True,http://example.com/?6,GET,application/json",
+            "name,content_types,type_create,payload_url,http_method,http_content_type,delivery",
+            "Webhook 4,dcim.site,True,http://example.com/?4,GET,application/json,individual",
+            "Webhook 5,dcim.site,True,http://example.com/?5,GET,application/json,batched",
+            "Webhook 6,dcim.site,True,http://example.com/?6,GET,application/json,array",
         )
 
         cls.bulk_edit_data = {
@@ -165,6 +166,7 @@ class WebhookTestCase(ViewTestCases.PrimaryObjectViewTestCase):
             'type_update': True,
             'type_delete': True,
             'http_method': 'GET',
+            'delivery': WebhookDeliveryChoices.DELIVERY_ARRAY,
         }
 
 
@@ -6,16 +6,18 @@ import django_rq
 from django.contrib.contenttypes.models import ContentType
 from django.http import HttpResponse
 from django.urls import reverse
-from requests import Session
+from requests import RequestException, Session
 from rest_framework import status
 
 from dcim.choices import SiteStatusChoices
 from dcim.models import Site
-from extras.choices import ObjectChangeActionChoices
+from extras.choices import ObjectChangeActionChoices, WebhookDeliveryChoices
 from extras.models import Tag, Webhook
-from extras.webhooks import enqueue_object, flush_webhooks, generate_signature, serialize_for_webhook
-from extras.webhooks_worker import eval_conditions, process_webhook
+from extras.context_managers import change_logging
+from extras.webhooks import WebhookQueue, enqueue_object, flush_webhooks, generate_signature, serialize_for_webhook
+from extras.webhooks_worker import eval_conditions, process_webhook, process_webhook_batch
 from utilities.testing import APITestCase
+from utilities.utils import NetBoxFakeRequest
 
 
 class WebhookTest(APITestCase):
@@ -197,7 +199,7 @@ class WebhookTest(APITestCase):
             self.assertEqual(job.kwargs['event'], ObjectChangeActionChoices.ACTION_UPDATE)
             self.assertEqual(job.kwargs['model_name'], 'site')
             self.assertEqual(job.kwargs['data']['id'], data[i]['id'])
-            self.assertEqual(len(job.kwargs['data']['tags']), len(response.data[i]['tags']))
+            self.assertEqual([tag['name'] for tag in job.kwargs['data']['tags']], ['Baz'])
             self.assertEqual(job.kwargs['snapshots']['prechange']['name'], sites[i].name)
             self.assertEqual(job.kwargs['snapshots']['prechange']['tags'], ['Bar', 'Foo'])
             self.assertEqual(job.kwargs['snapshots']['postchange']['name'], response.data[i]['name'])
@@ -252,6 +254,69 @@ class WebhookTest(APITestCase):
             self.assertEqual(job.kwargs['snapshots']['prechange']['name'], sites[i].name)
             self.assertEqual(job.kwargs['snapshots']['prechange']['tags'], ['Bar', 'Foo'])
 
+    def test_enqueue_webhook_coalesced_update(self):
+        site = Site.objects.create(name='Site 1', slug='site-1')
+        request = NetBoxFakeRequest({'id': uuid.uuid4(), 'user': self.user})
+
+        # Save the object several times within a single request
+        with change_logging(request):
+            site.snapshot()
+            site.name = 'Site X'
+            site.save()
+            site.snapshot()
+            site.name = 'Site Y'
+            site.save()
+            site.tags.set(Tag.objects.filter(name='Foo'))
+
+        # Verify that a single job was queued reflecting the object's original and final states
+        self.assertEqual(self.queue.count, 1)
+        job = self.queue.jobs[0]
+        self.assertEqual(job.kwargs['event'], ObjectChangeActionChoices.ACTION_UPDATE)
+        self.assertEqual(job.kwargs['data']['name'], 'Site Y')
+        self.assertEqual(len(job.kwargs['data']['tags']), 1)
+        self.assertEqual(job.kwargs['snapshots']['prechange']['name'], 'Site 1')
+        self.assertEqual(job.kwargs['snapshots']['postchange']['name'], 'Site Y')
+        self.assertEqual(job.kwargs['snapshots']['postchange']['tags'], ['Foo'])
+
+    def test_enqueue_webhook_update_then_delete(self):
+        site = Site.objects.create(name='Site 1', slug='site-1')
+        site_pk = site.pk
+        request = NetBoxFakeRequest({'id': uuid.uuid4(), 'user': self.user})
+
+        with change_logging(request):
+            site.snapshot()
+            site.name = 'Site X'
+            site.save()
+            site.snapshot()
+            site.delete()
+
+        # Verify that the update was serialized before the object was deleted
+        self.assertEqual(self.queue.count, 2)
+        update_job, delete_job = self.queue.jobs
+        self.assertEqual(update_job.kwargs['event'], ObjectChangeActionChoices.ACTION_UPDATE)
+        self.assertEqual(update_job.kwargs['data']['id'], site_pk)
+        self.assertEqual(update_job.kwargs['data']['name'], 'Site X')
+        self.assertEqual(delete_job.kwargs['event'], ObjectChangeActionChoices.ACTION_DELETE)
+        self.assertEqual(delete_job.kwargs['snapshots']['prechange']['name'], 'Site X')
+
+    def test_enqueue_object_without_webhooks(self):
+        tag = Tag.objects.first()
+        webhooks_queue = WebhookQueue()
+        enqueue_object(
+            webhooks_queue,
+            instance=tag,
+            user=self.user,
+            request_id=uuid.uuid4(),
+            action=ObjectChangeActionChoices.ACTION_UPDATE
+        )
+
+        # Verify that the object was not serialized, and that no job was queued
+        event = list(webhooks_queue.values())[0]
+        self.assertEqual(event['webhooks'], [])
+        self.assertIsNone(event['data'])
+        flush_webhooks(webhooks_queue)
+        self.assertEqual(self.queue.count, 0)
+
     def test_webhook_conditions(self):
         # Create a conditional Webhook
         webhook = Webhook(
@@ -283,6 +348,49 @@ class WebhookTest(APITestCase):
         # Evaluate the conditions (status='active')
         self.assertTrue(eval_conditions(webhook, data))
 
+    def test_webhook_conditions_not_enqueued(self):
+        webhook = Webhook.objects.get(type_create=True)
+        webhook.conditions = {
+            'and': [
+                {
+                    'attr': 'status.value',
+                    'value': 'active',
+                }
+            ]
+        }
+        webhook.save()
+
+        # Create a Site which does not meet the webhook's conditions
+        webhooks_queue = WebhookQueue()
+        site = Site.objects.create(name='Site 1', slug='site-1', status=SiteStatusChoices.STATUS_STAGING)
+        enqueue_object(
+            webhooks_queue,
+            instance=site,
+            user=self.user,
+            request_id=uuid.uuid4(),
+            action=ObjectChangeActionChoices.ACTION_CREATE
+        )
+        flush_webhooks(webhooks_queue)
+
+        # Verify that no job was queued
+        self.assertEqual(self.queue.count, 0)
+
+    def test_webhook_compiled_cache(self):
+        webhook = Webhook.objects.get(type_create=True)
+        webhook.body_template = '{{ data.name }}'
+        webhook.save()
+
+        # Compiled conditions and templates should be reused
+        compiled = webhook.get_compiled()
+        self.assertIs(Webhook.objects.get(pk=webhook.pk).get_compiled(), compiled)
+        self.assertEqual(webhook.render_body({'data': {'name': 'Site 1'}}), 'Site 1')
+
+        # Saving the webhook should invalidate its cached templates
+        webhook.body_template = '{{ data.slug }}'
+        webhook.save()
+        self.assertIsNot(webhook.get_compiled(), compiled)
+        self.assertEqual(webhook.render_body({'data': {'slug': 'site-1'}}), 'site-1')
+
     def test_webhooks_worker(self):
 
         request_id = uuid.uuid4()
@@ -312,7 +420,7 @@ class WebhookTest(APITestCase):
             return HttpResponse()
 
         # Enqueue a webhook for processing
-        webhooks_queue = []
+        webhooks_queue = WebhookQueue()
         site = Site.objects.create(name='Site 1', slug='site-1')
         enqueue_object(
             webhooks_queue,
@@ -329,3 +437,130 @@ class WebhookTest(APITestCase):
         # Patch the Session object with our dummy_send() method, then process the webhook for sending
         with patch.object(Session, 'send', dummy_send) as mock_send:
             process_webhook(**job.kwargs)
+
+    def test_enqueue_webhook_batched(self):
+        Webhook.objects.filter(type_create=True).update(delivery=WebhookDeliveryChoices.DELIVERY_BATCHED)
+
+        # Create multiple objects via the REST API
+        data = [
+            {'name': f'Site {i}', 'slug': f'site-{i}'} for i in range(1, 4)
+        ]
+        url = reverse('dcim-api:site-list')
+        self.add_permissions('dcim.add_site')
+        response = self.client.post(url, data, format='json', **self.header)
+        self.assertHttpStatus(response, status.HTTP_201_CREATED)
+
+        # Verify that a single job was queued for all three objects
+        self.assertEqual(self.queue.count, 1)
+        job = self.queue.jobs[0]
+        self.assertEqual(job.func_name, 'extras.webhooks_worker.process_webhook_batch')
+        self.assertEqual(job.kwargs['webhook'], Webhook.objects.get(type_create=True))
+        self.assertEqual(len(job.kwargs['events']), 3)
+        for i, event in enumerate(job.kwargs['events']):
+            self.assertEqual(event['event'], ObjectChangeActionChoices.ACTION_CREATE)
+            self.assertEqual(event['model_name'], 'site')
+            self.assertEqual(event['data']['id'], response.data[i]['id'])
+            self.assertEqual(event['snapshots']['postchange']['name'], response.data[i]['name'])
+
+    def test_webhooks_worker_batched(self):
+        webhook = Webhook.objects.get(type_create=True)
+        webhook.delivery = WebhookDeliveryChoices.DELIVERY_BATCHED
+        webhook.save()
+        sessions = set()
+
+        def dummy_send(session, request, **kwargs):
+            sessions.add(session)
+            self.assertEqual(json.loads(request.body)['event'], 'created')
+            return HttpResponse()
+
+        # Enqueue two objects for processing
+        webhooks_queue = WebhookQueue()
+        for i in range(1, 3):
+            site = Site.objects.create(name=f'Site {i}', slug=f'site-{i}')
+            enqueue_object(
+                webhooks_queue,
+                instance=site,
+                user=self.user,
+                request_id=uuid.uuid4(),
+                action=ObjectChangeActionChoices.ACTION_CREATE
+            )
+        flush_webhooks(webhooks_queue)
+        self.assertEqual(self.queue.count, 1)
+        job = self.queue.jobs[0]
+
+        # Verify that a request was sent for each object using a common session
+        with patch.object(Session, 'send', side_effect=dummy_send, autospec=True) as mock_send:
+            process_webhook_batch(**job.kwargs)
+        self.assertEqual(mock_send.call_count, 2)
+        self.assertEqual(len(sessions), 1)
+
+    def test_webhooks_worker_batched_retry(self):
+        webhook = Webhook.objects.get(type_create=True)
+        webhook.delivery = WebhookDeliveryChoices.DELIVERY_BATCHED
+        webhook.save()
+        sent = []
+
+        def dummy_send(_, request, **kwargs):
+            name = json.loads(request.body)['data']['name']
+            sent.append(name)
+            # Fail delivery of Site 2 on the first attempt only
+            if sent.count(name) == 1 and name == 'Site 2':
+                return HttpResponse(status=500)
+            return HttpResponse()
+
+        # Enqueue three objects for processing
+        webhooks_queue = WebhookQueue()
+        for i in range(1, 4):
+            site = Site.objects.create(name=f'Site {i}', slug=f'site-{i}')
+            enqueue_object(
+                webhooks_queue,
+                instance=site,
+                user=self.user,
+                request_id=uuid.uuid4(),
+                action=ObjectChangeActionChoices.ACTION_CREATE
+            )
+        flush_webhooks(webhooks_queue)
+        job = self.queue.jobs[0]
+
+        with patch.object(Session, 'send', side_effect=dummy_send, autospec=True):
+            with patch('extras.webhooks_worker.get_current_job', return_value=job):
+                with self.assertRaises(RequestException):
+                    process_webhook_batch(**job.kwargs)
+                self.assertEqual(sent, ['Site 1', 'Site 2', 'Site 3'])
+
+                # Only the failed delivery is repeated when the job is retried
+                process_webhook_batch(**job.kwargs)
+                self.assertEqual(sent, ['Site 1', 'Site 2', 'Site 3', 'Site 2'])
+
+    def test_webhooks_worker_array(self):
+        webhook = Webhook.objects.get(type_create=True)
+        webhook.delivery = WebhookDeliveryChoices.DELIVERY_ARRAY
+        webhook.save()
+
+        def dummy_send(_, request, **kwargs):
+            # Validate the signature and the array body
+            self.assertEqual(request.headers['X-Hook-Signature'], generate_signature(request.body, webhook.secret))
+            body = json.loads(request.body)
+            self.assertEqual([event['data']['name'] for event in body], ['Site 1', 'Site 2'])
+            self.assertEqual(body[0]['event'], 'created')
+            self.assertEqual(body[0]['model'], 'site')
+            return HttpResponse()
+
+        # Enqueue two objects for processing
+        webhooks_queue = WebhookQueue()
+        for i in range(1, 3):
+            site = Site.objects.create(name=f'Site {i}', slug=f'site-{i}')
+            enqueue_object(
+                webhooks_queue,
+                instance=site,
+                user=self.user,
+                request_id=uuid.uuid4(),
+                action=ObjectChangeActionChoices.ACTION_CREATE
+            )
+        flush_webhooks(webhooks_queue)
+        job = self.queue.jobs[0]
+
+        # Verify that a single request was sent for both objects
+        with patch.object(Session, 'send', side_effect=dummy_send, autospec=True) as mock_send:
+            process_webhook_batch(**job.kwargs)
+        self.assertEqual(mock_send.call_count, 1)
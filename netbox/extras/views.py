@@ -1,4 +1,5 @@
 from django.contrib import messages
+from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib.contenttypes.models import ContentType
 from django.db.models import Count, Q
 from django.http import Http404, HttpResponseForbidden
@@ -15,6 +16,7 @@ from utilities.utils import copy_safe_request, count_related, get_viewname, norm
 from utilities.views import ContentTypePermissionRequiredMixin
 from . import filtersets, forms, tables
 from .choices import JobResultStatusChoices
+from .exports import get_export_response
 from .models import *
 from .reports import get_report, get_reports, run_report
 from .scripts import get_scripts, run_script
@@ -758,3 +760,51 @@ class ScriptResultView(ContentTypePermissionRequiredMixin, GetScriptMixin, View)
             'result': result,
             'class_name': script.__class__.__name__
         })
+
+
+#
+# Exports
+#
+
+class ExportJobMixin(LoginRequiredMixin):
+    """
+    Retrieve the JobResult of a background export. Only the user who requested the export (or a superuser) may access
+    it.
+    """
+    def get_job_result(self, request, job_result_pk):
+        job_result = get_object_or_404(JobResult.objects.all(), pk=job_result_pk)
+        if job_result.user != request.user and not request.user.is_superuser:
+            raise Http404
+
+        return job_result
+
+
+class ExportResultView(ExportJobMixin, View):
+    """
+    Display the progress of a background export and, once it has completed, a link to download the exported data.
+    """
+    def get(self, request, job_result_pk):
+        result = self.get_job_result(request, job_result_pk)
+
+        # If this is an HTMX request, return only the result HTML
+        if is_htmx(request):
+            response = render(request, 'extras/htmx/export_result.html', {
+                'result': result,
+            })
+            if result.completed:
+                response.status_code = 286
+            return response
+
+        return render(request, 'extras/export_result.html', {
+            'result': result,
+        })
+
+
+class ExportDownloadView(ExportJobMixin, View):
+    """
+    Download the (compressed) file produced by a background export.
+    """
+    def get(self, request, job_result_pk):
+        result = self.get_job_result(request, job_result_pk)
+
+        return get_export_response(result)
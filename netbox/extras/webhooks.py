@@ -1,9 +1,13 @@
 import hashlib
 import hmac
+from collections import defaultdict
 
 from django.contrib.contenttypes.models import ContentType
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import ForeignKey, OneToOneField
 from django.utils import timezone
 from django_rq import get_queue
+from rest_framework.serializers import BaseSerializer, ListSerializer
 
 from utilities.api import get_serializer_for_model
 from utilities.utils import serialize_object
@@ -11,6 +15,38 @@ from .choices import *
 from .models import Webhook
 from .registry import registry
 
+# The maximum number of events delivered by a single job for webhooks employing batched delivery
+WEBHOOK_BATCH_SIZE = 1000
+
+ACTION_FLAGS = {
+    ObjectChangeActionChoices.ACTION_CREATE: 'type_create',
+    ObjectChangeActionChoices.ACTION_UPDATE: 'type_update',
+    ObjectChangeActionChoices.ACTION_DELETE: 'type_delete',
+}
+
+
+class WebhookQueue(dict):
+    """
+    An ordered collection of pending webhook events, keyed by content type, object ID, and whether the object has
+    been deleted. Webhooks applicable to each content type and event are looked up once and cached on the queue.
+    """
+    def __init__(self):
+        super().__init__()
+        self.webhooks = {}
+
+    def get_webhooks(self, content_type, action):
+        """
+        Return all enabled Webhooks assigned to the given content type and event.
+        """
+        key = (content_type.pk, action)
+        if key not in self.webhooks:
+            self.webhooks[key] = list(Webhook.objects.filter(
+                **{ACTION_FLAGS[action]: True},
+                content_types=content_type,
+                enabled=True
+            ))
+        return self.webhooks[key]
+
 
 def serialize_for_webhook(instance):
     """
@@ -25,6 +61,28 @@ def serialize_for_webhook(instance):
     return serializer.data
 
 
+def get_related_fields(serializer, model):
+    """
+    Return the lists of related fields on the model which should be selected and prefetched, respectively, to
+    efficiently populate the serializer's nested representations.
+    """
+    select_related = []
+    prefetch_related = []
+    for field in serializer.fields.values():
+        if not isinstance(field, BaseSerializer) or '.' in field.source:
+            continue
+        try:
+            model_field = model._meta.get_field(field.source)
+        except FieldDoesNotExist:
+            continue
+        if isinstance(model_field, (ForeignKey, OneToOneField)) and not isinstance(field, ListSerializer):
+            select_related.append(field.source)
+        elif model_field.is_relation:
+            prefetch_related.append(field.source)
+
+    return select_related, prefetch_related
+
+
 def get_snapshots(instance, action):
     snapshots = {
         'prechange': getattr(instance, '_prechange_snapshot', None),
@@ -52,10 +110,36 @@ def generate_signature(request_body, secret):
     return hmac_prep.hexdigest()
 
 
+def serialize_queued_objects(content_type, events):
+    """
+    Populate the data and postchange snapshot of each of the given queued events, which must all pertain to undeleted
+    objects of the same type. The objects are retrieved (with their related objects) and serialized in bulk. Events
+    for objects which no longer exist are left unpopulated.
+    """
+    model = content_type.model_class()
+    serializer = get_serializer_for_model(model)(many=True, context={'request': None})
+    select_related, prefetch_related = get_related_fields(serializer.child, model)
+    queryset = model.objects.filter(
+        pk__in=[event['object_id'] for event in events]
+    ).select_related(*select_related).prefetch_related(*prefetch_related)
+    instances = {instance.pk: instance for instance in queryset}
+
+    events = [event for event in events if event['object_id'] in instances]
+    if not events:
+        return
+    serializer.instance = [instances[event['object_id']] for event in events]
+    for event, data in zip(events, serializer.data):
+        instance = instances[event['object_id']]
+        event['data'] = data
+        event['snapshots']['postchange'] = get_snapshots(instance, event['event'])['postchange']
+
+
 def enqueue_object(queue, instance, user, request_id, action):
     """
-    Enqueue a serialized representation of a created/updated/deleted object for the processing of
-    webhooks once the request has completed.
+    Enqueue a created/updated/deleted object for the processing of webhooks once the request has completed. Only a
+    reference to the object is recorded: Serialization is deferred until the queue is flushed, such that multiple
+    changes to an object within a request are coalesced into a single event. (Objects being deleted are serialized
+    immediately, but only if a webhook has been assigned for the deletion.)
     """
     # Determine whether this type of object supports webhooks
     app_label = instance._meta.app_label
@@ -63,55 +147,84 @@ def enqueue_object(queue, instance, user, request_id, action):
     if model_name not in registry['model_features']['webhooks'].get(app_label, []):
         return
 
-    queue.append({
-        'content_type': ContentType.objects.get_for_model(instance),
+    content_type = ContentType.objects.get_for_model(instance)
+    key = (content_type.pk, instance.pk, action == ObjectChangeActionChoices.ACTION_DELETE)
+
+    # Coalesce any subsequent change to an object already queued. The original event type and pre-change snapshot
+    # are retained.
+    if key in queue:
+        return
+
+    event = {
+        'content_type': content_type,
         'object_id': instance.pk,
         'event': action,
-        'data': serialize_for_webhook(instance),
-        'snapshots': get_snapshots(instance, action),
+        'webhooks': queue.get_webhooks(content_type, action),
+        'data': None,
+        'snapshots': {
+            'prechange': getattr(instance, '_prechange_snapshot', None),
+            'postchange': None,
+        },
         'username': user.username,
         'request_id': request_id
-    })
+    }
+
+    if action == ObjectChangeActionChoices.ACTION_DELETE:
+        # The object will no longer exist once the queue is flushed, so any pending event for it must be serialized
+        # now
+        pending = queue.get((content_type.pk, instance.pk, False))
+        if pending and pending['webhooks'] and pending['data'] is None:
+            serialize_queued_objects(content_type, [pending])
+        if not event['webhooks']:
+            return
+        event['data'] = serialize_for_webhook(instance)
+
+    queue[key] = event
 
 
 def flush_webhooks(queue):
     """
-    Flush a list of object representation to RQ for webhook processing.
+    Serialize all pending objects and flush their events to RQ for webhook processing. Events for webhooks employing
+    batched delivery are grouped into as few jobs as possible.
     """
     rq_queue = get_queue('default')
-    webhooks_cache = {
-        'type_create': {},
-        'type_update': {},
-        'type_delete': {},
-    }
-
-    for data in queue:
-
-        action_flag = {
-            ObjectChangeActionChoices.ACTION_CREATE: 'type_create',
-            ObjectChangeActionChoices.ACTION_UPDATE: 'type_update',
-            ObjectChangeActionChoices.ACTION_DELETE: 'type_delete',
-        }[data['event']]
-        content_type = data['content_type']
-
-        # Cache applicable Webhooks
-        if content_type not in webhooks_cache[action_flag]:
-            webhooks_cache[action_flag][content_type] = Webhook.objects.filter(
-                **{action_flag: True},
-                content_types=content_type,
-                enabled=True
-            )
-        webhooks = webhooks_cache[action_flag][content_type]
 
-        for webhook in webhooks:
+    # Serialize objects in bulk (grouped by type), skipping any for which no webhooks have been assigned
+    pending = defaultdict(list)
+    for event in queue.values():
+        if event['webhooks'] and event['data'] is None:
+            pending[event['content_type']].append(event)
+    for content_type, events in pending.items():
+        serialize_queued_objects(content_type, events)
+
+    batches = defaultdict(list)
+    for event in queue.values():
+        # Skip objects which have since been deleted (e.g. due to a rolled back transaction)
+        if event['data'] is None:
+            continue
+
+        job_kwargs = {
+            'model_name': event['content_type'].model,
+            'event': event['event'],
+            'data': event['data'],
+            'snapshots': event['snapshots'],
+            'timestamp': str(timezone.now()),
+            'username': event['username'],
+            'request_id': event['request_id'],
+        }
+        for webhook in event['webhooks']:
+            # Evaluate webhook conditions (if any) now, to avoid queueing jobs which would have no effect
+            if not webhook.eval_conditions(event['data']):
+                continue
+            if webhook.delivery == WebhookDeliveryChoices.DELIVERY_INDIVIDUAL:
+                rq_queue.enqueue("extras.webhooks_worker.process_webhook", webhook=webhook, **job_kwargs)
+            else:
+                batches[webhook].append(job_kwargs)
+
+    for webhook, events in batches.items():
+        for i in range(0, len(events), WEBHOOK_BATCH_SIZE):
             rq_queue.enqueue(
-                "extras.webhooks_worker.process_webhook",
+                "extras.webhooks_worker.process_webhook_batch",
                 webhook=webhook,
-                model_name=content_type.model,
-                event=data['event'],
-                data=data['data'],
-                snapshots=data['snapshots'],
-                timestamp=str(timezone.now()),
-                username=data['username'],
-                request_id=data['request_id']
+                events=events[i:i + WEBHOOK_BATCH_SIZE]
             )
@@ -4,13 +4,16 @@ import requests
 from django.conf import settings
 from django_rq import job
 from jinja2.exceptions import TemplateError
+from rq import get_current_job
 
-from .choices import ObjectChangeActionChoices
-from .conditions import ConditionSet
+from .choices import ObjectChangeActionChoices, WebhookDeliveryChoices
 from .webhooks import generate_signature
 
 logger = logging.getLogger('netbox.webhooks_worker')
 
+# Sessions are retained for the life of the worker process, keyed by SSL verification setting
+_sessions = {}
+
 
 def eval_conditions(webhook, data):
     """
@@ -21,23 +24,28 @@ def eval_conditions(webhook, data):
         return True
 
     logger.debug(f'Evaluating webhook conditions: {webhook.conditions}')
-    if ConditionSet(webhook.conditions).eval(data):
-        return True
-
-    return False
+    return webhook.eval_conditions(data)
 
 
-@job('default')
-def process_webhook(webhook, model_name, event, data, snapshots, timestamp, username, request_id):
+def get_session(webhook):
     """
-    Make a POST request to the defined Webhook
+    Return a requests Session suitable for the webhook's SSL verification settings. A single Session is maintained per
+    setting so that connections to the same receiver are kept alive and reused.
     """
-    # Evaluate webhook conditions (if any)
-    if not eval_conditions(webhook, data):
-        return
+    verify = webhook.ca_file_path or webhook.ssl_verification
+    if verify not in _sessions:
+        session = requests.Session()
+        session.verify = verify
+        _sessions[verify] = session
+
+    return _sessions[verify]
 
-    # Prepare context data for headers & body templates
-    context = {
+
+def get_context(model_name, event, data, snapshots, timestamp, username, request_id):
+    """
+    Return the context data for the headers & body templates of a single event.
+    """
+    return {
         'event': dict(ObjectChangeActionChoices)[event].lower(),
         'timestamp': timestamp,
         'model': model_name,
@@ -47,6 +55,12 @@ def process_webhook(webhook, model_name, event, data, snapshots, timestamp, user
         'snapshots': snapshots,
     }
 
+
+def send_webhook(webhook, context, render_body):
+    """
+    Render and send an HTTP request for the webhook using the given context. render_body is the Webhook method used to
+    render the request body.
+    """
     # Build the headers for the HTTP request
     headers = {
         'Content-Type': webhook.http_content_type,
@@ -59,7 +73,7 @@ def process_webhook(webhook, model_name, event, data, snapshots, timestamp, user
 
     # Render the request body
     try:
-        body = webhook.render_body(context)
+        body = render_body(context)
     except TemplateError as e:
         logger.error(f"Error rendering request body for webhook {webhook}: {e}")
         raise e
@@ -71,9 +85,11 @@ def process_webhook(webhook, model_name, event, data, snapshots, timestamp, user
         'headers': headers,
         'data': body.encode('utf8'),
     }
-    logger.info(
-        f"Sending {params['method']} request to {params['url']} ({context['model']} {context['event']})"
-    )
+    if 'events' in context:
+        summary = f"{len(context['events'])} events"
+    else:
+        summary = f"{context['model']} {context['event']}"
+    logger.info(f"Sending {params['method']} request to {params['url']} ({summary})")
     logger.debug(params)
     try:
         prepared_request = requests.Request(**params).prepare()
@@ -86,11 +102,7 @@ def process_webhook(webhook, model_name, event, data, snapshots, timestamp, user
         prepared_request.headers['X-Hook-Signature'] = generate_signature(prepared_request.body, webhook.secret)
 
     # Send the request
-    with requests.Session() as session:
-        session.verify = webhook.ssl_verification
-        if webhook.ca_file_path:
-            session.verify = webhook.ca_file_path
-        response = session.send(prepared_request, proxies=settings.HTTP_PROXIES)
+    response = get_session(webhook).send(prepared_request, proxies=settings.HTTP_PROXIES)
 
     if 200 <= response.status_code <= 299:
         logger.info(f"Request succeeded; response status {response.status_code}")
@@ -100,3 +112,64 @@ def process_webhook(webhook, model_name, event, data, snapshots, timestamp, user
         raise requests.exceptions.RequestException(
             f"Status {response.status_code} returned with content '{response.content}', webhook FAILED to process."
         )
+
+
+@job('default')
+def process_webhook(webhook, model_name, event, data, snapshots, timestamp, username, request_id):
+    """
+    Make a POST request to the defined Webhook
+    """
+    # Evaluate webhook conditions (if any)
+    if not eval_conditions(webhook, data):
+        return
+
+    context = get_context(model_name, event, data, snapshots, timestamp, username, request_id)
+
+    return send_webhook(webhook, context, webhook.render_body)
+
+
+@job('default')
+def process_webhook_batch(webhook, events):
+    """
+    Process a batch of events for a Webhook employing batched delivery. Each event is a dictionary of the arguments
+    accepted by process_webhook(). For array delivery, all events are sent in a single request; otherwise, a request is
+    sent for each event.
+    """
+    # Evaluate webhook conditions (if any)
+    contexts = [get_context(**event) for event in events if eval_conditions(webhook, event['data'])]
+    if not contexts:
+        return
+
+    if webhook.delivery == WebhookDeliveryChoices.DELIVERY_ARRAY:
+        context = {
+            'timestamp': contexts[0]['timestamp'],
+            'username': contexts[0]['username'],
+            'request_id': contexts[0]['request_id'],
+            'events': contexts,
+        }
+        return send_webhook(webhook, context, webhook.render_batch_body)
+
+    # Record the events which have been delivered on the job, so that if it is retried (e.g. once requeued from the
+    # failed job registry), only those events which failed to be delivered are sent again
+    current_job = get_current_job()
+    delivered = current_job.meta.setdefault('delivered', []) if current_job else []
+
+    # Attempt to send all requests before reporting any failures
+    failures = 0
+    for i, context in enumerate(contexts):
+        if i in delivered:
+            continue
+        try:
+            send_webhook(webhook, context, webhook.render_body)
+        except requests.exceptions.RequestException:
+            failures += 1
+            continue
+        delivered.append(i)
+        if current_job:
+            current_job.save_meta()
+    if failures:
+        raise requests.exceptions.RequestException(
+            f"{failures} of {len(contexts)} requests FAILED to process."
+        )
+
+    return f"{len(contexts)} requests sent, webhook successfully processed."
@@ -1,3 +1,5 @@
+from itertools import islice
+
 from django.core.exceptions import ObjectDoesNotExist, PermissionDenied
 from django.db import transaction
 from django.shortcuts import get_object_or_404
@@ -12,6 +14,7 @@ from circuits.models import Provider
 from dcim.models import Site
 from ipam import filtersets
 from ipam.models import *
+from ipam.utils import defer_prefix_hierarchy
 from netbox.api.viewsets import NetBoxModelViewSet
 from netbox.api.viewsets.mixins import ObjectValidationMixin
 from netbox.config import get_config
@@ -72,6 +75,12 @@ class AggregateViewSet(NetBoxModelViewSet):
     serializer_class = serializers.AggregateSerializer
     filterset_class = filtersets.AggregateFilterSet
 
+    def get_queryset(self):
+        # Compute the utilization of each listed aggregate in bulk
+        if self.action == 'list' and not self.brief:
+            return super().get_queryset().annotate_utilization()
+        return super().get_queryset()
+
 
 class RoleViewSet(NetBoxModelViewSet):
     queryset = Role.objects.annotate(
@@ -91,11 +100,28 @@ class PrefixViewSet(NetBoxModelViewSet):
 
     parent_model = Prefix  # AvailableIPsMixin
 
+    def get_queryset(self):
+        # Compute the utilization of each listed prefix in bulk
+        if self.action == 'list' and not self.brief:
+            return super().get_queryset().annotate_utilization()
+        return super().get_queryset()
+
     def get_serializer_class(self):
         if self.action == "available_prefixes" and self.request.method == "POST":
             return serializers.PrefixLengthSerializer
         return super().get_serializer_class()
 
+    def perform_bulk_update(self, objects, update_data, partial):
+        # Rebuild the prefix hierarchy once all prefixes have been updated
+        with transaction.atomic(), defer_prefix_hierarchy():
+            return super().perform_bulk_update(objects, update_data, partial)
+
+    def perform_bulk_destroy(self, objects):
+        # Rebuild the prefix hierarchy once all prefixes have been deleted. (The objects are deleted together, so the
+        # hierarchy cannot be adjusted as each prefix is deleted.)
+        with transaction.atomic(), defer_prefix_hierarchy():
+            super().perform_bulk_destroy(objects)
+
 
 class IPRangeViewSet(NetBoxModelViewSet):
     queryset = IPRange.objects.prefetch_related('vrf', 'role', 'tenant', 'tags')
@@ -193,10 +219,18 @@ class AvailablePrefixesView(ObjectValidationMixin, APIView):
         request_body=serializers.PrefixLengthSerializer,
         responses={201: serializers.PrefixSerializer(many=True)}
     )
-    @advisory_lock(ADVISORY_LOCK_KEYS['available-prefixes'])
     def post(self, request, pk):
         self.queryset = self.queryset.restrict(request.user, 'add')
         prefix = get_object_or_404(Prefix.objects.restrict(request.user), pk=pk)
+
+        # Allocations are serialized per VRF, as only prefixes within the same VRF can conflict with one another
+        with advisory_lock((ADVISORY_LOCK_KEYS['available-prefixes'], prefix.vrf_id or 0)):
+            return self._allocate_prefixes(request, prefix)
+
+    def _allocate_prefixes(self, request, prefix):
+        """
+        Allocate and create the requested child prefixes. Must be called while holding the VRF's allocation lock.
+        """
         available_prefixes = prefix.get_available_prefixes()
 
         # Validate Requested Prefixes' length
@@ -277,11 +311,7 @@ class AvailableIPAddressesView(ObjectValidationMixin, APIView):
             limit = min(limit, MAX_PAGE_SIZE)
 
         # Calculate available IPs within the parent
-        ip_list = []
-        for index, ip in enumerate(parent.get_available_ips(), start=1):
-            ip_list.append(ip)
-            if index == limit:
-                break
+        ip_list = list(islice(parent.iter_available_ips(), limit if limit > 0 else None))
         serializer = serializers.AvailableIPSerializer(ip_list, many=True, context={
             'request': request,
             'parent': parent,
@@ -294,17 +324,24 @@ class AvailableIPAddressesView(ObjectValidationMixin, APIView):
         request_body=serializers.AvailableIPSerializer,
         responses={201: serializers.IPAddressSerializer(many=True)}
     )
-    @advisory_lock(ADVISORY_LOCK_KEYS['available-ips'])
     def post(self, request, pk):
         self.queryset = self.queryset.restrict(request.user, 'add')
         parent = self.get_parent(request, pk)
 
+        # Allocations are serialized per VRF, as only IP addresses within the same VRF can conflict with one another
+        with advisory_lock((ADVISORY_LOCK_KEYS['available-ips'], parent.vrf_id or 0)):
+            return self._allocate_ips(request, parent)
+
+    def _allocate_ips(self, request, parent):
+        """
+        Allocate and create the requested IP addresses. Must be called while holding the VRF's allocation lock.
+        """
         # Normalize to a list of objects
         requested_ips = request.data if isinstance(request.data, list) else [request.data]
 
         # Determine if the requested number of IPs is available
-        available_ips = parent.get_available_ips()
-        if available_ips.size < len(requested_ips):
+        available_ips = list(islice(parent.iter_available_ips(), len(requested_ips)))
+        if len(available_ips) < len(requested_ips):
             return Response(
                 {
                     "detail": f"An insufficient number of IP addresses are available within {parent} "
@@ -370,10 +407,18 @@ class AvailableVLANsView(ObjectValidationMixin, APIView):
         request_body=serializers.CreateAvailableVLANSerializer,
         responses={201: serializers.VLANSerializer(many=True)}
     )
-    @advisory_lock(ADVISORY_LOCK_KEYS['available-vlans'])
     def post(self, request, pk):
         self.queryset = self.queryset.restrict(request.user, 'add')
         vlangroup = get_object_or_404(VLANGroup.objects.restrict(request.user), pk=pk)
+
+        # Allocations are serialized per VLAN group, as VIDs need only be unique within a group
+        with advisory_lock((ADVISORY_LOCK_KEYS['available-vlans'], vlangroup.pk)):
+            return self._allocate_vlans(request, vlangroup)
+
+    def _allocate_vlans(self, request, vlangroup):
+        """
+        Allocate and create the requested VLANs. Must be called while holding the group's allocation lock.
+        """
         available_vlans = vlangroup.get_available_vids()
         many = isinstance(request.data, list)
 
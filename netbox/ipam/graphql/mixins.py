@@ -1,5 +1,7 @@
 import graphene
 
+from netbox.graphql.optimizer import restrict_queryset
+
 __all__ = (
     'IPAddressesMixin',
     'VLANGroupsMixin',
@@ -10,11 +12,11 @@ class IPAddressesMixin:
     ip_addresses = graphene.List('ipam.graphql.types.IPAddressType')
 
     def resolve_ip_addresses(self, info):
-        return self.ip_addresses.restrict(info.context.user, 'view')
+        return restrict_queryset(self.ip_addresses.all(), info)
 
 
 class VLANGroupsMixin:
     vlan_groups = graphene.List('ipam.graphql.types.VLANGroupType')
 
     def resolve_vlan_groups(self, info):
-        return self.vlan_groups.restrict(info.context.user, 'view')
+        return restrict_queryset(self.vlan_groups.all(), info)
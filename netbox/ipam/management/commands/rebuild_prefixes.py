@@ -1,27 +1,60 @@
+import multiprocessing
+import time
+
 from django.core.management.base import BaseCommand
+from django.db import connections
 
 from ipam.models import Prefix, VRF
 from ipam.utils import rebuild_prefixes
 
 
-class Command(BaseCommand):
-    help = "Rebuild the prefix hierarchy (depth and children counts)"
+def rebuild_vrf(vrf_id):
+    """
+    Rebuild the prefix hierarchy for a VRF (or the global table, if vrf_id is None). Returns the VRF ID, the number of
+    prefixes updated, and the time taken.
+    """
+    start = time.monotonic()
+    count = rebuild_prefixes(vrf_id)
 
-    def handle(self, *model_names, **options):
-        self.stdout.write(f'Rebuilding {Prefix.objects.count()} prefixes...')
+    return vrf_id, count, time.monotonic() - start
 
-        # Reset existing counts
-        Prefix.objects.update(_depth=0, _children=0)
 
-        # Rebuild the global table
-        global_count = Prefix.objects.filter(vrf__isnull=True).count()
-        self.stdout.write(f'Global: {global_count} prefixes...')
-        rebuild_prefixes(None)
+class Command(BaseCommand):
+    help = "Rebuild the prefix hierarchy (depth and children counts)"
 
-        # Rebuild each VRF
-        for vrf in VRF.objects.all():
-            vrf_count = Prefix.objects.filter(vrf=vrf).count()
-            self.stdout.write(f'VRF {vrf}: {vrf_count} prefixes...')
-            rebuild_prefixes(vrf.pk)
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--parallel", type=int, default=1,
+            help="Number of worker processes among which to divide VRFs (default: 1)"
+        )
 
-        self.stdout.write(self.style.SUCCESS('Finished.'))
+    def handle(self, *model_names, **options):
+        if options['parallel'] < 1:
+            self.stderr.write(self.style.ERROR("The number of worker processes must be a positive integer."))
+            return
+
+        self.stdout.write(f'Rebuilding {Prefix.objects.count()} prefixes...')
+        vrf_names = {None: 'Global'}
+        vrf_names.update({vrf.pk: f'VRF {vrf}' for vrf in VRF.objects.all()})
+
+        start = time.monotonic()
+
+        # Start worker processes (if any). Database connections are closed first so that none are inherited by the
+        # workers, each of which opens its own connection.
+        pool = None
+        if options['parallel'] > 1:
+            connections.close_all()
+            pool = multiprocessing.get_context('fork').Pool(processes=options['parallel'])
+            results = pool.imap_unordered(rebuild_vrf, vrf_names)
+        else:
+            results = map(rebuild_vrf, vrf_names)
+
+        try:
+            for vrf_id, count, elapsed in results:
+                self.stdout.write(f'{vrf_names[vrf_id]}: Updated {count} prefixes in {elapsed:.2f} seconds')
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
+
+        self.stdout.write(self.style.SUCCESS(f'Finished in {time.monotonic() - start:.2f} seconds.'))
@@ -0,0 +1,16 @@
+import django.contrib.postgres.indexes
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ipam', '0059_l2vpn'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='prefix',
+            index=django.contrib.postgres.indexes.GistIndex(fields=['prefix'], name='ipam_prefix_prefix_gist', opclasses=('inet_ops',)),
+        ),
+    ]
@@ -0,0 +1,17 @@
+from django.db import migrations, models
+import django.db.models.expressions
+import ipam.lookups
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ipam', '0060_prefix_gist_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='ipaddress',
+            index=models.Index(ipam.lookups.Inet(ipam.lookups.Host('address')), django.db.models.expressions.F('id'), name='ipam_ipaddress_host'),
+        ),
+    ]
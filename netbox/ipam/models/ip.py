@@ -1,6 +1,7 @@
 import netaddr
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
+from django.contrib.postgres.indexes import GistIndex
 from django.core.exceptions import ValidationError
 from django.db import models
 from django.db.models import F
@@ -13,8 +14,9 @@ from netbox.models import OrganizationalModel, NetBoxModel
 from ipam.choices import *
 from ipam.constants import *
 from ipam.fields import IPNetworkField, IPAddressField
+from ipam.lookups import Host, Inet
 from ipam.managers import IPAddressManager
-from ipam.querysets import PrefixQuerySet
+from ipam.querysets import AggregateQuerySet, PrefixQuerySet
 from ipam.validators import DNSValidator
 from netbox.config import get_config
 from virtualization.models import VirtualMachine
@@ -37,14 +39,18 @@ class GetAvailablePrefixesMixin:
         """
         Return all available prefixes within this Aggregate or Prefix as an IPSet.
         """
+        from ipam.utils import get_available_ranges, get_occupied_ranges
+
         params = {
             'prefix__net_contained': str(self.prefix)
         }
         if hasattr(self, 'vrf'):
             params['vrf'] = self.vrf
 
-        child_prefixes = Prefix.objects.filter(**params).values_list('prefix', flat=True)
-        return netaddr.IPSet(self.prefix) - netaddr.IPSet(child_prefixes)
+        occupied = get_occupied_ranges(Prefix.objects.filter(**params).annotate_span())
+        return netaddr.IPSet(
+            get_available_ranges(self.prefix.first, self.prefix.last, occupied, self.prefix.version)
+        )
 
     def get_first_available_prefix(self):
         """
@@ -182,6 +188,8 @@ class Aggregate(GetAvailablePrefixesMixin, NetBoxModel):
         blank=True
     )
 
+    objects = AggregateQuerySet.as_manager()
+
     clone_fields = (
         'rir', 'tenant', 'date_added', 'description',
     )
@@ -251,11 +259,17 @@ class Aggregate(GetAvailablePrefixesMixin, NetBoxModel):
 
     def get_utilization(self):
         """
-        Determine the prefix utilization of the aggregate and return it as a percentage.
+        Determine the prefix utilization of the aggregate and return it as a percentage. If the object was retrieved
+        by a queryset with annotate_utilization() applied, the annotated value is returned.
         """
+        from ipam.utils import get_occupied_ranges
+
+        if 'utilization' in self.__dict__:
+            return self.utilization
+
         queryset = Prefix.objects.filter(prefix__net_contained_or_equal=str(self.prefix))
-        child_prefixes = netaddr.IPSet([p.prefix for p in queryset])
-        utilization = float(child_prefixes.size) / self.prefix.size * 100
+        occupied = get_occupied_ranges(queryset.annotate_span())
+        utilization = float(sum(last - first + 1 for first, last in occupied)) / self.prefix.size * 100
 
         return min(utilization, 100)
 
@@ -378,6 +392,10 @@ class Prefix(GetAvailablePrefixesMixin, NetBoxModel):
     class Meta:
         ordering = (F('vrf').asc(nulls_first=True), 'prefix', 'pk')  # (vrf, prefix) may be non-unique
         verbose_name_plural = 'prefixes'
+        indexes = (
+            # Supports containment lookups (e.g. when maintaining the prefix hierarchy)
+            GistIndex(fields=('prefix',), name='ipam_prefix_prefix_gist', opclasses=('inet_ops',)),
+        )
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -457,7 +475,7 @@ class Prefix(GetAvailablePrefixesMixin, NetBoxModel):
         """
         lookup = 'net_contains_or_equals' if include_self else 'net_contains'
         return Prefix.objects.filter(**{
-            'vrf': self.vrf,
+            'vrf': self.vrf_id,
             f'prefix__{lookup}': self.prefix
         })
 
@@ -467,12 +485,12 @@ class Prefix(GetAvailablePrefixesMixin, NetBoxModel):
         """
         lookup = 'net_contained_or_equal' if include_self else 'net_contained'
         return Prefix.objects.filter(**{
-            'vrf': self.vrf,
+            'vrf': self.vrf_id,
             f'prefix__{lookup}': self.prefix
         })
 
     def get_duplicates(self):
-        return Prefix.objects.filter(vrf=self.vrf, prefix=str(self.prefix)).exclude(pk=self.pk)
+        return Prefix.objects.filter(vrf=self.vrf_id, prefix=str(self.prefix)).exclude(pk=self.pk)
 
     def get_child_prefixes(self):
         """
@@ -504,50 +522,82 @@ class Prefix(GetAvailablePrefixesMixin, NetBoxModel):
         else:
             return IPAddress.objects.filter(address__net_host_contained=str(self.prefix), vrf=self.vrf)
 
-    def get_available_ips(self):
+    def get_available_ranges(self):
         """
-        Return all available IPs within this prefix as an IPSet.
+        Return the available IP space within this prefix as a list of netaddr.IPRanges, in ascending order. Occupied
+        space is merged into contiguous blocks by the database, so this does not require loading each child IP.
         """
+        from ipam.utils import get_available_ranges
+
         if self.mark_utilized:
             return list()
 
-        prefix = netaddr.IPSet(self.prefix)
-        child_ips = netaddr.IPSet([ip.address.ip for ip in self.get_child_ips()])
-        child_ranges = netaddr.IPSet()
-        for iprange in self.get_child_ranges():
-            child_ranges.add(iprange.range)
-        available_ips = prefix - child_ips - child_ranges
+        first, last = self.prefix.first, self.prefix.last
 
         # IPv6 /127's, pool, or IPv4 /31-/32 sets are fully usable
-        if (self.family == 6 and self.prefix.prefixlen >= 127) or self.is_pool or (self.family == 4 and self.prefix.prefixlen >= 31):
-            return available_ips
-
-        if self.family == 4:
-            # For "normal" IPv4 prefixes, omit first and last addresses
-            available_ips -= netaddr.IPSet([
-                netaddr.IPAddress(self.prefix.first),
-                netaddr.IPAddress(self.prefix.last),
-            ])
-        else:
-            # For IPv6 prefixes, omit the Subnet-Router anycast address
-            # per RFC 4291
-            available_ips -= netaddr.IPSet([netaddr.IPAddress(self.prefix.first)])
-        return available_ips
+        if not (
+            (self.family == 6 and self.prefix.prefixlen >= 127) or self.is_pool or
+            (self.family == 4 and self.prefix.prefixlen >= 31)
+        ):
+            # For "normal" IPv4 prefixes, omit first and last addresses. For IPv6 prefixes, omit the Subnet-Router
+            # anycast address per RFC 4291.
+            first += 1
+            if self.family == 4:
+                last -= 1
+
+        return get_available_ranges(first, last, self._get_occupied_ranges(), self.family)
+
+    def _get_occupied_ranges(self):
+        """
+        Return the blocks of IP space within this prefix occupied by child IPs and IP ranges (see
+        get_occupied_ranges()).
+        """
+        from ipam.utils import get_occupied_ranges
+
+        return get_occupied_ranges(
+            self.get_child_ips().annotate(
+                first_address=Inet(Host('address')),
+                last_address=Inet(Host('address'))
+            ),
+            self.get_child_ranges().annotate(
+                first_address=Inet(Host('start_address')),
+                last_address=Inet(Host('end_address'))
+            )
+        )
+
+    def get_available_ips(self):
+        """
+        Return all available IPs within this prefix as an IPSet.
+        """
+        return netaddr.IPSet(self.get_available_ranges())
+
+    def iter_available_ips(self):
+        """
+        Iterate over the available IPs within this prefix in ascending order, without compiling an IPSet.
+        """
+        for iprange in self.get_available_ranges():
+            yield from iprange
 
     def get_first_available_ip(self):
         """
         Return the first available IP within the prefix (or None).
         """
-        available_ips = self.get_available_ips()
-        if not available_ips:
+        available_ip = next(self.iter_available_ips(), None)
+        if available_ip is None:
             return None
-        return '{}/{}'.format(next(available_ips.__iter__()), self.prefix.prefixlen)
+        return '{}/{}'.format(available_ip, self.prefix.prefixlen)
 
     def get_utilization(self):
         """
         Determine the utilization of the prefix and return it as a percentage. For Prefixes with a status of
-        "container", calculate utilization based on child prefixes. For all others, count child IP addresses.
+        "container", calculate utilization based on child prefixes. For all others, count child IP addresses. If the
+        object was retrieved by a queryset with annotate_utilization() applied, the annotated value is returned.
         """
+        from ipam.utils import get_occupied_ranges
+
+        if 'utilization' in self.__dict__:
+            return self.utilization
+
         if self.mark_utilized:
             return 100
 
@@ -556,18 +606,16 @@ class Prefix(GetAvailablePrefixesMixin, NetBoxModel):
                 prefix__net_contained=str(self.prefix),
                 vrf=self.vrf
             )
-            child_prefixes = netaddr.IPSet([p.prefix for p in queryset])
-            utilization = float(child_prefixes.size) / self.prefix.size * 100
+            occupied = get_occupied_ranges(queryset.annotate_span())
+            utilization = float(sum(last - first + 1 for first, last in occupied)) / self.prefix.size * 100
         else:
-            # Compile an IPSet to avoid counting duplicate IPs
-            child_ips = netaddr.IPSet(
-                [_.range for _ in self.get_child_ranges()] + [_.address.ip for _ in self.get_child_ips()]
-            )
+            # Merge overlapping IPs and ranges to avoid counting duplicate IPs
+            occupied = self._get_occupied_ranges()
 
             prefix_size = self.prefix.size
             if self.prefix.version == 4 and self.prefix.prefixlen < 31 and not self.is_pool:
                 prefix_size -= 2
-            utilization = float(child_ips.size) / prefix_size * 100
+            utilization = float(sum(last - first + 1 for first, last in occupied)) / prefix_size * 100
 
         return min(utilization, 100)
 
@@ -734,35 +782,58 @@ class IPRange(NetBoxModel):
             vrf=self.vrf
         )
 
+    def _get_occupied_ranges(self):
+        """
+        Return the blocks of IP space within this range occupied by child IPs (see get_occupied_ranges()).
+        """
+        from ipam.utils import get_occupied_ranges
+
+        return get_occupied_ranges(self.get_child_ips().annotate(
+            first_address=Inet(Host('address')),
+            last_address=Inet(Host('address'))
+        ))
+
+    def get_available_ranges(self):
+        """
+        Return the available IP space within this range as a list of netaddr.IPRanges, in ascending order.
+        """
+        from ipam.utils import get_available_ranges
+
+        return get_available_ranges(
+            self.start_address.ip.value, self.end_address.ip.value, self._get_occupied_ranges(), self.family
+        )
+
     def get_available_ips(self):
         """
         Return all available IPs within this range as an IPSet.
         """
-        range = netaddr.IPRange(self.start_address.ip, self.end_address.ip)
-        child_ips = netaddr.IPSet([ip.address.ip for ip in self.get_child_ips()])
+        return netaddr.IPSet(self.get_available_ranges())
 
-        return netaddr.IPSet(range) - child_ips
+    def iter_available_ips(self):
+        """
+        Iterate over the available IPs within this range in ascending order, without compiling an IPSet.
+        """
+        for iprange in self.get_available_ranges():
+            yield from iprange
 
     @cached_property
     def first_available_ip(self):
         """
         Return the first available IP within the range (or None).
         """
-        available_ips = self.get_available_ips()
-        if not available_ips:
+        available_ip = next(self.iter_available_ips(), None)
+        if available_ip is None:
             return None
 
-        return '{}/{}'.format(next(available_ips.__iter__()), self.start_address.prefixlen)
+        return '{}/{}'.format(available_ip, self.start_address.prefixlen)
 
     @cached_property
     def utilization(self):
         """
         Determine the utilization of the range and return it as a percentage.
         """
-        # Compile an IPSet to avoid counting duplicate IPs
-        child_count = netaddr.IPSet([
-            ip.address.ip for ip in self.get_child_ips()
-        ]).size
+        # Merge child IPs into contiguous blocks to avoid counting duplicate IPs
+        child_count = sum(last - first + 1 for first, last in self._get_occupied_ranges())
 
         return int(float(child_count) / self.size * 100)
 
@@ -855,6 +926,10 @@ class IPAddress(NetBoxModel):
         ordering = ('address', 'pk')  # address may be non-unique
         verbose_name = 'IP address'
         verbose_name_plural = 'IP addresses'
+        indexes = (
+            # Supports ordering by host address (see IPAddressManager), including keyset pagination
+            models.Index(Inet(Host('address')), F('id'), name='ipam_ipaddress_host'),
+        )
 
     def __str__(self):
         return str(self.address)
@@ -1,29 +1,41 @@
+from django.db.models import F
+from django.db.models.functions import Greatest
 from django.db.models.signals import post_delete, post_save, pre_delete
 from django.dispatch import receiver
 
 from dcim.models import Device
 from virtualization.models import VirtualMachine
 from .models import IPAddress, Prefix
+from .utils import get_deferred_prefix_vrfs
 
 
-def update_parents_children(prefix):
+def add_to_hierarchy(prefix):
     """
-    Update depth on prefix & containing prefixes
+    Account for the addition of a prefix to its VRF: Increment the child count of each containing prefix and, unless an
+    identical prefix already exists, the depth of each contained prefix. Finally, set the depth and child count of the
+    prefix itself.
     """
-    parents = prefix.get_parents(include_self=True).annotate_hierarchy()
-    for parent in parents:
-        parent._children = parent.hierarchy_children
-    Prefix.objects.bulk_update(parents, ['_children'], batch_size=100)
+    parents = prefix.get_parents().exclude(pk=prefix.pk)
+    children = prefix.get_children().exclude(pk=prefix.pk)
 
+    parents.update(_children=F('_children') + 1)
+    if not prefix.get_duplicates().exists():
+        children.update(_depth=F('_depth') + 1)
 
-def update_children_depth(prefix):
+    prefix._depth = parents.order_by().values('prefix').distinct().count()
+    prefix._children = children.count()
+    Prefix.objects.filter(pk=prefix.pk).update(_depth=prefix._depth, _children=prefix._children)
+
+
+def remove_from_hierarchy(prefix):
     """
-    Update children count on prefix & contained prefixes
+    Account for the removal of a prefix from its VRF: Decrement the child count of each containing prefix and, unless an
+    identical prefix remains, the depth of each contained prefix. (Counts are floored at zero, in case the hierarchy
+    was not maintained for a prior change, e.g. one made using bulk_create().)
     """
-    children = prefix.get_children(include_self=True).annotate_hierarchy()
-    for child in children:
-        child._depth = child.hierarchy_depth
-    Prefix.objects.bulk_update(children, ['_depth'], batch_size=100)
+    prefix.get_parents().exclude(pk=prefix.pk).update(_children=Greatest(F('_children') - 1, 0))
+    if not prefix.get_duplicates().exists():
+        prefix.get_children().exclude(pk=prefix.pk).update(_depth=Greatest(F('_depth') - 1, 0))
 
 
 @receiver(post_save, sender=Prefix)
@@ -32,21 +44,32 @@ def handle_prefix_saved(instance, created, **kwargs):
     # Prefix has changed (or new instance has been created)
     if created or instance.vrf_id != instance._vrf_id or instance.prefix != instance._prefix:
 
-        update_parents_children(instance)
-        update_children_depth(instance)
+        # If hierarchy maintenance has been deferred, just record the affected VRF(s)
+        deferred_vrfs = get_deferred_prefix_vrfs()
+        if deferred_vrfs is not None:
+            deferred_vrfs.add(instance.vrf_id)
+            if not created:
+                deferred_vrfs.add(instance._vrf_id)
+
+        else:
+            # If this is not a new prefix, remove the previous prefix from the hierarchy
+            if not created:
+                remove_from_hierarchy(Prefix(pk=instance.pk, vrf_id=instance._vrf_id, prefix=instance._prefix))
+            add_to_hierarchy(instance)
 
-        # If this is not a new prefix, clean up parent/children of previous prefix
-        if not created:
-            old_prefix = Prefix(vrf_id=instance._vrf_id, prefix=instance._prefix)
-            update_parents_children(old_prefix)
-            update_children_depth(old_prefix)
+        # Reset the cached prefix and VRF, in case the instance is saved again
+        instance._prefix = instance.prefix
+        instance._vrf_id = instance.vrf_id
 
 
 @receiver(post_delete, sender=Prefix)
 def handle_prefix_deleted(instance, **kwargs):
 
-    update_parents_children(instance)
-    update_children_depth(instance)
+    deferred_vrfs = get_deferred_prefix_vrfs()
+    if deferred_vrfs is not None:
+        deferred_vrfs.add(instance.vrf_id)
+    else:
+        remove_from_hierarchy(instance)
 
 
 @receiver(pre_delete, sender=IPAddress)
@@ -0,0 +1,273 @@
+import multiprocessing
+
+from django.contrib.auth.models import User
+from django.db import connection, connections
+from django.test import Client, override_settings
+from django.urls import reverse
+from netaddr import IPNetwork, IPRange, IPSet
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
+
+from ipam.choices import PrefixStatusChoices
+from ipam.models import Aggregate, IPAddress, Prefix, RIR, VRF
+from ipam.utils import defer_prefix_hierarchy, rebuild_prefixes
+from netbox.api.pagination import OptionalLimitOffsetPagination
+from users.models import Token
+from utilities.testing import BenchmarkTestCase, TransactionBenchmarkTestCase
+
+
+class PrefixHierarchyBenchmark(BenchmarkTestCase):
+    """
+    Measure maintenance of the prefix hierarchy within a /8 populated by many /24s.
+    """
+    CHILD_PREFIXES = 4096
+
+    @classmethod
+    def setUpTestData(cls):
+        parent = IPNetwork('10.0.0.0/8')
+        Prefix.objects.bulk_create([
+            Prefix(prefix=parent),
+            *[Prefix(prefix=prefix) for prefix in list(parent.subnet(24))[:cls.CHILD_PREFIXES]],
+        ])
+        rebuild_prefixes(None)
+
+    def test_create_prefix(self):
+        self.benchmark('Prefix.save() (new /24)', Prefix(prefix='10.128.0.0/24').save)
+        self.benchmark('Prefix.save() (new /16)', Prefix(prefix='10.0.0.0/16').save)
+        self.assertEqual(Prefix.objects.get(prefix='10.0.0.0/16')._children, 256)
+
+    def test_import_prefixes(self):
+        def create_prefixes():
+            with defer_prefix_hierarchy():
+                for prefix in IPNetwork('10.255.0.0/16').subnet(24):
+                    Prefix(prefix=prefix).save()
+
+        self.benchmark('Prefix.save() x256 (deferred hierarchy)', create_prefixes)
+        self.assertEqual(Prefix.objects.get(prefix='10.0.0.0/8')._children, self.CHILD_PREFIXES + 256)
+
+
+class AvailableIPBenchmark(BenchmarkTestCase):
+    """
+    Compare the computation of available IPs by range arithmetic with the construction of IPSets from all child IPs,
+    within a /16 of which the first half is fully assigned.
+    """
+    CHILD_IPS = 32768
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.prefix = Prefix.objects.create(prefix=IPNetwork('10.0.0.0/16'))
+        IPAddress.objects.bulk_create([
+            IPAddress(address=f'{ip}/16') for ip in list(cls.prefix.prefix)[1:cls.CHILD_IPS + 1]
+        ], batch_size=5000)
+
+    def test_first_available_ip(self):
+        def legacy_first_available_ip():
+            prefix = self.prefix.prefix
+            available_ips = IPSet(IPRange(prefix[1], prefix[-2])) - IPSet(
+                [ip.address.ip for ip in self.prefix.get_child_ips()]
+            )
+            return next(iter(available_ips))
+
+        reference = self.benchmark(f'IPSet first available IP ({self.CHILD_IPS} IPs)', legacy_first_available_ip)
+        first_ip = self.benchmark(
+            f'Prefix.get_first_available_ip() ({self.CHILD_IPS} IPs)', self.prefix.get_first_available_ip
+        )
+        self.assertEqual(first_ip, f'{reference}/16')
+
+    def test_utilization(self):
+        utilization = self.benchmark(f'Prefix.get_utilization() ({self.CHILD_IPS} IPs)', self.prefix.get_utilization)
+        self.assertEqual(utilization, self.CHILD_IPS / 65534 * 100)
+
+
+def allocate_ips(url, header, count, batch_size=1):
+    """
+    Allocate the specified number of IPs through the given available-ips endpoint, in requests of batch_size IPs.
+    Returns the number of IPs allocated.
+    """
+    client = APIClient()
+    allocated = 0
+    for i in range(0, count, batch_size):
+        response = client.post(url, [{}] * batch_size, format='json', **header)
+        if response.status_code == 201:
+            allocated += len(response.data)
+
+    return allocated
+
+
+class AvailableIPAllocationBenchmark(TransactionBenchmarkTestCase):
+    """
+    Measure the allocation of IPs through the available-ips API endpoint by concurrent clients (each in its own
+    process), each allocating one IP per request. Clients allocating within the same VRF are serialized; those in
+    different VRFs are not.
+    """
+    CLIENTS = 8
+    REQUESTS = 20
+
+    def setUp(self):
+        user = User.objects.create_superuser(username='testuser')
+        self.header = {'HTTP_AUTHORIZATION': f'Token {Token.objects.create(user=user).key}'}
+
+        shared_prefix = Prefix.objects.create(prefix=IPNetwork('10.0.0.0/16'))
+        self.shared_urls = [reverse('ipam-api:prefix-available-ips', kwargs={'pk': shared_prefix.pk})] * self.CLIENTS
+        self.vrf_urls = [
+            reverse('ipam-api:prefix-available-ips', kwargs={
+                'pk': Prefix.objects.create(prefix=IPNetwork('10.0.0.0/16'), vrf=VRF.objects.create(name=f'VRF {i}')).pk
+            }) for i in range(self.CLIENTS)
+        ]
+
+    def run_clients(self, urls):
+        # Close database connections so that none are inherited by the client processes
+        connections.close_all()
+        with multiprocessing.get_context('fork').Pool(processes=len(urls)) as pool:
+            results = pool.starmap(allocate_ips, [(url, self.header, self.REQUESTS) for url in urls])
+        self.assertEqual(sum(results), len(urls) * self.REQUESTS)
+
+    def test_concurrent_allocation(self):
+        allocations = self.CLIENTS * self.REQUESTS
+
+        self.benchmark(
+            f'{self.CLIENTS} clients x {self.REQUESTS} IPs (same VRF)', self.run_clients, self.shared_urls
+        )
+        self.benchmark(
+            f'{self.CLIENTS} clients x {self.REQUESTS} IPs (separate VRFs)', self.run_clients, self.vrf_urls
+        )
+        self.assertEqual(IPAddress.objects.filter(vrf__isnull=True).count(), allocations)
+        self.assertEqual(IPAddress.objects.filter(vrf__isnull=False).count(), allocations)
+
+        # Every allocation within a VRF must be unique
+        self.assertEqual(IPAddress.objects.filter(vrf__isnull=True).values('address').distinct().count(), allocations)
+
+    def test_batch_allocation(self):
+        self.benchmark(
+            f'1 client x {self.CLIENTS * self.REQUESTS} IPs (single request)',
+            allocate_ips, self.shared_urls[0], self.header, self.CLIENTS * self.REQUESTS, self.CLIENTS * self.REQUESTS
+        )
+        self.assertEqual(IPAddress.objects.count(), self.CLIENTS * self.REQUESTS)
+
+
+class IPAddressListBenchmark(BenchmarkTestCase):
+    """
+    Compare retrieving a deep page of IP addresses from the REST API using offset and cursor pagination.
+    """
+    OBJECTS = 200000
+    PAGE_SIZE = 100
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_superuser(username='testuser')
+        cls.token = Token.objects.create(user=cls.user)
+        network = IPNetwork('10.0.0.0/8')
+        IPAddress.objects.bulk_create([
+            IPAddress(address=IPNetwork(f'{network[i]}/8')) for i in range(1, cls.OBJECTS + 1)
+        ], batch_size=10000)
+
+        # Collect planner statistics for the new rows, as autovacuum would
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+
+    def test_deep_page(self):
+        client = APIClient()
+        header = {'HTTP_AUTHORIZATION': f'Token {self.token.key}'}
+        url = reverse('ipam-api:ipaddress-list')
+        offset = self.OBJECTS - self.PAGE_SIZE * 2
+
+        # Find the cursor which corresponds to the offset
+        paginator = OptionalLimitOffsetPagination()
+        with override_settings(MAX_PAGE_SIZE=0):
+            paginator.paginate_queryset(
+                IPAddress.objects.all(), Request(APIRequestFactory().get('/', {'cursor': '', 'limit': offset}))
+            )
+        cursor = paginator.next_cursor
+
+        for params, mode in (('', ''), ('&brief=1', ', brief')):
+            response = self.benchmark(
+                f'Page at offset {offset} (offset{mode})', client.get,
+                f'{url}?limit={self.PAGE_SIZE}&offset={offset}{params}', **header
+            )
+            expected = [result['id'] for result in response.data['results']]
+            response = self.benchmark(
+                f'Page at offset {offset} (cursor{mode})', client.get,
+                f'{url}?limit={self.PAGE_SIZE}&cursor={cursor}{params}', **header
+            )
+            self.assertEqual([result['id'] for result in response.data['results']], expected)
+
+
+@override_settings(EXEMPT_VIEW_PERMISSIONS=['*'])
+class UtilizationListBenchmark(BenchmarkTestCase):
+    """
+    Measure the queries required to display a page of prefixes and aggregates, with their utilization, in the web UI
+    and REST API and in CSV exports.
+    """
+    CONTAINERS = 50
+    PAGE_SIZE = 100
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_superuser(username='testuser')
+        cls.token = Token.objects.create(user=cls.user)
+
+        # Each container /16 holds four /24s, each of which is partially populated
+        rir = RIR.objects.create(name='RIR 1', slug='rir-1')
+        Aggregate.objects.bulk_create([
+            Aggregate(prefix=IPNetwork(f'10.{i}.0.0/16'), rir=rir) for i in range(cls.CONTAINERS)
+        ])
+        prefixes = []
+        ip_addresses = []
+        for i in range(cls.CONTAINERS):
+            prefixes.append(Prefix(prefix=IPNetwork(f'10.{i}.0.0/16'), status=PrefixStatusChoices.STATUS_CONTAINER))
+            for j in range(4):
+                prefixes.append(Prefix(prefix=IPNetwork(f'10.{i}.{j}.0/24')))
+                ip_addresses.extend(IPAddress(address=IPNetwork(f'10.{i}.{j}.{k}/24')) for k in range(1, 51))
+        with defer_prefix_hierarchy():
+            Prefix.objects.bulk_create(prefixes)
+        IPAddress.objects.bulk_create(ip_addresses, batch_size=10000)
+
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+
+    def test_prefix_list(self):
+        self.benchmark(
+            f'Prefix.get_utilization() x{self.PAGE_SIZE}',
+            lambda: [prefix.get_utilization() for prefix in Prefix.objects.all()[:self.PAGE_SIZE]]
+        )
+        self.benchmark(
+            f'Prefix annotate_utilization() x{self.PAGE_SIZE}',
+            lambda: [prefix.get_utilization() for prefix in Prefix.objects.annotate_utilization()[:self.PAGE_SIZE]]
+        )
+
+        client = Client()
+        client.force_login(self.user)
+        url = reverse('ipam:prefix_list')
+        response = self.benchmark(
+            f'Prefix list page ({self.PAGE_SIZE} rows)', client.get, f'{url}?per_page={self.PAGE_SIZE}'
+        )
+        self.assertEqual(response.status_code, 200)
+        response = self.benchmark(
+            f'Prefix CSV export ({len(Prefix.objects.all())} rows)', client.get, f'{url}?export=table'
+        )
+        self.assertEqual(response.status_code, 200)
+
+        api_client = APIClient()
+        url = reverse('ipam-api:prefix-list')
+        response = self.benchmark(
+            f'Prefix REST API page ({self.PAGE_SIZE} rows)', api_client.get, f'{url}?limit={self.PAGE_SIZE}',
+            HTTP_AUTHORIZATION=f'Token {self.token.key}'
+        )
+        self.assertEqual(len(response.data['results']), self.PAGE_SIZE)
+
+    def test_aggregate_list(self):
+        client = Client()
+        client.force_login(self.user)
+        url = reverse('ipam:aggregate_list')
+        response = self.benchmark(
+            f'Aggregate list page ({self.CONTAINERS} rows)', client.get, f'{url}?per_page={self.PAGE_SIZE}'
+        )
+        self.assertEqual(response.status_code, 200)
+
+        api_client = APIClient()
+        url = reverse('ipam-api:aggregate-list')
+        response = self.benchmark(
+            f'Aggregate REST API page ({self.CONTAINERS} rows)', api_client.get, f'{url}?limit={self.PAGE_SIZE}',
+            HTTP_AUTHORIZATION=f'Token {self.token.key}'
+        )
+        self.assertEqual(len(response.data['results']), self.CONTAINERS)
@@ -265,6 +265,44 @@ class PrefixTest(APIViewTestCases.APIViewTestCase):
         )
         Prefix.objects.bulk_create(prefixes)
 
+    def test_utilization(self):
+        """
+        Test that the utilization of each prefix is reported, both when listing and retrieving prefixes.
+        """
+        IPAddress.objects.bulk_create([
+            IPAddress(address=IPNetwork(f'192.168.1.{i}/24')) for i in range(1, 128)
+        ])
+        prefix = Prefix.objects.get(prefix='192.168.1.0/24')
+        self.add_permissions('ipam.view_prefix')
+
+        response = self.client.get(f'{self._get_list_url()}?prefix=192.168.1.0/24', **self.header)
+        self.assertHttpStatus(response, status.HTTP_200_OK)
+        self.assertEqual(response.data['results'][0]['utilization'], 127 / 254 * 100)
+
+        response = self.client.get(self._get_detail_url(prefix), **self.header)
+        self.assertEqual(response.data['utilization'], 127 / 254 * 100)
+
+    def test_bulk_delete_duplicate_prefixes(self):
+        """
+        Test that the prefix hierarchy is maintained when identical prefixes are deleted together.
+        """
+        parent = Prefix.objects.create(prefix=IPNetwork('8.0.0.0/6'))
+        duplicates = (
+            Prefix.objects.create(prefix=IPNetwork('10.0.0.0/8')),
+            Prefix.objects.create(prefix=IPNetwork('10.0.0.0/8')),
+        )
+        child = Prefix.objects.create(prefix=IPNetwork('10.1.0.0/16'))
+        self.add_permissions('ipam.delete_prefix')
+
+        data = [{'id': prefix.pk} for prefix in duplicates]
+        response = self.client.delete(self._get_list_url(), data, format='json', **self.header)
+        self.assertHttpStatus(response, status.HTTP_204_NO_CONTENT)
+
+        parent.refresh_from_db()
+        child.refresh_from_db()
+        self.assertEqual(parent._children, 1)
+        self.assertEqual(child._depth, 1)
+
     def test_list_available_prefixes(self):
         """
         Test retrieval of all available prefixes within a parent prefix.
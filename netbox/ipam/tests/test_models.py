@@ -5,6 +5,7 @@ from django.test import TestCase, override_settings
 from dcim.models import Interface, Device, DeviceRole, DeviceType, Manufacturer, Site
 from ipam.choices import IPAddressRoleChoices, PrefixStatusChoices
 from ipam.models import Aggregate, IPAddress, IPRange, Prefix, RIR, VLAN, VLANGroup, VRF, L2VPN, L2VPNTermination
+from ipam.utils import defer_prefix_hierarchy, rebuild_prefixes
 
 
 class TestAggregate(TestCase):
@@ -35,6 +36,30 @@ class TestAggregate(TestCase):
         ))
         self.assertEqual(aggregate.get_utilization(), 100)
 
+    def test_annotate_utilization(self):
+        rir = RIR.objects.create(name='RIR 1', slug='rir-1')
+        aggregates = (
+            Aggregate(prefix=IPNetwork('10.0.0.0/8'), rir=rir),
+            Aggregate(prefix=IPNetwork('192.168.0.0/16'), rir=rir),
+            Aggregate(prefix=IPNetwork('2001:db8::/32'), rir=rir),
+        )
+        Aggregate.objects.bulk_create(aggregates)
+        vrf = VRF.objects.create(name='VRF 1')
+        Prefix.objects.bulk_create((
+            Prefix(prefix=IPNetwork('10.0.0.0/12')),
+            Prefix(prefix=IPNetwork('10.0.0.0/16'), vrf=vrf),
+            Prefix(prefix=IPNetwork('10.16.0.0/12'), vrf=vrf),
+            Prefix(prefix=IPNetwork('10.64.0.0/10')),
+            Prefix(prefix=IPNetwork('10.64.0.0/10'), vrf=vrf),
+            Prefix(prefix=IPNetwork('2001:db8::/34')),
+        ))
+
+        utilization = dict(Aggregate.objects.annotate_utilization().values_list('prefix', 'utilization'))
+        for aggregate in aggregates:
+            self.assertEqual(utilization[aggregate.prefix], aggregate.get_utilization())
+        self.assertEqual(utilization[IPNetwork('10.0.0.0/8')], 37.5)
+        self.assertEqual(utilization[IPNetwork('2001:db8::/32')], 25)
+
 
 class TestPrefix(TestCase):
 
@@ -160,6 +185,51 @@ class TestPrefix(TestCase):
 
         self.assertEqual(available_ips, missing_ips)
 
+    def test_get_available_ips_overlapping(self):
+
+        parent_prefix = Prefix.objects.create(prefix=IPNetwork('10.0.0.0/28'))
+        IPAddress.objects.bulk_create((
+            IPAddress(address=IPNetwork('10.0.0.2/28')),
+            IPAddress(address=IPNetwork('10.0.0.2/28')),  # Duplicate
+            IPAddress(address=IPNetwork('10.0.0.6/28')),  # Within IP range
+            IPAddress(address=IPNetwork('10.0.0.8/28')),  # Adjacent to IP range
+            IPAddress(address=IPNetwork('10.0.0.15/28')),  # Broadcast address
+        ))
+        IPRange.objects.bulk_create((
+            IPRange(start_address=IPNetwork('10.0.0.4/28'), end_address=IPNetwork('10.0.0.7/28'), size=4),
+            IPRange(start_address=IPNetwork('10.0.0.5/28'), end_address=IPNetwork('10.0.0.6/28'), size=2),
+        ))
+        missing_ips = IPSet([
+            '10.0.0.1/32',
+            '10.0.0.3/32',
+            '10.0.0.9/32',
+            '10.0.0.10/31',
+            '10.0.0.12/31',
+            '10.0.0.14/32',
+        ])
+
+        self.assertEqual(parent_prefix.get_available_ips(), missing_ips)
+        self.assertEqual(
+            [str(ip) for ip in parent_prefix.iter_available_ips()][:3],
+            ['10.0.0.1', '10.0.0.3', '10.0.0.9']
+        )
+        self.assertEqual(parent_prefix.get_utilization(), 7 / 14 * 100)
+
+    def test_get_available_ips_end_of_address_space(self):
+
+        parent_prefix = Prefix.objects.create(prefix=IPNetwork('ffff:ffff:ffff:ffff::/64'))
+        IPAddress.objects.bulk_create((
+            IPAddress(address=IPNetwork('ffff:ffff:ffff:ffff::1/64')),
+            IPAddress(address=IPNetwork('ffff:ffff:ffff:ffff:ffff:ffff:ffff:fffe/64')),
+            IPAddress(address=IPNetwork('ffff:ffff:ffff:ffff:ffff:ffff:ffff:ffff/64')),
+        ))
+
+        available_ranges = parent_prefix.get_available_ranges()
+        self.assertEqual(len(available_ranges), 1)
+        self.assertEqual(str(available_ranges[0][0]), 'ffff:ffff:ffff:ffff::2')
+        self.assertEqual(str(available_ranges[0][-1]), 'ffff:ffff:ffff:ffff:ffff:ffff:ffff:fffd')
+        self.assertEqual(parent_prefix.get_first_available_ip(), 'ffff:ffff:ffff:ffff::2/64')
+
     def test_get_first_available_prefix(self):
 
         prefixes = Prefix.objects.bulk_create((
@@ -223,6 +293,52 @@ class TestPrefix(TestCase):
         IPRange.objects.create(start_address=IPNetwork('10.0.0.33/24'), end_address=IPNetwork('10.0.0.64/24'))
         self.assertEqual(prefix.get_utilization(), 64 / 254 * 100)  # ~25% utilization
 
+    def test_annotate_utilization(self):
+        vrf = VRF.objects.create(name='VRF 1')
+        prefixes = (
+            Prefix(prefix=IPNetwork('10.0.0.0/16'), status=PrefixStatusChoices.STATUS_CONTAINER),
+            Prefix(prefix=IPNetwork('10.0.0.0/16'), status=PrefixStatusChoices.STATUS_CONTAINER, vrf=vrf),
+            Prefix(prefix=IPNetwork('10.0.0.0/24')),
+            Prefix(prefix=IPNetwork('10.0.0.0/25'), vrf=vrf),
+            Prefix(prefix=IPNetwork('10.0.1.0/24'), is_pool=True),
+            Prefix(prefix=IPNetwork('10.0.2.0/24'), mark_utilized=True),
+            Prefix(prefix=IPNetwork('10.0.3.0/31')),
+            Prefix(prefix=IPNetwork('2001:db8::/64')),
+        )
+        Prefix.objects.bulk_create(prefixes)
+        IPAddress.objects.bulk_create((
+            *[IPAddress(address=IPNetwork(f'10.0.0.{i}/24')) for i in range(1, 33)],
+            *[IPAddress(address=IPNetwork(f'10.0.0.{i}/25'), vrf=vrf) for i in range(1, 5)],
+            IPAddress(address=IPNetwork('10.0.1.0/24')),
+            IPAddress(address=IPNetwork('10.0.3.1/31')),
+            IPAddress(address=IPNetwork('2001:db8::1/64')),
+        ))
+        # Overlapping ranges, which include some of the child IPs
+        IPRange.objects.create(start_address=IPNetwork('10.0.0.17/24'), end_address=IPNetwork('10.0.0.64/24'))
+        IPRange.objects.create(start_address=IPNetwork('10.0.0.49/24'), end_address=IPNetwork('10.0.0.96/24'))
+        IPRange.objects.create(
+            start_address=IPNetwork('2001:db8::1:0/64'), end_address=IPNetwork('2001:db8::1:ffff/64')
+        )
+
+        utilization = dict(Prefix.objects.annotate_utilization().values_list('pk', 'utilization'))
+        for prefix in prefixes:
+            self.assertEqual(utilization[prefix.pk], prefix.get_utilization())
+        self.assertEqual(utilization[prefixes[2].pk], 96 / 254 * 100)
+        self.assertEqual(utilization[prefixes[5].pk], 100)
+
+    def test_annotate_utilization_large_range(self):
+        prefix = Prefix.objects.create(prefix=IPNetwork('2001:db8::/48'))
+        # A range spanning an entire /64 (which cannot be created via save() as its size exceeds that of the field)
+        IPRange.objects.bulk_create([IPRange(
+            start_address=IPNetwork('2001:db8::/64'),
+            end_address=IPNetwork('2001:db8::ffff:ffff:ffff:ffff/64'),
+            size=0
+        )])
+
+        utilization = Prefix.objects.annotate_utilization().get(pk=prefix.pk).utilization
+        self.assertEqual(utilization, 2 ** 64 / 2 ** 80 * 100)
+        self.assertEqual(utilization, prefix.get_utilization())
+
     #
     # Uniqueness enforcement tests
     #
@@ -449,6 +565,85 @@ class TestPrefixHierarchy(TestCase):
         self.assertEqual(prefixes[3]._depth, 2)
         self.assertEqual(prefixes[3]._children, 0)
 
+    def test_delete_duplicate_prefix4(self):
+        # Duplicate 10.0.0.0/16, then delete the original
+        Prefix(prefix='10.0.0.0/16').save()
+        Prefix.objects.filter(prefix='10.0.0.0/16').first().delete()
+
+        prefixes = Prefix.objects.filter(prefix__family=4)
+        self.assertEqual(prefixes[0].prefix, IPNetwork('10.0.0.0/8'))
+        self.assertEqual(prefixes[0]._depth, 0)
+        self.assertEqual(prefixes[0]._children, 2)
+        self.assertEqual(prefixes[1].prefix, IPNetwork('10.0.0.0/16'))
+        self.assertEqual(prefixes[1]._depth, 1)
+        self.assertEqual(prefixes[1]._children, 1)
+        self.assertEqual(prefixes[2].prefix, IPNetwork('10.0.0.0/24'))
+        self.assertEqual(prefixes[2]._depth, 2)
+        self.assertEqual(prefixes[2]._children, 0)
+
+    def test_hierarchy_consistency(self):
+        vrf = VRF.objects.create(name='VRF A')
+
+        # Make a series of changes, saving some instances more than once
+        p1 = Prefix(prefix='10.0.0.0/12')
+        p1.save()
+        p2 = Prefix(prefix='10.0.0.0/20')
+        p2.save()
+        p1.prefix = '10.0.0.0/18'
+        p1.save()
+        p1.save()
+        p2.vrf = vrf
+        p2.save()
+        Prefix(prefix='10.0.0.0/24').save()
+        Prefix(prefix='10.0.0.0/16', vrf=vrf).save()
+        Prefix.objects.get(prefix='10.0.0.0/8').delete()
+
+        # Compare the cached values with those calculated from scratch
+        for prefix in Prefix.objects.annotate_hierarchy():
+            self.assertEqual(prefix._depth, prefix.hierarchy_depth, prefix)
+            self.assertEqual(prefix._children, prefix.hierarchy_children, prefix)
+
+    def test_rebuild_prefixes(self):
+        vrf = VRF.objects.create(name='VRF A')
+        Prefix.objects.bulk_create((
+            Prefix(prefix='10.0.0.0/16'),
+            Prefix(prefix='10.0.0.0/8', vrf=vrf),
+            Prefix(prefix='10.0.0.0/16', vrf=vrf),
+            Prefix(prefix='10.0.0.0/16', vrf=vrf),
+        ))
+
+        # Only prefixes with incorrect values should be updated (10.0.0.0/8 and the new 10.0.0.0/16 in the global table)
+        self.assertEqual(rebuild_prefixes(None), 2)
+        self.assertEqual(rebuild_prefixes(None), 0)
+        self.assertEqual(rebuild_prefixes(vrf.pk), 3)
+
+        for prefix in Prefix.objects.annotate_hierarchy():
+            self.assertEqual(prefix._depth, prefix.hierarchy_depth, prefix)
+            self.assertEqual(prefix._children, prefix.hierarchy_children, prefix)
+
+    def test_defer_prefix_hierarchy(self):
+        with defer_prefix_hierarchy():
+            Prefix(prefix='10.0.0.0/12').save()
+            Prefix(prefix='10.0.0.0/20').save()
+            Prefix.objects.get(prefix='10.0.0.0/16').delete()
+
+            # The hierarchy should not be updated until the context is exited
+            self.assertEqual(Prefix.objects.get(prefix='10.0.0.0/24')._depth, 2)
+
+        prefixes = Prefix.objects.filter(prefix__family=4)
+        self.assertEqual(prefixes[0].prefix, IPNetwork('10.0.0.0/8'))
+        self.assertEqual(prefixes[0]._depth, 0)
+        self.assertEqual(prefixes[0]._children, 3)
+        self.assertEqual(prefixes[1].prefix, IPNetwork('10.0.0.0/12'))
+        self.assertEqual(prefixes[1]._depth, 1)
+        self.assertEqual(prefixes[1]._children, 2)
+        self.assertEqual(prefixes[2].prefix, IPNetwork('10.0.0.0/20'))
+        self.assertEqual(prefixes[2]._depth, 2)
+        self.assertEqual(prefixes[2]._children, 1)
+        self.assertEqual(prefixes[3].prefix, IPNetwork('10.0.0.0/24'))
+        self.assertEqual(prefixes[3]._depth, 3)
+        self.assertEqual(prefixes[3]._children, 0)
+
 
 class TestIPAddress(TestCase):
 
@@ -1,8 +1,14 @@
+import threading
+from contextlib import contextmanager
+
 import netaddr
+from django.db import connection
 
 from .constants import *
 from .models import Prefix, VLAN
 
+_deferred_hierarchy = threading.local()
+
 
 def add_requested_prefixes(parent, prefix_list, show_available=True, show_assigned=True):
     """
@@ -128,59 +134,146 @@ def add_available_vlans(vlans, vlan_group=None):
 
 def rebuild_prefixes(vrf):
     """
-    Rebuild the prefix hierarchy for all prefixes in the specified VRF (or global table).
+    Rebuild the prefix hierarchy for all prefixes in the specified VRF (or global table). Depth and child counts are
+    calculated by PostgreSQL from a containment join of the VRF's prefixes (assisted by the GiST index on prefix) and
+    written back in a single statement; only prefixes whose values have changed are updated. Returns the number of
+    prefixes updated.
+    """
+    table = Prefix._meta.db_table
+    if vrf is None:
+        vrf_clause = 'vrf_id IS NULL'
+        params = []
+    else:
+        vrf_clause = 'vrf_id = %s'
+        params = [vrf]
+
+    sql = f"""
+        WITH vrf_prefixes AS (
+            SELECT id, prefix, _depth, _children FROM {table} WHERE {vrf_clause}
+        ),
+        relations AS (
+            SELECT parent.id AS parent_id, parent.prefix AS parent_prefix, child.id AS child_id
+            FROM vrf_prefixes parent
+            JOIN {table} child ON child.prefix << parent.prefix AND child.{vrf_clause}
+        ),
+        children AS (
+            SELECT parent_id AS id, COUNT(*) AS count FROM relations GROUP BY parent_id
+        ),
+        depths AS (
+            SELECT child_id AS id, COUNT(DISTINCT parent_prefix) AS count FROM relations GROUP BY child_id
+        ),
+        hierarchy AS (
+            SELECT p.id, COALESCE(d.count, 0) AS depth, COALESCE(c.count, 0) AS children
+            FROM vrf_prefixes p
+            LEFT JOIN depths d ON d.id = p.id
+            LEFT JOIN children c ON c.id = p.id
+            WHERE p._depth != COALESCE(d.count, 0) OR p._children != COALESCE(c.count, 0)
+        )
+        UPDATE {table} SET _depth = hierarchy.depth, _children = hierarchy.children
+        FROM hierarchy
+        WHERE {table}.id = hierarchy.id
     """
-    def contains(parent, child):
-        return child in parent and child != parent
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params * 2)
+        return cursor.rowcount
 
-    def push_to_stack(prefix):
-        # Increment child count on parent nodes
-        for n in stack:
-            n['children'] += 1
-        stack.append({
-            'pk': [prefix['pk']],
-            'prefix': prefix['prefix'],
-            'children': 0,
-        })
 
-    stack = []
-    update_queue = []
-    prefixes = Prefix.objects.filter(vrf=vrf).values('pk', 'prefix')
-
-    # Iterate through all Prefixes in the VRF, growing and shrinking the stack as we go
-    for i, p in enumerate(prefixes):
-
-        # Grow the stack if this is a child of the most recent prefix
-        if not stack or contains(stack[-1]['prefix'], p['prefix']):
-            push_to_stack(p)
-
-        # Handle duplicate prefixes
-        elif stack[-1]['prefix'] == p['prefix']:
-            stack[-1]['pk'].append(p['pk'])
-
-        # If this is a sibling or parent of the most recent prefix, pop nodes from the
-        # stack until we reach a parent prefix (or the root)
-        else:
-            while stack and not contains(stack[-1]['prefix'], p['prefix']):
-                node = stack.pop()
-                for pk in node['pk']:
-                    update_queue.append(
-                        Prefix(pk=pk, _depth=len(stack), _children=node['children'])
-                    )
-            push_to_stack(p)
-
-        # Flush the update queue once it reaches 100 Prefixes
-        if len(update_queue) >= 100:
-            Prefix.objects.bulk_update(update_queue, ['_depth', '_children'])
-            update_queue = []
-
-    # Clear out any prefixes remaining in the stack
-    while stack:
-        node = stack.pop()
-        for pk in node['pk']:
-            update_queue.append(
-                Prefix(pk=pk, _depth=len(stack), _children=node['children'])
-            )
-
-    # Final flush of any remaining Prefixes
-    Prefix.objects.bulk_update(update_queue, ['_depth', '_children'])
+def get_deferred_prefix_vrfs():
+    """
+    If maintenance of the prefix hierarchy has been deferred (see defer_prefix_hierarchy()), return the set of VRF IDs
+    affected so far. Otherwise, return None.
+    """
+    return getattr(_deferred_hierarchy, 'vrfs', None)
+
+
+@contextmanager
+def defer_prefix_hierarchy():
+    """
+    Defer maintenance of the prefix hierarchy (depth and child counts) while creating, modifying, or deleting many
+    prefixes. Rather than adjusting the hierarchy for each change, the hierarchy of each affected VRF is rebuilt once
+    upon exit.
+    """
+    # Nested use is subsumed by the outermost context
+    if get_deferred_prefix_vrfs() is not None:
+        yield
+        return
+
+    _deferred_hierarchy.vrfs = set()
+    try:
+        yield
+        for vrf_id in _deferred_hierarchy.vrfs:
+            rebuild_prefixes(vrf_id)
+    finally:
+        _deferred_hierarchy.vrfs = None
+
+
+def get_occupied_ranges(*querysets):
+    """
+    Return the contiguous blocks of IP space occupied by the objects in the given querysets as (first, last) integer
+    pairs in ascending order. Each queryset must be annotated with first_address and last_address (host inet values);
+    overlapping and adjacent intervals are merged by PostgreSQL, so the number of rows returned depends on how
+    fragmented the space is rather than on the number of objects.
+    """
+    subqueries = []
+    params = []
+    for queryset in querysets:
+        sql, qs_params = queryset.order_by().values_list('first_address', 'last_address').query.sql_with_params()
+        subqueries.append(sql)
+        params.extend(qs_params)
+
+    # A new block begins wherever an interval starts beyond the end of (and not adjacent to) all preceding intervals.
+    # The CASE ordering ensures that first_address is never decremented below the start of the address space.
+    sql = f"""
+        WITH occupied AS (
+            {' UNION ALL '.join(f'({subquery})' for subquery in subqueries)}
+        ),
+        ordered AS (
+            SELECT first_address, last_address, MAX(last_address) OVER (
+                ORDER BY first_address, last_address ROWS BETWEEN UNBOUNDED PRECEDING AND 1 PRECEDING
+            ) AS prev_last
+            FROM occupied
+        ),
+        blocks AS (
+            SELECT first_address, last_address, SUM(
+                CASE
+                    WHEN prev_last IS NULL THEN 1
+                    WHEN first_address <= prev_last THEN 0
+                    WHEN first_address - 1 > prev_last THEN 1
+                    ELSE 0
+                END
+            ) OVER (ORDER BY first_address, last_address ROWS UNBOUNDED PRECEDING) AS block
+            FROM ordered
+        )
+        SELECT HOST(MIN(first_address)), HOST(MAX(last_address))
+        FROM blocks
+        GROUP BY block
+        ORDER BY MIN(first_address)
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return [
+            (netaddr.IPAddress(first).value, netaddr.IPAddress(last).value) for first, last in cursor.fetchall()
+        ]
+
+
+def get_available_ranges(first, last, occupied, version):
+    """
+    Return the unoccupied portions of the IP space between first and last (inclusive integer values) as a list of
+    netaddr.IPRanges, given the sorted, non-overlapping (first, last) blocks returned by get_occupied_ranges().
+    """
+    available = []
+    for start, end in occupied:
+        if end < first:
+            continue
+        if start > last:
+            break
+        if start > first:
+            available.append((first, start - 1))
+        first = end + 1
+    if first <= last:
+        available.append((first, last))
+
+    return [
+        netaddr.IPRange(netaddr.IPAddress(start, version), netaddr.IPAddress(end, version))
+        for start, end in available
+    ]
@@ -18,7 +18,7 @@ from .constants import *
 from .models import *
 from .models import ASN
 from .tables.l2vpn import L2VPNTable, L2VPNTerminationTable
-from .utils import add_requested_prefixes, add_available_ipaddresses, add_available_vlans
+from .utils import add_requested_prefixes, add_available_ipaddresses, add_available_vlans, defer_prefix_hierarchy
 
 
 #
@@ -279,7 +279,7 @@ class ASNBulkDeleteView(generic.BulkDeleteView):
 class AggregateListView(generic.ObjectListView):
     queryset = Aggregate.objects.annotate(
         child_count=RawSQL('SELECT COUNT(*) FROM ipam_prefix WHERE ipam_prefix.prefix <<= ipam_aggregate.prefix', ())
-    )
+    ).annotate_utilization()
     filterset = filtersets.AggregateFilterSet
     filterset_form = forms.AggregateFilterForm
     table = tables.AggregateTable
@@ -299,7 +299,7 @@ class AggregatePrefixesView(generic.ObjectChildrenView):
     def get_children(self, request, parent):
         return Prefix.objects.restrict(request.user, 'view').filter(
             prefix__net_contained_or_equal=str(parent.prefix)
-        ).prefetch_related('site', 'role', 'tenant', 'tenant__group', 'vlan')
+        ).prefetch_related('site', 'role', 'tenant', 'tenant__group', 'vlan').annotate_utilization()
 
     def prep_table_data(self, request, queryset, parent):
         # Determine whether to show assigned prefixes, available prefixes, or both
@@ -413,7 +413,7 @@ class RoleBulkDeleteView(generic.BulkDeleteView):
 #
 
 class PrefixListView(generic.ObjectListView):
-    queryset = Prefix.objects.all()
+    queryset = Prefix.objects.annotate_utilization()
     filterset = filtersets.PrefixFilterSet
     filterset_form = forms.PrefixFilterForm
     table = tables.PrefixTable
@@ -476,7 +476,7 @@ class PrefixPrefixesView(generic.ObjectChildrenView):
     def get_children(self, request, parent):
         return parent.get_child_prefixes().restrict(request.user, 'view').prefetch_related(
             'site', 'vrf', 'vlan', 'role', 'tenant', 'tenant__group'
-        )
+        ).annotate_utilization()
 
     def prep_table_data(self, request, queryset, parent):
         # Determine whether to show assigned prefixes, available prefixes, or both
@@ -554,6 +554,11 @@ class PrefixBulkImportView(generic.BulkImportView):
     model_form = forms.PrefixCSVForm
     table = tables.PrefixTable
 
+    def _create_objects(self, form, request):
+        # Rebuild the prefix hierarchy once all prefixes have been created
+        with defer_prefix_hierarchy():
+            return super()._create_objects(form, request)
+
 
 class PrefixBulkEditView(generic.BulkEditView):
     queryset = Prefix.objects.prefetch_related('vrf__tenant')
@@ -561,6 +566,11 @@ class PrefixBulkEditView(generic.BulkEditView):
     table = tables.PrefixTable
     form = forms.PrefixBulkEditForm
 
+    def _update_objects(self, form, request):
+        # Rebuild the prefix hierarchy once all prefixes have been updated
+        with defer_prefix_hierarchy():
+            return super()._update_objects(form, request)
+
 
 class PrefixBulkDeleteView(generic.BulkDeleteView):
     queryset = Prefix.objects.prefetch_related('vrf__tenant')
@@ -1,20 +1,94 @@
-from django.db.models import QuerySet
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from functools import reduce
+from operator import or_
+
+from django.contrib.postgres.fields import ArrayField
+from django.core.exceptions import ValidationError
+from django.db.models import F, Field, Func, OrderBy, Q, QuerySet, Value
+from django.db.models.expressions import Col
+from django.db.models.lookups import GreaterThan, LessThan
+from rest_framework.exceptions import NotFound
 from rest_framework.pagination import LimitOffsetPagination
+from rest_framework.utils.urls import remove_query_param, replace_query_param
 
 from netbox.config import get_config
 
 
+class Row(Func):
+    """
+    A row constructor (e.g. `(a, b)`), for comparing several values in order.
+    """
+    template = '(%(expressions)s)'
+
+    def __init__(self, *expressions):
+        super().__init__(*expressions, output_field=Field())
+
+
+def is_not_null(expression, base_table):
+    """
+    Return True if the given (resolved) expression is derived solely from non-nullable columns of the base table, and
+    so can never be null.
+    """
+    if isinstance(expression, Col):
+        return expression.alias == base_table and not expression.target.null
+    source_expressions = expression.get_source_expressions()
+    return bool(source_expressions) and all(is_not_null(expr, base_table) for expr in source_expressions)
+
+
+def get_cursor_ordering(queryset):
+    """
+    Return the ordering of a QuerySet as a list of (expression, descending, nulls_first) tuples, terminated by the
+    primary key so that the ordering is unambiguous. Related objects are ordered by their primary keys.
+    """
+    query = queryset.query
+    ordering = query.order_by or (query.get_meta().ordering if query.default_ordering else ())
+    columns = []
+
+    for item in ordering:
+        if isinstance(item, str):
+            if item == '?':
+                continue
+            descending = item.startswith('-')
+            name = item.lstrip('-')
+            # PostgreSQL sorts nulls as greater than any value
+            columns.append((F(name), descending, descending))
+            if name in ('pk', query.get_meta().pk.name):
+                return columns
+        elif isinstance(item, OrderBy):
+            nulls_first = item.nulls_first or (item.descending and not item.nulls_last)
+            columns.append((item.expression, item.descending, nulls_first))
+        else:
+            columns.append((item, False, False))
+
+    columns.append((F('pk'), False, False))
+    return columns
+
+
 class OptionalLimitOffsetPagination(LimitOffsetPagination):
     """
     Override the stock paginator to allow setting limit=0 to disable pagination for a request. This returns all objects
     matching a query, but retains the same format as a paginated request. The limit can only be disabled if
     MAX_PAGE_SIZE has been set to 0 or None.
+
+    Passing the `cursor` query parameter (initially empty) instead selects keyset pagination: Each page begins after
+    the last object of the previous page, as identified by the cursor in the `next` link, so retrieving a page does
+    not become slower as the offset increases. The total count is omitted unless `count` is also passed.
     """
+    cursor_query_param = 'cursor'
+    count_query_param = 'count'
+    invalid_cursor_message = 'Invalid cursor'
+
     def __init__(self):
         self.default_limit = get_config().PAGINATE_COUNT
+        self.cursor_mode = False
+        self.next_cursor = None
 
     def paginate_queryset(self, queryset, request, view=None):
 
+        if self.cursor_query_param in request.query_params and isinstance(queryset, QuerySet):
+            return self.paginate_queryset_by_cursor(queryset, request)
+
         if isinstance(queryset, QuerySet):
             self.count = self.get_queryset_count(queryset)
         else:
@@ -36,6 +110,120 @@ class OptionalLimitOffsetPagination(LimitOffsetPagination):
         else:
             return list(queryset[self.offset:])
 
+    def paginate_queryset_by_cursor(self, queryset, request):
+        self.limit = self.get_limit(request)
+        self.offset = 0
+        self.request = request
+        self.cursor_mode = True
+
+        if request.query_params.get(self.count_query_param):
+            self.count = self.get_queryset_count(queryset)
+        else:
+            self.count = None
+
+        # Annotate the value of each ordering column, and order by these annotations
+        columns = [
+            (f'_cursor_{i}', expression, descending, nulls_first)
+            for i, (expression, descending, nulls_first) in enumerate(get_cursor_ordering(queryset))
+        ]
+        queryset = queryset.annotate(**{
+            alias: expression for alias, expression, _, _ in columns
+        }).order_by(*[
+            OrderBy(F(alias), descending=descending, nulls_first=nulls_first, nulls_last=not nulls_first)
+            for alias, _, descending, nulls_first in columns
+        ])
+
+        cursor = request.query_params[self.cursor_query_param]
+        if cursor:
+            values = self.decode_cursor(cursor, [
+                queryset.query.annotations[alias].output_field for alias, _, _, _ in columns
+            ])
+            queryset = queryset.filter(self.get_cursor_filter(queryset, columns, values))
+
+        if not self.limit:
+            return list(queryset)
+
+        # Retrieve one additional object to determine whether another page follows
+        results = list(queryset[:self.limit + 1])
+        if len(results) > self.limit:
+            results = results[:self.limit]
+            self.next_cursor = self.encode_cursor([getattr(results[-1], alias) for alias, _, _, _ in columns])
+
+        return results
+
+    def get_cursor_filter(self, queryset, columns, values):
+        """
+        Return a filter matching all objects which follow the given values of the ordering columns.
+        """
+        annotations = queryset.query.annotations
+
+        # Where no column can be null and all are ordered in the same direction, compare the rows directly. This
+        # permits the use of an index spanning the ordering columns.
+        if len({descending for _, _, descending, _ in columns}) == 1 and all(
+            value is not None and is_not_null(annotations[alias], queryset.query.base_table)
+            for (alias, _, _, _), value in zip(columns, values)
+        ):
+            lookup = LessThan if columns[0][2] else GreaterThan
+            return lookup(
+                Row(*[F(alias) for alias, _, _, _ in columns]),
+                Row(*[
+                    Value(value, output_field=annotations[alias].output_field)
+                    for (alias, _, _, _), value in zip(columns, values)
+                ])
+            )
+
+        terms = []
+        preceding = Q()
+
+        for (alias, _, descending, nulls_first), value in zip(columns, values):
+            # Objects for which this is the first column to follow the cursor
+            if value is None:
+                if nulls_first:
+                    terms.append(preceding & Q(**{f'{alias}__isnull': False}))
+                preceding &= Q(**{f'{alias}__isnull': True})
+            else:
+                follows = Q(**{f'{alias}__{"lt" if descending else "gt"}': value})
+                if not nulls_first:
+                    follows |= Q(**{f'{alias}__isnull': True})
+                terms.append(preceding & follows)
+                preceding &= Q(**{alias: value})
+
+        return reduce(or_, terms, Q(pk__in=[]))
+
+    def encode_cursor(self, values):
+        # Values which are not native to JSON (e.g. IP networks or timestamps) are encoded as strings
+        return urlsafe_b64encode(json.dumps(values, default=str).encode()).decode()
+
+    def decode_cursor(self, cursor, fields):
+        """
+        Decode the values of the ordering columns from a cursor, validating each value against the column's field.
+        """
+        try:
+            values = json.loads(urlsafe_b64decode(cursor.encode()))
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        if type(values) is not list or len(values) != len(fields):
+            raise NotFound(self.invalid_cursor_message)
+
+        for value, field in zip(values, fields):
+            if value is None:
+                continue
+            # The value of an array column is a list of scalars
+            if isinstance(field, ArrayField) and type(value) is list:
+                field, items = field.base_field, value
+            else:
+                items = [value]
+            # Reject any value which is not a scalar, or which is not valid for the column
+            for item in items:
+                if type(item) not in (str, int, float, bool):
+                    raise NotFound(self.invalid_cursor_message)
+                try:
+                    field.to_python(item)
+                except (ValidationError, TypeError, ValueError):
+                    raise NotFound(self.invalid_cursor_message)
+
+        return values
+
     def get_limit(self, request):
         if self.limit_query_param:
             try:
@@ -61,12 +249,19 @@ class OptionalLimitOffsetPagination(LimitOffsetPagination):
         if not self.limit:
             return None
 
+        if self.cursor_mode:
+            if self.next_cursor is None:
+                return None
+            url = remove_query_param(self.request.build_absolute_uri(), self.offset_query_param)
+            url = replace_query_param(url, self.limit_query_param, self.limit)
+            return replace_query_param(url, self.cursor_query_param, self.next_cursor)
+
         return super().get_next_link()
 
     def get_previous_link(self):
 
-        # Pagination has been disabled
-        if not self.limit:
+        # Pagination has been disabled, or only forward traversal is supported
+        if not self.limit or self.cursor_mode:
             return None
 
         return super().get_previous_link()
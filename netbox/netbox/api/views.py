@@ -4,11 +4,15 @@ from django import __version__ as DJANGO_VERSION
 from django.apps import apps
 from django.conf import settings
 from django_rq.queues import get_connection
+from rest_framework.generics import ListAPIView
 from rest_framework.response import Response
 from rest_framework.reverse import reverse
 from rest_framework.views import APIView
 from rq.worker import Worker
 
+from extras.api.serializers import CachedValueSerializer
+from extras.models import CachedValue
+from extras.search import search
 from netbox.api.authentication import IsAuthenticatedOrLoginNotRequired
 
 
@@ -31,6 +35,7 @@ class APIRootView(APIView):
             'extras': reverse('extras-api:api-root', request=request, format=format),
             'ipam': reverse('ipam-api:api-root', request=request, format=format),
             'plugins': reverse('plugins-api:api-root', request=request, format=format),
+            'search': reverse('api-search', request=request, format=format),
             'status': reverse('api-status', request=request, format=format),
             'tenancy': reverse('tenancy-api:api-root', request=request, format=format),
             'users': reverse('users-api:api-root', request=request, format=format),
@@ -73,3 +78,20 @@ class StatusView(APIView):
             'python-version': platform.python_version(),
             'rq-workers-running': Worker.count(get_connection('default')),
         })
+
+
+class SearchView(ListAPIView):
+    """
+    Search all indexed objects for the string specified by the `q` parameter. The most relevant match for each object
+    is returned, ordered by weight (lower is more relevant). Only objects which the user is permitted to view are
+    included.
+    """
+    permission_classes = [IsAuthenticatedOrLoginNotRequired]
+    serializer_class = CachedValueSerializer
+
+    def get_queryset(self):
+        value = self.request.query_params.get('q', '').strip()
+        if not value:
+            return CachedValue.objects.none()
+
+        return search(value, self.request.user).prefetch_related('object_type', 'object')
@@ -8,7 +8,8 @@ from django.shortcuts import get_object_or_404
 from rest_framework.response import Response
 from rest_framework.viewsets import ModelViewSet
 
-from extras.models import ExportTemplate
+from extras.exports import enqueue_export
+from extras.models import ExportTemplate, JobResult
 from netbox.api.exceptions import SerializerNotFound
 from netbox.constants import NESTED_SERIALIZER_PREFIX
 from utilities.api import get_serializer_for_model
@@ -138,12 +139,17 @@ class NetBoxModelViewSet(BulkUpdateModelMixin, BulkDestroyModelMixin, ObjectVali
 
     def list(self, request, *args, **kwargs):
         """
-        Overrides ListModelMixin to allow processing ExportTemplates.
+        Overrides ListModelMixin to allow processing ExportTemplates. If the `background` parameter is true, the
+        ExportTemplate is rendered by a background job, and the resulting JobResult is returned.
         """
         if 'export' in request.GET:
             content_type = ContentType.objects.get_for_model(self.get_serializer_class().Meta.model)
             et = get_object_or_404(ExportTemplate, content_type=content_type, name=request.GET['export'])
             queryset = self.filter_queryset(self.get_queryset())
+            if request.GET.get('background') == 'true':
+                job_result = enqueue_export(queryset, request.user, export_template=et)
+                serializer = get_serializer_for_model(JobResult)
+                return Response(serializer(job_result, context={'request': request}).data, status=202)
             return et.render_to_response(queryset)
 
         return super().list(request, *args, **kwargs)
@@ -1,5 +1,8 @@
-from django.core.exceptions import ObjectDoesNotExist
-from django.db import transaction
+import logging
+
+from django.core.exceptions import ObjectDoesNotExist, PermissionDenied
+from django.db import models, router, transaction
+from django.db.models.deletion import Collector
 from rest_framework import status
 from rest_framework.response import Response
 
@@ -12,6 +15,15 @@ __all__ = (
 )
 
 
+def _overrides(view, name):
+    """
+    Return True if the given method of a view differs from that of NetBoxModelViewSet.
+    """
+    from . import NetBoxModelViewSet
+
+    return getattr(type(view), name) is not getattr(NetBoxModelViewSet, name)
+
+
 class BulkUpdateModelMixin:
     """
     Support bulk modification of objects using the list endpoint for a model. Accepts a PATCH action with a list of one
@@ -48,18 +60,40 @@ class BulkUpdateModelMixin:
         return Response(data, status=status.HTTP_200_OK)
 
     def perform_bulk_update(self, objects, update_data, partial):
+        model = self.queryset.model
+        logger = logging.getLogger('netbox.api.views.ModelViewSet')
+
         with transaction.atomic():
-            data_list = []
-            for obj in objects:
-                data = update_data.get(obj.id)
-                if hasattr(obj, 'snapshot'):
-                    obj.snapshot()
-                serializer = self.get_serializer(obj, data=data, partial=partial)
-                serializer.is_valid(raise_exception=True)
-                self.perform_update(serializer)
-                data_list.append(serializer.data)
-
-            return data_list
+            objects = list(objects)
+            if hasattr(model, 'snapshot_objects'):
+                model.snapshot_objects(objects)
+
+            # Where perform_update() has been customized, it must be called for each object
+            if _overrides(self, 'perform_update'):
+                data_list = []
+                for obj in objects:
+                    data = update_data.get(obj.id)
+                    serializer = self.get_serializer(obj, data=data, partial=partial)
+                    serializer.is_valid(raise_exception=True)
+                    self.perform_update(serializer)
+                    data_list.append(serializer.data)
+                return data_list
+
+            # Each object is validated and saved in turn, so that validation reflects any changes made to the objects
+            # preceding it. Object-level permissions are enforced once all objects have been saved.
+            try:
+                for obj in objects:
+                    data = update_data.get(obj.id)
+                    serializer = self.get_serializer(obj, data=data, partial=partial)
+                    serializer.is_valid(raise_exception=True)
+                    logger.info(f"Updating {model._meta.verbose_name} {obj} (PK: {obj.pk})")
+                    serializer.save()
+                self._validate_objects(objects)
+            except ObjectDoesNotExist:
+                raise PermissionDenied()
+
+            # Serialize the updated objects together, so that each field is constructed only once
+            return self.get_serializer(objects, many=True).data
 
     def bulk_partial_update(self, request, *args, **kwargs):
         kwargs['partial'] = True
@@ -89,11 +123,27 @@ class BulkDestroyModelMixin:
         return Response(status=status.HTTP_204_NO_CONTENT)
 
     def perform_bulk_destroy(self, objects):
+        model = self.queryset.model
+        logger = logging.getLogger('netbox.api.views.ModelViewSet')
+
         with transaction.atomic():
-            for obj in objects:
-                if hasattr(obj, 'snapshot'):
-                    obj.snapshot()
-                self.perform_destroy(obj)
+            objects = list(objects)
+            if hasattr(model, 'snapshot_objects'):
+                model.snapshot_objects(objects)
+
+            # Models which override delete(), and views which customize perform_destroy(), must have each object
+            # deleted individually
+            if model.delete is not models.Model.delete or _overrides(self, 'perform_destroy'):
+                for obj in objects:
+                    self.perform_destroy(obj)
+                return
+
+            # Collect all objects (and their dependents) for deletion at once. As with Model.delete(), the pre_delete
+            # and post_delete signals are sent for every object deleted.
+            logger.info(f"Deleting {len(objects)} {model._meta.verbose_name_plural}")
+            collector = Collector(using=router.db_for_write(model))
+            collector.collect(objects)
+            collector.delete()
 
 
 class ObjectValidationMixin:
@@ -110,4 +160,5 @@ class ObjectValidationMixin:
                 raise ObjectDoesNotExist
         else:
             # Check that the instance is matched by the view's queryset
-            self.queryset.get(pk=instance.pk)
+            if not self.queryset.filter(pk=instance.pk).exists():
+                raise ObjectDoesNotExist
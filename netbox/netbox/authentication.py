@@ -1,21 +1,34 @@
 import logging
-from collections import defaultdict
+import threading
+import uuid
+from collections import OrderedDict, defaultdict
 
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.auth.backends import ModelBackend, RemoteUserBackend as _RemoteUserBackend
 from django.contrib.auth.models import Group, AnonymousUser
+from django.core.cache import cache
 from django.core.exceptions import ImproperlyConfigured
+from django.db import transaction
 from django.db.models import Q
 
-from users.constants import CONSTRAINT_TOKEN_USER
 from users.models import ObjectPermission
 from utilities.permissions import (
-    permission_is_exempt, qs_filter_from_constraints, resolve_permission, resolve_permission_ct,
+    permission_is_exempt, qs_filter_for_user, resolve_permission, resolve_permission_ct,
 )
 
 UserModel = get_user_model()
 
+# The maximum number of users whose object permissions are cached by each process
+OBJECT_PERMISSION_CACHE_SIZE = 1024
+
+# Cache key holding the current generation of cached object permissions. A new value is assigned whenever any
+# ObjectPermission, or the assignment of one to a user or group, changes.
+OBJECT_PERMISSION_CACHE_VERSION_KEY = 'object_permissions_version'
+
+_object_permission_cache = OrderedDict()
+_object_permission_cache_lock = threading.Lock()
+
 AUTH_BACKEND_ATTRS = {
     # backend name: title, MDI icon name
     'amazon': ('Amazon AWS', 'aws'),
@@ -55,15 +68,61 @@ def get_auth_backend_display(name):
     return AUTH_BACKEND_ATTRS.get(name, (name, None))
 
 
+def get_object_permission_cache_version():
+    """
+    Return the current generation of cached object permissions, initializing it if necessary.
+    """
+    version = cache.get(OBJECT_PERMISSION_CACHE_VERSION_KEY)
+    if version is None:
+        cache.add(OBJECT_PERMISSION_CACHE_VERSION_KEY, uuid.uuid4().hex, None)
+        version = cache.get(OBJECT_PERMISSION_CACHE_VERSION_KEY)
+    return version
+
+
+def invalidate_object_permission_cache():
+    """
+    Invalidate the object permissions cached by all processes. This takes effect immediately, and again once the
+    current transaction has been committed, so that permissions read by other processes before the commit are not
+    retained.
+    """
+    def _invalidate():
+        cache.set(OBJECT_PERMISSION_CACHE_VERSION_KEY, uuid.uuid4().hex, None)
+
+    _invalidate()
+    transaction.on_commit(_invalidate)
+
+
 class ObjectPermissionMixin:
 
     def get_all_permissions(self, user_obj, obj=None):
         if not user_obj.is_active or user_obj.is_anonymous:
             return dict()
         if not hasattr(user_obj, '_object_perm_cache'):
-            user_obj._object_perm_cache = self.get_object_permissions(user_obj)
+            user_obj._object_perm_cache, user_obj._object_perm_filters = self.get_cached_object_permissions(user_obj)
         return user_obj._object_perm_cache
 
+    def get_cached_object_permissions(self, user_obj):
+        """
+        Return the user's object permissions (see get_object_permissions()), along with a dictionary to be populated
+        with the QuerySet filter compiled for each permission. Both are cached by the process (with the least recently
+        used evicted first) until the object permissions cache is next invalidated.
+        """
+        # The permission filter identifies the user and any groups (e.g. from LDAP) from which it inherits permissions
+        key = (self.get_permission_filter(user_obj), get_object_permission_cache_version())
+        with _object_permission_cache_lock:
+            if key in _object_permission_cache:
+                _object_permission_cache.move_to_end(key)
+                return _object_permission_cache[key]
+
+        cached = (dict(self.get_object_permissions(user_obj)), {})
+
+        with _object_permission_cache_lock:
+            _object_permission_cache[key] = cached
+            if len(_object_permission_cache) > OBJECT_PERMISSION_CACHE_SIZE:
+                _object_permission_cache.popitem(last=False)
+
+        return cached
+
     def get_permission_filter(self, user_obj):
         return Q(users=user_obj) | Q(groups__user=user_obj)
 
@@ -119,10 +178,7 @@ class ObjectPermissionMixin:
             raise ValueError(f"Invalid permission {perm} for model {model}")
 
         # Compile a QuerySet filter that matches all instances of the specified model
-        tokens = {
-            CONSTRAINT_TOKEN_USER: user_obj,
-        }
-        qs_filter = qs_filter_from_constraints(object_permissions[perm], tokens)
+        qs_filter = qs_filter_for_user(user_obj, perm)
 
         # Permission to perform the requested action on the object depends on whether the specified object matches
         # the specified constraints. Note that this check is made against the *database* record representing the object,
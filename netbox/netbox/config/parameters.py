@@ -219,6 +219,22 @@ PARAMS = (
         description="Days to retain job result history (set to zero for unlimited)",
         field=forms.IntegerField
     ),
+    ConfigParam(
+        name='HOMEPAGE_STATS_CACHE_TIMEOUT',
+        label='Home page statistics cache timeout',
+        default=300,
+        description="Seconds after which cached object counts on the home page are refreshed (set to zero to disable "
+                    "caching)",
+        field=forms.IntegerField
+    ),
+    ConfigParam(
+        name='BULK_IMPORT_BACKGROUND_THRESHOLD',
+        label='Bulk import background threshold',
+        default=10000,
+        description="Number of records above which an uploaded CSV file is imported by a background job (set to zero "
+                    "to always import immediately)",
+        field=forms.IntegerField
+    ),
     ConfigParam(
         name='MAPS_URL',
         label='Maps URL',
@@ -3,6 +3,7 @@ from functools import partial
 import graphene
 from graphene_django import DjangoListField
 
+from .optimizer import optimize_queryset
 from .utils import get_graphene_type
 
 __all__ = (
@@ -29,6 +30,7 @@ class ObjectField(graphene.Field):
         """
         manager = django_object_type._meta.model._default_manager
         queryset = django_object_type.get_queryset(manager, info)
+        queryset = optimize_queryset(queryset, info)
 
         return queryset.get(**args)
 
@@ -56,6 +58,7 @@ class ObjectListField(DjangoListField):
     def list_resolver(django_object_type, resolver, default_manager, root, info, **args):
         # Get the QuerySet from the object type
         queryset = django_object_type.get_queryset(default_manager, info)
+        queryset = optimize_queryset(queryset, info)
 
         # Instantiate and apply the FilterSet, if defined
         filterset_class = django_object_type._meta.filterset_class
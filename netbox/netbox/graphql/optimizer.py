@@ -0,0 +1,169 @@
+from django.contrib.contenttypes.fields import GenericForeignKey, GenericRelation
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Model, Prefetch, QuerySet
+from django.db.models.constants import LOOKUP_SEP
+from graphql.language.ast import FragmentSpread, InlineFragment
+from graphql.type.definition import GraphQLObjectType
+from taggit.managers import TaggableManager
+
+__all__ = (
+    'optimize_queryset',
+    'restrict_queryset',
+)
+
+
+def restrict_queryset(queryset, info):
+    """
+    Restrict a QuerySet to the objects which the requesting user is permitted to view. Related objects which have been
+    prefetched by optimize_queryset() have already been restricted, and are returned as-is.
+    """
+    if (
+        isinstance(queryset, QuerySet) and
+        queryset._result_cache is not None and
+        getattr(queryset.query, 'restricted_for', None) is info.context.user
+    ):
+        return queryset
+
+    return queryset.restrict(info.context.user, 'view')
+
+
+def optimize_queryset(queryset, info):
+    """
+    Optimize a QuerySet for the fields selected by a GraphQL query: Related objects are retrieved using select_related()
+    (for foreign keys) or prefetch_related() (for many-to-many, reverse, and generic relations), and the retrieval of
+    model fields which have not been selected is deferred using only(). Prefetched objects are restricted to those
+    which the requesting user is permitted to view.
+    """
+    object_type = _get_object_type(info.return_type)
+    if object_type is None:
+        return queryset
+
+    return _optimize(queryset, object_type, info.field_asts, info)
+
+
+def _optimize(queryset, object_type, field_asts, info, required_fields=()):
+    select_related = set()
+    prefetch_related = []
+    only = set()
+
+    _plan(
+        queryset.model, object_type, field_asts, info, '', select_related, prefetch_related, only, required_fields
+    )
+
+    if select_related:
+        queryset = queryset.select_related(*sorted(select_related))
+    if prefetch_related:
+        queryset = queryset.prefetch_related(*prefetch_related)
+
+    return queryset.only(*sorted(only))
+
+
+def _plan(model, object_type, field_asts, info, prefix, select_related, prefetch_related, only, required_fields=()):
+    """
+    Determine the related objects to be selected or prefetched, and the fields to be retrieved, for the fields selected
+    on a model. Fields of models related by foreign key are planned recursively, with the lookup path as a prefix.
+    """
+    # Retrieval of fields cannot be deferred for models which access their fields on initialization
+    deferrable = model.__init__ is Model.__init__
+    fields = {model._meta.pk.name, *required_fields}
+
+    for name, selections in _get_selected_fields(field_asts, info).items():
+        if name == '__typename':
+            continue
+        try:
+            field = model._meta.get_field(name)
+        except FieldDoesNotExist:
+            # The field is resolved by some other means, which may require any of the model's fields
+            deferrable = False
+            continue
+        lookup = f'{prefix}{name}'
+
+        # Generic foreign keys
+        if isinstance(field, GenericForeignKey):
+            fields.update((field.ct_field, field.fk_field))
+            prefetch_related.append(lookup)
+
+        # Many-to-many, reverse, and generic relations
+        elif field.many_to_many or field.one_to_many:
+
+            # Tags are not subject to object permissions
+            if isinstance(field, TaggableManager):
+                prefetch_related.append(lookup)
+                continue
+
+            related_type = _get_object_type(object_type.fields[name].type)
+            if related_type is None:
+                continue
+
+            # Include the fields used to match related objects to their parents
+            if isinstance(field, GenericRelation):
+                related_fields = (field.content_type_field_name, field.object_id_field_name)
+            elif field.one_to_many:
+                related_fields = (field.field.name,)
+            else:
+                related_fields = ()
+
+            related_queryset = related_type.graphene_type.get_queryset(
+                field.related_model._default_manager.all(), info
+            )
+            # Mark the restricted queryset, such that its prefetched objects are not restricted again when resolved.
+            # (The marker is set on the query, as the queryset is cloned when objects are prefetched.)
+            related_queryset.query.restricted_for = info.context.user
+            prefetch_related.append(Prefetch(
+                lookup,
+                queryset=_optimize(related_queryset, related_type, selections, info, related_fields)
+            ))
+
+        # Foreign keys and one-to-one relations
+        elif field.is_relation:
+            if field.concrete:
+                fields.add(name)
+            related_type = _get_object_type(object_type.fields[name].type)
+            if related_type is None:
+                continue
+            select_related.add(lookup)
+            _plan(
+                field.related_model, related_type, selections, info, f'{lookup}{LOOKUP_SEP}', select_related,
+                prefetch_related, only
+            )
+
+        else:
+            fields.add(name)
+
+    if not deferrable:
+        fields.update(field.name for field in model._meta.concrete_fields)
+    only.update(f'{prefix}{name}' for name in fields)
+
+
+def _get_object_type(graphql_type):
+    """
+    Return the GraphQL object type of a field (unwrapping any lists or non-null types), if it represents a model.
+    """
+    while hasattr(graphql_type, 'of_type'):
+        graphql_type = graphql_type.of_type
+
+    if isinstance(graphql_type, GraphQLObjectType) and hasattr(graphql_type.graphene_type, 'get_queryset'):
+        return graphql_type
+
+
+def _get_selected_fields(field_asts, info):
+    """
+    Return a dictionary mapping the names of the fields selected beneath the given field(s) to their selections,
+    resolving any fragments.
+    """
+    fields = {}
+
+    def collect(selection_set):
+        for selection in selection_set.selections:
+            if isinstance(selection, FragmentSpread):
+                collect(info.fragments[selection.name.value].selection_set)
+            elif isinstance(selection, InlineFragment):
+                collect(selection.selection_set)
+            else:
+                fields.setdefault(selection.name.value, []).append(selection)
+
+    for field_ast in field_asts:
+        if field_ast.selection_set:
+            collect(field_ast.selection_set)
+
+    return fields
@@ -2,6 +2,7 @@ from django.contrib.contenttypes.models import ContentType
 from graphene_django import DjangoObjectType
 
 from extras.graphql.mixins import ChangelogMixin, CustomFieldsMixin, JournalEntriesMixin, TagsMixin
+from .optimizer import restrict_queryset
 
 __all__ = (
     'BaseObjectType',
@@ -25,7 +26,7 @@ class BaseObjectType(DjangoObjectType):
     @classmethod
     def get_queryset(cls, queryset, info):
         # Enforce object permissions on the queryset
-        return queryset.restrict(info.context.user, 'view')
+        return restrict_queryset(queryset, info)
 
 
 class ObjectType(
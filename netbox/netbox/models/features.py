@@ -12,7 +12,7 @@ from taggit.managers import TaggableManager
 from extras.choices import CustomFieldVisibilityChoices, ObjectChangeActionChoices
 from extras.utils import register_features
 from netbox.signals import post_clean
-from utilities.utils import serialize_object
+from utilities.utils import serialize_object, serialize_objects
 
 __all__ = (
     'ChangeLoggingMixin',
@@ -63,6 +63,23 @@ class ChangeLoggingMixin(models.Model):
         """
         self._prechange_snapshot = self.serialize_object()
 
+    @classmethod
+    def snapshot_objects(cls, objects):
+        """
+        Save a snapshot of each of the given instances of this model (see snapshot()). Unless the model overrides its
+        serialization logic, the objects are serialized together so that their related data is retrieved in bulk.
+        """
+        default_serialization = (
+            cls.serialize_object is ChangeLoggingMixin.serialize_object and cls.snapshot is ChangeLoggingMixin.snapshot
+        )
+        if not default_serialization:
+            for obj in objects:
+                obj.snapshot()
+            return
+
+        for obj, data in zip(objects, serialize_objects(objects)):
+            obj._prechange_snapshot = data
+
     def to_objectchange(self, action):
         """
         Return a new ObjectChange representing a change made to this object. This will typically be called automatically
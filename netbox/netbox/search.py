@@ -29,6 +29,7 @@ CIRCUIT_TYPES = {
         'filterset': circuits.filtersets.ProviderFilterSet,
         'table': circuits.tables.ProviderTable,
         'url': 'circuits:provider_list',
+        'fields': (('name', 100), ('account', 200), ('noc_contact', 1000), ('admin_contact', 1000), ('comments', 5000)),
     },
     'circuit': {
         'queryset': Circuit.objects.prefetch_related(
@@ -37,12 +38,14 @@ CIRCUIT_TYPES = {
         'filterset': circuits.filtersets.CircuitFilterSet,
         'table': circuits.tables.CircuitTable,
         'url': 'circuits:circuit_list',
+        'fields': (('cid', 100), ('description', 500), ('comments', 5000)),
     },
     'providernetwork': {
         'queryset': ProviderNetwork.objects.prefetch_related('provider'),
         'filterset': circuits.filtersets.ProviderNetworkFilterSet,
         'table': circuits.tables.ProviderNetworkTable,
         'url': 'circuits:providernetwork_list',
+        'fields': (('name', 100), ('service_id', 200), ('description', 500), ('comments', 5000)),
     },
 }
 
@@ -52,6 +55,10 @@ DCIM_TYPES = {
         'filterset': dcim.filtersets.SiteFilterSet,
         'table': dcim.tables.SiteTable,
         'url': 'dcim:site_list',
+        'fields': (
+            ('name', 100), ('facility', 200), ('description', 500), ('physical_address', 1000),
+            ('shipping_address', 1000), ('comments', 5000),
+        ),
     },
     'rack': {
         'queryset': Rack.objects.prefetch_related('site', 'location', 'tenant', 'tenant__group', 'role').annotate(
@@ -60,12 +67,14 @@ DCIM_TYPES = {
         'filterset': dcim.filtersets.RackFilterSet,
         'table': dcim.tables.RackTable,
         'url': 'dcim:rack_list',
+        'fields': (('name', 100), ('facility_id', 200), ('serial', 200), ('asset_tag', 200), ('comments', 5000)),
     },
     'rackreservation': {
         'queryset': RackReservation.objects.prefetch_related('rack', 'user'),
         'filterset': dcim.filtersets.RackReservationFilterSet,
         'table': dcim.tables.RackReservationTable,
         'url': 'dcim:rackreservation_list',
+        'fields': (('description', 500),),
     },
     'location': {
         'queryset': Location.objects.add_related_count(
@@ -84,6 +93,7 @@ DCIM_TYPES = {
         'filterset': dcim.filtersets.LocationFilterSet,
         'table': dcim.tables.LocationTable,
         'url': 'dcim:location_list',
+        'fields': (('name', 100), ('description', 500)),
     },
     'devicetype': {
         'queryset': DeviceType.objects.prefetch_related('manufacturer').annotate(
@@ -92,6 +102,7 @@ DCIM_TYPES = {
         'filterset': dcim.filtersets.DeviceTypeFilterSet,
         'table': dcim.tables.DeviceTypeTable,
         'url': 'dcim:devicetype_list',
+        'fields': (('model', 100), ('part_number', 200), ('comments', 5000)),
     },
     'device': {
         'queryset': Device.objects.prefetch_related(
@@ -101,6 +112,7 @@ DCIM_TYPES = {
         'filterset': dcim.filtersets.DeviceFilterSet,
         'table': dcim.tables.DeviceTable,
         'url': 'dcim:device_list',
+        'fields': (('name', 100), ('serial', 200), ('asset_tag', 200), ('comments', 5000)),
     },
     'moduletype': {
         'queryset': ModuleType.objects.prefetch_related('manufacturer').annotate(
@@ -109,6 +121,7 @@ DCIM_TYPES = {
         'filterset': dcim.filtersets.ModuleTypeFilterSet,
         'table': dcim.tables.ModuleTypeTable,
         'url': 'dcim:moduletype_list',
+        'fields': (('model', 100), ('part_number', 200), ('comments', 5000)),
     },
     'module': {
         'queryset': Module.objects.prefetch_related(
@@ -117,6 +130,7 @@ DCIM_TYPES = {
         'filterset': dcim.filtersets.ModuleFilterSet,
         'table': dcim.tables.ModuleTable,
         'url': 'dcim:module_list',
+        'fields': (('serial', 200), ('asset_tag', 200), ('comments', 5000)),
     },
     'virtualchassis': {
         'queryset': VirtualChassis.objects.prefetch_related('master').annotate(
@@ -125,18 +139,21 @@ DCIM_TYPES = {
         'filterset': dcim.filtersets.VirtualChassisFilterSet,
         'table': dcim.tables.VirtualChassisTable,
         'url': 'dcim:virtualchassis_list',
+        'fields': (('name', 100), ('domain', 200)),
     },
     'cable': {
         'queryset': Cable.objects.all(),
         'filterset': dcim.filtersets.CableFilterSet,
         'table': dcim.tables.CableTable,
         'url': 'dcim:cable_list',
+        'fields': (('label', 100),),
     },
     'powerfeed': {
         'queryset': PowerFeed.objects.all(),
         'filterset': dcim.filtersets.PowerFeedFilterSet,
         'table': dcim.tables.PowerFeedTable,
         'url': 'dcim:powerfeed_list',
+        'fields': (('name', 100), ('comments', 5000)),
     },
 }
 
@@ -146,42 +163,51 @@ IPAM_TYPES = {
         'filterset': ipam.filtersets.VRFFilterSet,
         'table': ipam.tables.VRFTable,
         'url': 'ipam:vrf_list',
+        'fields': (('name', 100), ('rd', 200), ('description', 500)),
     },
     'aggregate': {
-        'queryset': Aggregate.objects.prefetch_related('rir'),
+        'queryset': Aggregate.objects.prefetch_related('rir').annotate_utilization(),
         'filterset': ipam.filtersets.AggregateFilterSet,
         'table': ipam.tables.AggregateTable,
         'url': 'ipam:aggregate_list',
+        'fields': (('prefix', 100), ('description', 500)),
     },
     'prefix': {
-        'queryset': Prefix.objects.prefetch_related('site', 'vrf__tenant', 'tenant', 'tenant__group', 'vlan', 'role'),
+        'queryset': Prefix.objects.prefetch_related(
+            'site', 'vrf__tenant', 'tenant', 'tenant__group', 'vlan', 'role'
+        ).annotate_utilization(),
         'filterset': ipam.filtersets.PrefixFilterSet,
         'table': ipam.tables.PrefixTable,
         'url': 'ipam:prefix_list',
+        'fields': (('prefix', 100), ('description', 500)),
     },
     'ipaddress': {
         'queryset': IPAddress.objects.prefetch_related('vrf__tenant', 'tenant', 'tenant__group'),
         'filterset': ipam.filtersets.IPAddressFilterSet,
         'table': ipam.tables.IPAddressTable,
         'url': 'ipam:ipaddress_list',
+        'fields': (('address', 100), ('dns_name', 200), ('description', 500)),
     },
     'vlan': {
         'queryset': VLAN.objects.prefetch_related('site', 'group', 'tenant', 'tenant__group', 'role'),
         'filterset': ipam.filtersets.VLANFilterSet,
         'table': ipam.tables.VLANTable,
         'url': 'ipam:vlan_list',
+        'fields': (('name', 100), ('vid', 100), ('description', 500)),
     },
     'asn': {
         'queryset': ASN.objects.prefetch_related('rir', 'tenant', 'tenant__group'),
         'filterset': ipam.filtersets.ASNFilterSet,
         'table': ipam.tables.ASNTable,
         'url': 'ipam:asn_list',
+        'fields': (('asn', 100), ('description', 500)),
     },
     'service': {
         'queryset': Service.objects.prefetch_related('device', 'virtual_machine'),
         'filterset': ipam.filtersets.ServiceFilterSet,
         'table': ipam.tables.ServiceTable,
         'url': 'ipam:service_list',
+        'fields': (('name', 100), ('description', 500)),
     },
 }
 
@@ -191,6 +217,7 @@ TENANCY_TYPES = {
         'filterset': tenancy.filtersets.TenantFilterSet,
         'table': tenancy.tables.TenantTable,
         'url': 'tenancy:tenant_list',
+        'fields': (('name', 100), ('slug', 110), ('description', 500), ('comments', 5000)),
     },
     'contact': {
         'queryset': Contact.objects.prefetch_related('group', 'assignments').annotate(
@@ -198,6 +225,10 @@ TENANCY_TYPES = {
         'filterset': tenancy.filtersets.ContactFilterSet,
         'table': tenancy.tables.ContactTable,
         'url': 'tenancy:contact_list',
+        'fields': (
+            ('name', 100), ('title', 300), ('phone', 300), ('email', 300), ('address', 1000), ('link', 1000),
+            ('comments', 5000),
+        ),
     },
 }
 
@@ -210,6 +241,7 @@ VIRTUALIZATION_TYPES = {
         'filterset': virtualization.filtersets.ClusterFilterSet,
         'table': virtualization.tables.ClusterTable,
         'url': 'virtualization:cluster_list',
+        'fields': (('name', 100), ('comments', 5000)),
     },
     'virtualmachine': {
         'queryset': VirtualMachine.objects.prefetch_related(
@@ -218,6 +250,7 @@ VIRTUALIZATION_TYPES = {
         'filterset': virtualization.filtersets.VirtualMachineFilterSet,
         'table': virtualization.tables.VirtualMachineTable,
         'url': 'virtualization:virtualmachine_list',
+        'fields': (('name', 100), ('comments', 5000)),
     },
 }
 
@@ -229,12 +262,14 @@ WIRELESS_TYPES = {
         'filterset': wireless.filtersets.WirelessLANFilterSet,
         'table': wireless.tables.WirelessLANTable,
         'url': 'wireless:wirelesslan_list',
+        'fields': (('ssid', 100), ('description', 500)),
     },
     'wirelesslink': {
         'queryset': WirelessLink.objects.prefetch_related('interface_a__device', 'interface_b__device'),
         'filterset': wireless.filtersets.WirelessLinkFilterSet,
         'table': wireless.tables.WirelessLinkTable,
         'url': 'wireless:wirelesslink_list',
+        'fields': (('ssid', 100), ('description', 500)),
     },
 }
 
@@ -0,0 +1,74 @@
+import hashlib
+import time
+
+from django.core.cache import cache
+from django_rq import get_queue
+
+from netbox.config import get_config
+
+__all__ = (
+    'get_counts',
+    'refresh_counts',
+)
+
+# The length of time (in seconds) for which a count is retained in the cache, regardless of its staleness
+COUNT_CACHE_TTL = 86400
+
+
+def get_cache_key(queryset):
+    """
+    Return the cache key for the count of a queryset. The key is derived from the queryset's SQL and parameters, so
+    querysets restricted by identical permission constraints share a key, whereas those restricted differently (e.g.
+    for different users with object-level constraints) do not.
+    """
+    sql, params = queryset.query.sql_with_params()
+    fingerprint = hashlib.sha256(f'{sql}{params!r}'.encode()).hexdigest()
+
+    return f'count_{queryset.model._meta.label_lower}_{fingerprint}'
+
+
+def get_counts(querysets):
+    """
+    Return the number of objects in each of the given querysets, using cached values where available.
+
+    A count which was cached more than HOMEPAGE_STATS_CACHE_TIMEOUT seconds ago is still returned, but a background
+    job is enqueued to refresh it. Counts which are not cached are computed immediately. If the timeout is zero,
+    caching is disabled.
+    """
+    timeout = get_config().HOMEPAGE_STATS_CACHE_TIMEOUT
+    if not timeout:
+        return [queryset.count() for queryset in querysets]
+
+    keys = [get_cache_key(queryset) for queryset in querysets]
+    cached = cache.get_many(keys)
+    now = time.time()
+    counts = []
+    missing = {}
+    stale = []
+
+    for key, queryset in zip(keys, querysets):
+        if key in cached:
+            count, timestamp = cached[key]
+            # Ensure that only one refresh is enqueued for each stale count
+            if now - timestamp > timeout and cache.add(f'{key}_refresh', True, timeout):
+                stale.append((key, queryset.query))
+        else:
+            count = queryset.count()
+            missing[key] = (count, now)
+        counts.append(count)
+
+    if missing:
+        cache.set_many(missing, COUNT_CACHE_TTL)
+    if stale:
+        get_queue('default').enqueue('netbox.stats.refresh_counts', stale)
+
+    return counts
+
+
+def refresh_counts(queries):
+    """
+    Recompute and cache the count for each of the given (cache key, query) pairs.
+    """
+    for key, query in queries:
+        cache.set(key, (query.get_count(using='default'), time.time()), COUNT_CACHE_TTL)
+        cache.delete(f'{key}_refresh')
@@ -7,6 +7,7 @@ from django.contrib.auth.models import AnonymousUser
 from django.db.models import DateField, DateTimeField
 from django.template import Context, Template
 from django.urls import reverse
+from django.utils.functional import cached_property
 from django.utils.html import escape
 from django.utils.formats import date_format
 from django.utils.safestring import mark_safe
@@ -101,8 +102,26 @@ class TemplateColumn(tables.TemplateColumn):
         super().__init__(**kwargs)
         self.export_raw = export_raw
 
-    def render(self, *args, **kwargs):
-        ret = super().render(*args, **kwargs)
+    @cached_property
+    def template(self):
+        return Template(self.template_code)
+
+    def render(self, record, table, value, bound_column, **kwargs):
+        # Reuse the compiled template for each row, rather than compiling the template code for every cell
+        if self.template_code:
+            context = getattr(table, 'context', Context())
+            additional_context = {
+                'default': bound_column.default,
+                'column': bound_column,
+                'record': record,
+                'value': value,
+                'row_counter': kwargs['bound_row'].row_counter,
+                **self.extra_context,
+            }
+            with context.update(additional_context):
+                ret = self.template.render(context)
+        else:
+            ret = super().render(record, table, value, bound_column, **kwargs)
         if not ret.strip():
             return self.PLACEHOLDER
         return ret
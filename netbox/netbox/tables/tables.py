@@ -4,12 +4,16 @@ from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
 from django.core.exceptions import FieldDoesNotExist
 from django.db.models.fields.related import RelatedField
+from django.utils.encoding import force_str
 from django_tables2.data import TableQuerysetData
+from django_tables2.rows import BoundRow
+from django_tables2.utils import Accessor
 
 from extras.models import CustomField, CustomLink
 from extras.choices import CustomFieldVisibilityChoices
 from netbox.tables import columns
 from utilities.paginator import EnhancedPaginator, get_paginate_count
+from utilities.querysets import chunked_iterator
 
 __all__ = (
     'BaseTable',
@@ -100,6 +104,52 @@ class BaseTable(tables.Table):
                         prefetch_fields.append('__'.join(prefetch_path))
             self.data.data = self.data.data.prefetch_related(*prefetch_fields)
 
+    def as_values(self, exclude_columns=None):
+        """
+        Return a row iterator of the table's data for export, where the first row holds the column headers. This
+        extends the stock implementation to retrieve objects from the database in chunks (rather than caching the
+        entire QuerySet), and to read the values of plain columns directly from each object.
+        """
+        exclude_columns = exclude_columns or ()
+        columns = [
+            column for column in self.columns.iterall()
+            if not (column.column.exclude_from_export or column.name in exclude_columns)
+        ]
+        yield [force_str(column.header, strings_only=True) for column in columns]
+
+        # Plain columns have no custom rendering logic and do not represent a field with choices. Their values can be
+        # resolved directly from each object, rather than by way of a BoundRow.
+        plain_columns = {
+            column.name: Accessor(column.accessor) for column in columns if self._is_plain_column(column)
+        }
+
+        if isinstance(self.data, TableQuerysetData):
+            records = chunked_iterator(self.data.data)
+        else:
+            records = self.data
+
+        for record in records:
+            row = BoundRow(record, table=self)
+            values = []
+            for column in columns:
+                if column.name in plain_columns:
+                    try:
+                        value = plain_columns[column.name].resolve(record)
+                    except Exception:
+                        value = None
+                    if value in column.column.empty_values:
+                        value = None
+                else:
+                    value = row.get_cell_value(column.name)
+                values.append(force_str(value, strings_only=True))
+            yield values
+
+    def _is_plain_column(self, bound_column):
+        if type(bound_column.column) is not tables.Column or bound_column.value != bound_column.column.value:
+            return False
+        field = Accessor(bound_column.accessor).get_field(self._meta.model)
+        return not getattr(field, 'choices', None)
+
     def _get_columns(self, visible=True):
         columns = []
         for name, column in self.columns.items():
@@ -0,0 +1,88 @@
+from django.contrib.auth.models import Group, User
+from django.contrib.contenttypes.models import ContentType
+from django.test import Client, override_settings
+from django.urls import reverse
+from netaddr import IPNetwork
+from rest_framework.test import APIClient
+
+from dcim.models import Site
+from ipam.models import IPAddress
+from netbox.authentication import invalidate_object_permission_cache
+from users.models import ObjectPermission, Token
+from utilities.testing import BenchmarkTestCase
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class HomeViewBenchmark(BenchmarkTestCase):
+    """
+    Compare loading the home page with and without cached object counts.
+    """
+    OBJECTS = 50000
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_superuser(username='testuser')
+        Site.objects.bulk_create([Site(name=f'Site {i}', slug=f'site-{i}') for i in range(cls.OBJECTS)])
+        network = IPNetwork('10.0.0.0/8')
+        IPAddress.objects.bulk_create([
+            IPAddress(address=IPNetwork(f'{network[i]}/8')) for i in range(1, cls.OBJECTS + 1)
+        ])
+
+    def test_home(self):
+        client = Client()
+        client.force_login(self.user)
+        url = reverse('home')
+
+        with override_settings(HOMEPAGE_STATS_CACHE_TIMEOUT=0):
+            self.benchmark('Home page (uncached counts)', client.get, url)
+        self.benchmark('Home page (populating cache)', client.get, url)
+        response = self.benchmark('Home page (cached counts)', client.get, url)
+        self.assertEqual(response.status_code, 200)
+
+
+@override_settings(
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}},
+    EXEMPT_VIEW_PERMISSIONS=[]
+)
+class ObjectPermissionBenchmark(BenchmarkTestCase):
+    """
+    Compare a series of small token-authenticated REST API requests with and without cached object permissions.
+    """
+    REQUESTS = 100
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='testuser')
+        cls.token = Token.objects.create(user=cls.user)
+        Site.objects.bulk_create([Site(name=f'Site {i}', slug=f'site-{i}') for i in range(10)])
+
+        # Grant permissions both directly and by way of several groups
+        groups = [Group.objects.create(name=f'Group {i}') for i in range(5)]
+        cls.user.groups.set(groups)
+        object_types = ContentType.objects.filter(app_label__in=('circuits', 'dcim', 'ipam', 'tenancy'))
+        for i in range(20):
+            obj_perm = ObjectPermission.objects.create(
+                name=f'Permission {i}',
+                actions=['view', 'add', 'change'],
+                constraints={'name__startswith': 'Site'}
+            )
+            obj_perm.object_types.set(object_types)
+            obj_perm.groups.add(groups[i % len(groups)])
+            obj_perm.users.add(cls.user)
+
+    def test_api_requests(self):
+        client = APIClient()
+        url = reverse('dcim-api:site-list')
+        header = {'HTTP_AUTHORIZATION': f'Token {self.token.key}'}
+
+        def get_sites(invalidate):
+            for _ in range(self.REQUESTS):
+                if invalidate:
+                    invalidate_object_permission_cache()
+                response = client.get(f'{url}?brief=1&limit=1', **header)
+            return response
+
+        self.benchmark(f'{self.REQUESTS} API requests (uncached permissions)', get_sites, True)
+        response = self.benchmark(f'{self.REQUESTS} API requests (cached permissions)', get_sites, False)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['count'], 10)
@@ -1,5 +1,26 @@
+import gzip
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from unittest.mock import patch
+from urllib.parse import unquote
+
+from django.contrib.auth.models import User
+from django.contrib.contenttypes.models import ContentType
+from django.db.models import F
+from django.test import override_settings
 from django.urls import reverse
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
 
+from dcim.api.views import SiteViewSet
+from dcim.models import Site
+from extras.choices import JobResultStatusChoices, ObjectChangeActionChoices
+from extras.exports import delete_export
+from extras.models import ExportTemplate, JobResult, ObjectChange
+from ipam.models import Prefix, VRF
+from netbox.api.pagination import OptionalLimitOffsetPagination
+from netbox.api.viewsets import NetBoxModelViewSet
+from users.models import ObjectPermission, Token
 from utilities.testing import APITestCase
 
 
@@ -16,3 +37,206 @@ class AppTest(APITestCase):
         response = self.client.get('{}?format=api'.format(url), **self.header)
 
         self.assertEqual(response.status_code, 200)
+
+
+class BulkOperationTest(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        Site.objects.bulk_create([
+            Site(name=f'Site {i}', slug=f'site-{i}', status='active') for i in range(1, 4)
+        ])
+
+    def add_object_permission(self, action, constraints=None):
+        obj_perm = ObjectPermission(name='Test permission', actions=[action], constraints=constraints)
+        obj_perm.save()
+        obj_perm.users.add(self.user)
+        obj_perm.object_types.add(ContentType.objects.get_for_model(Site))
+
+    def test_bulk_update(self):
+        self.add_object_permission('change')
+        data = [{'id': pk, 'description': 'New description'} for pk in Site.objects.values_list('pk', flat=True)]
+
+        response = self.client.patch(reverse('dcim-api:site-list'), data, format='json', **self.header)
+        self.assertHttpStatus(response, 200)
+        self.assertEqual([site['description'] for site in response.data], ['New description'] * 3)
+        self.assertEqual(Site.objects.filter(description='New description').count(), 3)
+
+        # Each object's change has been logged, including its pre-change data
+        objectchanges = ObjectChange.objects.filter(action=ObjectChangeActionChoices.ACTION_UPDATE)
+        self.assertEqual(objectchanges.count(), 3)
+        for objectchange in objectchanges:
+            self.assertEqual(objectchange.prechange_data['description'], '')
+            self.assertEqual(objectchange.postchange_data['description'], 'New description')
+
+    def test_bulk_update_violating_constraints(self):
+        self.add_object_permission('change', {'status': 'active'})
+        data = [{'id': pk, 'status': 'planned'} for pk in Site.objects.values_list('pk', flat=True)]
+
+        response = self.client.patch(reverse('dcim-api:site-list'), data, format='json', **self.header)
+        self.assertHttpStatus(response, 403)
+        self.assertFalse(Site.objects.filter(status='planned').exists())
+        self.assertFalse(ObjectChange.objects.exists())
+
+    def test_bulk_delete(self):
+        self.add_object_permission('delete', {'name__in': ['Site 1', 'Site 2']})
+        data = [{'id': pk} for pk in Site.objects.values_list('pk', flat=True)]
+
+        response = self.client.delete(reverse('dcim-api:site-list'), data, format='json', **self.header)
+        self.assertHttpStatus(response, 204)
+
+        # Only objects permitted by the user's constraints have been deleted
+        self.assertEqual(list(Site.objects.values_list('name', flat=True)), ['Site 3'])
+        self.assertEqual(
+            sorted(ObjectChange.objects.values_list('action', 'object_repr')),
+            [(ObjectChangeActionChoices.ACTION_DELETE, 'Site 1'), (ObjectChangeActionChoices.ACTION_DELETE, 'Site 2')]
+        )
+
+    def test_bulk_operations_call_custom_hooks(self):
+        """
+        A view's customized perform_update() and perform_destroy() should be called for each object.
+        """
+        self.add_object_permission('change')
+        self.add_object_permission('delete')
+        url = reverse('dcim-api:site-list')
+
+        with patch.object(
+            SiteViewSet, 'perform_update', autospec=True, side_effect=NetBoxModelViewSet.perform_update
+        ) as perform_update:
+            data = [{'id': pk, 'description': 'New description'} for pk in Site.objects.values_list('pk', flat=True)]
+            response = self.client.patch(url, data, format='json', **self.header)
+        self.assertHttpStatus(response, 200)
+        self.assertEqual(perform_update.call_count, 3)
+        self.assertEqual([site['description'] for site in response.data], ['New description'] * 3)
+
+        with patch.object(
+            SiteViewSet, 'perform_destroy', autospec=True, side_effect=NetBoxModelViewSet.perform_destroy
+        ) as perform_destroy:
+            data = [{'id': pk} for pk in Site.objects.values_list('pk', flat=True)]
+            response = self.client.delete(url, data, format='json', **self.header)
+        self.assertHttpStatus(response, 204)
+        self.assertEqual(perform_destroy.call_count, 3)
+        self.assertFalse(Site.objects.exists())
+
+
+class CursorPaginationTest(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        vrfs = (
+            VRF.objects.create(name='VRF 1'),
+            VRF.objects.create(name='VRF 2'),
+        )
+        for vrf in (None, *vrfs):
+            Prefix.objects.bulk_create([
+                Prefix(prefix=prefix, vrf=vrf) for prefix in ('10.0.2.0/24', '10.0.1.0/24', '10.0.1.0/24')
+            ])
+
+    def get_all_pages(self, url):
+        pks = []
+        while url:
+            response = self.client.get(url, **self.header)
+            self.assertHttpStatus(response, 200)
+            self.assertIsNone(response.data['previous'])
+            pks.extend(result['id'] for result in response.data['results'])
+            url = response.data['next']
+        return pks
+
+    @override_settings(EXEMPT_VIEW_PERMISSIONS=['*'])
+    def test_pagination(self):
+        url = reverse('ipam-api:prefix-list')
+        expected = Prefix.objects.order_by(F('vrf_id').asc(nulls_first=True), 'prefix', 'pk')
+
+        self.assertEqual(self.get_all_pages(f'{url}?cursor=&limit=2'), list(expected.values_list('pk', flat=True)))
+
+    def test_pagination_descending(self):
+        queryset = Prefix.objects.order_by(F('vrf').desc(), '-prefix', 'pk')
+        pks = []
+        cursor = ''
+
+        # Nulls are ordered first when descending
+        while cursor is not None:
+            paginator = OptionalLimitOffsetPagination()
+            request = Request(APIRequestFactory().get('/', {'cursor': cursor, 'limit': 2}))
+            pks.extend(prefix.pk for prefix in paginator.paginate_queryset(queryset, request))
+            cursor = paginator.next_cursor
+
+        self.assertEqual(pks, list(queryset.values_list('pk', flat=True)))
+
+    @override_settings(EXEMPT_VIEW_PERMISSIONS=['*'])
+    def test_pagination_with_filter(self):
+        vrf = VRF.objects.get(name='VRF 2')
+        url = f"{reverse('ipam-api:prefix-list')}?cursor=&limit=1&vrf_id={vrf.pk}"
+
+        self.assertEqual(
+            self.get_all_pages(url),
+            list(Prefix.objects.filter(vrf=vrf).order_by('prefix', 'pk').values_list('pk', flat=True))
+        )
+
+    @override_settings(EXEMPT_VIEW_PERMISSIONS=['*'])
+    def test_count(self):
+        url = reverse('ipam-api:prefix-list')
+
+        response = self.client.get(f'{url}?cursor=&limit=2', **self.header)
+        self.assertIsNone(response.data['count'])
+        response = self.client.get(f'{url}?cursor=&limit=2&count=true', **self.header)
+        self.assertEqual(response.data['count'], 9)
+
+    @override_settings(EXEMPT_VIEW_PERMISSIONS=['*'])
+    def test_invalid_cursor(self):
+        url = reverse('ipam-api:prefix-list')
+
+        self.assertHttpStatus(self.client.get(f'{url}?cursor=invalid', **self.header), 404)
+        self.assertHttpStatus(self.client.get(f'{url}?cursor=WzFd', **self.header), 404)
+
+    @override_settings(EXEMPT_VIEW_PERMISSIONS=['*'])
+    def test_invalid_cursor_values(self):
+        url = reverse('ipam-api:prefix-list')
+        cursor = self.client.get(f'{url}?cursor=&limit=1', **self.header).data['next'].split('cursor=')[1]
+        values = json.loads(urlsafe_b64decode(unquote(cursor).split('&')[0].encode()))
+
+        # Replace the last value (the primary key) with values which are not scalars, or not valid for the column
+        for value in ([1, 2], {'pk': 1}, 'foo'):
+            cursor = urlsafe_b64encode(json.dumps([*values[:-1], value]).encode()).decode()
+            self.assertHttpStatus(self.client.get(f'{url}?cursor={cursor}', **self.header), 404)
+
+
+class BackgroundExportTest(APITestCase):
+
+    @override_settings(EXEMPT_VIEW_PERMISSIONS=['*'])
+    def test_export_template_in_background(self):
+        Site.objects.create(name='Site 1', slug='site-1')
+        ExportTemplate.objects.create(
+            content_type=ContentType.objects.get_for_model(Site),
+            name='Site names',
+            template_code='{% for site in queryset %}{{ site.name }}\n{% endfor %}'
+        )
+        url = f"{reverse('dcim-api:site-list')}?export=Site names&background=true"
+
+        with patch('extras.models.models.django_rq.get_queue') as mock_get_queue:
+            response = self.client.get(url, **self.header)
+        self.assertHttpStatus(response, 202)
+        self.assertEqual(response.data['id'], JobResult.objects.get().pk)
+        self.assertEqual(response.data['status']['value'], JobResultStatusChoices.STATUS_PENDING)
+
+        # Run the enqueued job
+        enqueue = mock_get_queue.return_value.enqueue
+        enqueue.assert_called_once()
+        enqueue.call_args.args[0](**{k: v for k, v in enqueue.call_args.kwargs.items() if k != 'job_id'})
+        job_result = JobResult.objects.get()
+        self.addCleanup(delete_export, job_result)
+        self.assertEqual(job_result.status, JobResultStatusChoices.STATUS_COMPLETED)
+
+        # The exported file can be downloaded via the REST API by the user who requested the export
+        url = reverse('extras-api:jobresult-download', kwargs={'pk': job_result.pk})
+        self.assertEqual(job_result.data['url'], url)
+        response = self.client.get(url, **self.header)
+        self.assertHttpStatus(response, 200)
+        self.assertEqual(gzip.decompress(b''.join(response.streaming_content)), b'Site 1\n')
+
+        # Other (non-superuser) users cannot download the export
+        token = Token.objects.create(user=User.objects.create_user(username='User 2'))
+        response = self.client.get(url, HTTP_AUTHORIZATION=f'Token {token.key}')
+        self.assertHttpStatus(response, 404)
+        response = self.client.get(url)
+        self.assertHttpStatus(response, 404)
@@ -11,6 +11,7 @@ from rest_framework.test import APIClient
 
 from dcim.models import Site
 from ipam.models import Prefix
+from netbox.authentication import ObjectPermissionBackend
 from users.models import ObjectPermission, Token
 from utilities.testing import TestCase
 from utilities.testing.api import APITestCase
@@ -524,3 +525,76 @@ class ObjectPermissionAPIViewTestCase(TestCase):
                       kwargs={'pk': self.prefixes[0].pk})
         response = self.client.delete(url, format='json', **self.header)
         self.assertEqual(response.status_code, 204)
+
+
+# Isolate the cache from other test processes, which may invalidate cached permissions at any time
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class ObjectPermissionCacheTestCase(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.group = Group.objects.create(name='Group 1')
+        cls.obj_perm = ObjectPermission.objects.create(
+            name='Test permission',
+            constraints={'name': 'Site 1'},
+            actions=['view']
+        )
+        cls.obj_perm.object_types.add(ContentType.objects.get_for_model(Site))
+        cls.obj_perm.groups.add(cls.group)
+
+    def get_all_permissions(self):
+        # Retrieve a fresh instance of the user, as for a new request
+        return ObjectPermissionBackend().get_all_permissions(User.objects.get(pk=self.user.pk))
+
+    def test_permissions_cached(self):
+        self.user.groups.add(self.group)
+        self.get_all_permissions()
+
+        with self.assertNumQueries(0):
+            permissions = ObjectPermissionBackend().get_all_permissions(self.user)
+        self.assertEqual(permissions, {'dcim.view_site': [{'name': 'Site 1'}]})
+
+    def test_filters_cached(self):
+        self.user.groups.add(self.group)
+        user = User.objects.get(pk=self.user.pk)
+        self.assertEqual(Site.objects.restrict(user, 'view').count(), 0)
+
+        user = User.objects.get(pk=self.user.pk)
+        user.get_all_permissions()
+        self.assertIn('dcim.view_site', user._object_perm_filters)
+
+    def test_invalidate_on_group_membership_change(self):
+        self.assertNotIn('dcim.view_site', self.get_all_permissions())
+
+        self.user.groups.add(self.group)
+        self.assertIn('dcim.view_site', self.get_all_permissions())
+
+        self.group.user_set.remove(self.user)
+        self.assertNotIn('dcim.view_site', self.get_all_permissions())
+
+    def test_invalidate_on_permission_change(self):
+        self.user.groups.add(self.group)
+        self.assertEqual(self.get_all_permissions()['dcim.view_site'], [{'name': 'Site 1'}])
+
+        self.obj_perm.constraints = {'name': 'Site 2'}
+        self.obj_perm.save()
+        self.assertEqual(self.get_all_permissions()['dcim.view_site'], [{'name': 'Site 2'}])
+
+        self.obj_perm.object_types.clear()
+        self.assertNotIn('dcim.view_site', self.get_all_permissions())
+
+    def test_invalidate_on_permission_assignment(self):
+        self.assertNotIn('dcim.view_site', self.get_all_permissions())
+
+        self.obj_perm.users.add(self.user)
+        self.assertIn('dcim.view_site', self.get_all_permissions())
+
+        self.obj_perm.delete()
+        self.assertNotIn('dcim.view_site', self.get_all_permissions())
+
+    def test_invalidate_on_group_delete(self):
+        self.user.groups.add(self.group)
+        self.assertIn('dcim.view_site', self.get_all_permissions())
+
+        self.group.delete()
+        self.assertNotIn('dcim.view_site', self.get_all_permissions())
@@ -1,7 +1,17 @@
-from django.test import override_settings
+from unittest.mock import Mock
+
+from django.contrib.contenttypes.models import ContentType
+from django.test import override_settings, RequestFactory
 from django.urls import reverse
 
-from utilities.testing import disable_warnings, TestCase
+from dcim.choices import InterfaceTypeChoices
+from dcim.models import Device, Interface, Region, Site
+from extras.models import Tag
+from ipam.models import IPAddress, VRF
+from netbox.graphql.optimizer import restrict_queryset
+from netbox.graphql.schema import schema
+from users.models import ObjectPermission
+from utilities.testing import create_test_device, disable_warnings, TestCase
 
 
 class GraphQLTestCase(TestCase):
@@ -34,3 +44,142 @@ class GraphQLTestCase(TestCase):
         response = self.client.get(url, **header)
         with disable_warnings('django.request'):
             self.assertHttpStatus(response, 302)  # Redirect to login page
+
+
+class GraphQLOptimizerTestCase(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        region = Region.objects.create(name='Region 1', slug='region-1')
+        site = Site.objects.create(name='Site 1', slug='site-1', region=region)
+        site.tags.set(Tag.objects.bulk_create([
+            Tag(name='Tag 1', slug='tag-1'),
+            Tag(name='Tag 2', slug='tag-2'),
+        ]))
+        vrf = VRF.objects.create(name='VRF 1')
+
+        for i in range(1, 4):
+            device = create_test_device(f'Device {i}', site=site)
+            for j in range(1, 4):
+                interface = Interface.objects.create(
+                    device=device, name=f'Interface {j}', type=InterfaceTypeChoices.TYPE_1GE_FIXED
+                )
+                IPAddress.objects.create(
+                    address=f'10.{i}.{j}.1/24', vrf=vrf if j > 1 else None, assigned_object=interface
+                )
+
+    def execute(self, query):
+        request = RequestFactory().get(reverse('graphql'))
+        request.user = self.user
+        result = schema.execute(query, context_value=request)
+        self.assertIsNone(result.errors)
+        return result.data
+
+    @override_settings(EXEMPT_VIEW_PERMISSIONS=['*'])
+    def test_select_related(self):
+        query = """
+        {
+            device_list {
+                name
+                site { name region { name } }
+                device_type { model manufacturer { name } }
+            }
+        }
+        """
+        # Custom fields (for filtering) and devices
+        with self.assertNumQueries(2):
+            data = self.execute(query)
+
+        self.assertEqual(len(data['device_list']), 3)
+        self.assertEqual(data['device_list'][0]['site']['region']['name'], 'Region 1')
+        self.assertEqual(data['device_list'][0]['device_type']['manufacturer']['name'], 'Manufacturer 1')
+
+    @override_settings(EXEMPT_VIEW_PERMISSIONS=['*'])
+    def test_prefetch_related(self):
+        query = """
+        {
+            device_list {
+                name
+                interfaces {
+                    name
+                    ip_addresses { address vrf { name } }
+                }
+            }
+        }
+        """
+        # Custom fields, devices, interfaces, and IP addresses (with VRFs)
+        with self.assertNumQueries(4):
+            data = self.execute(query)
+
+        interfaces = data['device_list'][0]['interfaces']
+        self.assertEqual(len(interfaces), 3)
+        self.assertEqual(interfaces[0]['ip_addresses'], [{'address': '10.1.1.1/24', 'vrf': None}])
+        self.assertEqual(interfaces[1]['ip_addresses'], [{'address': '10.1.2.1/24', 'vrf': {'name': 'VRF 1'}}])
+
+    @override_settings(EXEMPT_VIEW_PERMISSIONS=['*'])
+    def test_fragments_and_aliases(self):
+        query = """
+        query {
+            site_list { ...SiteFields }
+            site(id: %d) { all_tags: tags { name } ...SiteFields }
+        }
+        fragment SiteFields on SiteType {
+            name
+            tags { slug }
+            devices { ... on DeviceType { name } }
+        }
+        """ % Site.objects.get().pk
+        # Custom fields, and sites, tags, and devices for each of the two fields
+        with self.assertNumQueries(7):
+            data = self.execute(query)
+
+        self.assertEqual(data['site']['all_tags'], [{'name': 'Tag 1'}, {'name': 'Tag 2'}])
+        self.assertEqual(data['site']['tags'], [{'slug': 'tag-1'}, {'slug': 'tag-2'}])
+        self.assertEqual(len(data['site_list'][0]['devices']), 3)
+
+    def test_prefetch_restricted(self):
+        """
+        Prefetched objects should be restricted to those which the user is permitted to view.
+        """
+        for model, constraints in (
+            (Device, None),
+            (Interface, {'name__in': ['Interface 1', 'Interface 2']}),
+            (IPAddress, {'vrf__isnull': False}),
+        ):
+            obj_perm = ObjectPermission(name=model._meta.model_name, actions=['view'], constraints=constraints)
+            obj_perm.save()
+            obj_perm.users.add(self.user)
+            obj_perm.object_types.add(ContentType.objects.get_for_model(model))
+
+        query = """
+        {
+            device_list {
+                name
+                interfaces { name ip_addresses { address } }
+            }
+        }
+        """
+        # Permissions, custom fields, devices, interfaces, and IP addresses
+        with self.assertNumQueries(8):
+            data = self.execute(query)
+
+        for device in data['device_list']:
+            self.assertEqual([interface['name'] for interface in device['interfaces']], ['Interface 1', 'Interface 2'])
+            self.assertEqual(device['interfaces'][0]['ip_addresses'], [])
+            self.assertEqual(len(device['interfaces'][1]['ip_addresses']), 1)
+
+    def test_restrict_prefetched_by_others(self):
+        """
+        Related objects which have been prefetched other than by the optimizer should still be restricted.
+        """
+        obj_perm = ObjectPermission(name='Interface 1', actions=['view'], constraints={'name': 'Interface 1'})
+        obj_perm.save()
+        obj_perm.users.add(self.user)
+        obj_perm.object_types.add(ContentType.objects.get_for_model(Interface))
+        request = RequestFactory().get(reverse('graphql'))
+        request.user = self.user
+        info = Mock(context=request)
+
+        device = Device.objects.prefetch_related('interfaces').first()
+        interfaces = restrict_queryset(device.interfaces.all(), info)
+        self.assertEqual([interface.name for interface in interfaces], ['Interface 1'])
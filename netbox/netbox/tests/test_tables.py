@@ -1,7 +1,9 @@
+import django_tables2 as tables
 from django.template import Context, Template
 from django.test import TestCase
 
-from dcim.models import Site
+from dcim.models import Region, Site
+from dcim.tables import SiteTable
 from netbox.tables import NetBoxTable, columns
 from utilities.testing import create_tags
 
@@ -35,3 +37,31 @@ class TagColumnTest(TestCase):
             'table': table
         })
         template.render(context)
+
+
+class TableExportTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        tags = create_tags('Alpha', 'Bravo')
+        region = Region.objects.create(name='Region 1', slug='region-1')
+
+        sites = [
+            Site(name=f'Site {i}', slug=f'site-{i}', region=region if i % 2 else None, description='A, "B"')
+            for i in range(1, 6)
+        ]
+        Site.objects.bulk_create(sites)
+        for site in sites:
+            site.tags.add(*tags)
+
+    def test_as_values(self):
+        """
+        BaseTable.as_values() should return the same values as the stock implementation for all columns.
+        """
+        table = SiteTable(Site.objects.all())
+        for column in table.columns:
+            table.columns.show(column.name)
+        exclude_columns = ('pk', 'actions')
+        values = list(tables.Table.as_values(table, exclude_columns=exclude_columns))
+
+        self.assertEqual(list(table.as_values(exclude_columns=exclude_columns)), values)
@@ -1,8 +1,25 @@
+import gzip
+import time
 import urllib.parse
+from unittest.mock import patch
 
-from utilities.testing import TestCase
+from django.contrib.auth.models import User
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
 from django.urls import reverse
 
+from dcim.choices import InterfaceTypeChoices
+from dcim.models import Interface, Site
+from extras.choices import JobResultStatusChoices
+from extras.exports import delete_export, get_export_path, get_export_storage
+from extras.models import ExportTemplate, JobResult
+from netbox.views.generic import bulk_views
+from netbox.stats import get_cache_key, get_counts, refresh_counts
+from users.models import ObjectPermission
+from utilities.testing import create_test_device, TestCase
+
 
 class HomeViewTestCase(TestCase):
 
@@ -22,3 +39,246 @@ class HomeViewTestCase(TestCase):
 
         response = self.client.get('{}?{}'.format(url, urllib.parse.urlencode(params)))
         self.assertHttpStatus(response, 200)
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class HomeViewStatsTestCase(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        sites = (
+            Site(name='Site 1', slug='site-1'),
+            Site(name='Site 2', slug='site-2'),
+            Site(name='Site 3', slug='site-3'),
+        )
+        Site.objects.bulk_create(sites)
+
+    def get_site_count(self):
+        response = self.client.get(reverse('home'))
+        self.assertHttpStatus(response, 200)
+        for section_label, items, icon_class in response.context['stats']:
+            for item in items:
+                if item['label'] == 'Sites':
+                    return item['count']
+
+    def test_counts_cached(self):
+        self.add_permissions('dcim.view_site')
+        self.assertEqual(self.get_site_count(), 3)
+
+        # The cached count is returned until it becomes stale
+        Site.objects.create(name='Site 4', slug='site-4')
+        self.assertEqual(self.get_site_count(), 3)
+
+    @override_settings(HOMEPAGE_STATS_CACHE_TIMEOUT=0)
+    def test_counts_not_cached(self):
+        self.add_permissions('dcim.view_site')
+        self.assertEqual(self.get_site_count(), 3)
+
+        Site.objects.create(name='Site 4', slug='site-4')
+        self.assertEqual(self.get_site_count(), 4)
+
+    def test_counts_cached_per_constraint(self):
+        self.assertEqual(self.get_site_count(), None)
+
+        obj_perm = ObjectPermission(
+            name='Test permission',
+            constraints={'pk': Site.objects.first().pk},
+            actions=['view']
+        )
+        obj_perm.save()
+        obj_perm.users.add(self.user)
+        obj_perm.object_types.add(ContentType.objects.get_for_model(Site))
+        self.assertEqual(self.get_site_count(), 1)
+
+        # Removing the constraint yields a count for the unconstrained queryset
+        obj_perm.constraints = None
+        obj_perm.save()
+        self.assertEqual(self.get_site_count(), 3)
+
+    def test_stale_count_refreshed(self):
+        queryset = Site.objects.all()
+        key = get_cache_key(queryset)
+        cache.set(key, (1, time.time() - 3600))
+
+        # The stale count is returned, and a refresh is enqueued (once)
+        with patch('netbox.stats.get_queue') as mock_get_queue:
+            self.assertEqual(get_counts([queryset]), [1])
+            self.assertEqual(get_counts([queryset]), [1])
+        enqueue = mock_get_queue.return_value.enqueue
+        enqueue.assert_called_once_with('netbox.stats.refresh_counts', [(key, queryset.query)])
+
+        refresh_counts(*enqueue.call_args.args[1:])
+        self.assertEqual(get_counts([queryset]), [3])
+        self.assertIsNone(cache.get(f'{key}_refresh'))
+
+
+@override_settings(EXEMPT_VIEW_PERMISSIONS=['*'])
+class BulkImportTestCase(TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.add_permissions('dcim.add_site')
+
+    def test_import_in_batches(self):
+        csv_data = 'name,slug,status\n' + '\n'.join(f'Site {i},site-{i},active' for i in range(1, 6))
+
+        with patch.object(bulk_views, 'IMPORT_BATCH_SIZE', 2):
+            response = self.client.post(reverse('dcim:site_import'), {'csv': csv_data})
+        self.assertHttpStatus(response, 200)
+        self.assertEqual(Site.objects.count(), 5)
+
+    def test_import_errors_per_row(self):
+        csv_data = 'name,slug,status\nSite 1,site-1,active\nSite 2,site-2,foo\nSite 3,site-3,bar'
+
+        response = self.client.post(reverse('dcim:site_import'), {'csv': csv_data})
+        self.assertHttpStatus(response, 200)
+        errors = response.context['form'].errors['csv']
+        self.assertEqual(len(errors), 2)
+        self.assertTrue(errors[0].startswith('Row 2 status:'))
+        self.assertTrue(errors[1].startswith('Row 3 status:'))
+        self.assertFalse(Site.objects.exists())
+
+    def test_import_conflicting_rows(self):
+        csv_data = 'name,slug,status\nSite 1,site-1,active\nSite 1,site-2,active'
+
+        response = self.client.post(reverse('dcim:site_import'), {'csv': csv_data})
+        self.assertHttpStatus(response, 200)
+        errors = response.context['form'].errors['csv']
+        self.assertEqual(len(errors), 1)
+        self.assertTrue(errors[0].startswith('Row 2 name:'))
+        self.assertFalse(Site.objects.exists())
+
+    def test_import_duplicate_rows(self):
+        self.add_permissions('dcim.add_interface')
+        device = create_test_device('Device 1')
+        Interface.objects.create(device=device, name='Interface 1', type=InterfaceTypeChoices.TYPE_1GE_FIXED)
+        csv_data = 'device,name,type\nDevice 1,Interface 2,1000base-t\nDevice 1,Interface 2,1000base-t\n' \
+                   'Device 1,Interface 1,1000base-t'
+
+        response = self.client.post(reverse('dcim:interface_import'), {'csv': csv_data})
+        self.assertHttpStatus(response, 200)
+        errors = response.context['form'].errors['csv']
+        self.assertEqual(len(errors), 2)
+        self.assertTrue(errors[0].startswith('Row 2 __all__:'))
+        self.assertTrue(errors[1].startswith('Row 3 __all__:'))
+        self.assertEqual(Interface.objects.count(), 1)
+
+    @override_settings(BULK_IMPORT_BACKGROUND_THRESHOLD=2)
+    def test_import_file_in_background(self):
+        csv_file = SimpleUploadedFile(
+            'sites.csv', b'name,slug,status\nSite 1,site-1,active\nSite 2,site-2,active\nSite 3,site-3,active\n'
+        )
+
+        with patch('extras.models.models.django_rq.get_queue') as mock_get_queue:
+            response = self.client.post(reverse('dcim:site_import'), {'csv': 'name,slug,status', 'csv_file': csv_file})
+        self.assertHttpStatus(response, 302)
+        self.assertFalse(Site.objects.exists())
+
+        # Run the enqueued job
+        enqueue = mock_get_queue.return_value.enqueue
+        enqueue.assert_called_once()
+        kwargs = {k: v for k, v in enqueue.call_args.kwargs.items() if k != 'job_id'}
+        enqueue.call_args.args[0](**kwargs)
+
+        job_result = JobResult.objects.get()
+        self.assertEqual(job_result.status, JobResultStatusChoices.STATUS_COMPLETED)
+        self.assertEqual(job_result.data, {'created': 3})
+        self.assertEqual(Site.objects.count(), 3)
+
+    @override_settings(BULK_IMPORT_BACKGROUND_THRESHOLD=2)
+    def test_import_small_file(self):
+        csv_file = SimpleUploadedFile('sites.csv', b'name,slug,status\nSite 1,site-1,active\n\nSite 2,site-2,active\n')
+
+        with patch('extras.models.models.django_rq.get_queue') as mock_get_queue:
+            response = self.client.post(reverse('dcim:site_import'), {'csv': 'name,slug,status', 'csv_file': csv_file})
+        self.assertHttpStatus(response, 200)
+        mock_get_queue.assert_not_called()
+        self.assertEqual(Site.objects.count(), 2)
+
+
+@override_settings(EXEMPT_VIEW_PERMISSIONS=['*'])
+class BackgroundExportTestCase(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        Site.objects.bulk_create([
+            Site(name=f'Site {i}', slug=f'site-{i}') for i in range(1, 4)
+        ])
+
+    def _run_export(self, params):
+        with patch('extras.models.models.django_rq.get_queue') as mock_get_queue:
+            response = self.client.get(f"{reverse('dcim:site_list')}?{params}")
+        self.assertHttpStatus(response, 302)
+
+        # Run the enqueued job
+        enqueue = mock_get_queue.return_value.enqueue
+        enqueue.assert_called_once()
+        kwargs = {k: v for k, v in enqueue.call_args.kwargs.items() if k != 'job_id'}
+        enqueue.call_args.args[0](**kwargs)
+
+        job_result = JobResult.objects.get()
+        self.addCleanup(delete_export, job_result)
+        return job_result
+
+    def _download(self, job_result):
+        response = self.client.get(reverse('extras:export_download', kwargs={'job_result_pk': job_result.pk}))
+        self.assertHttpStatus(response, 200)
+        return gzip.decompress(b''.join(response.streaming_content)).decode()
+
+    def test_export_table(self):
+        job_result = self._run_export('export=table&background=true&name=Site 1&name=Site 2')
+        self.assertEqual(job_result.status, JobResultStatusChoices.STATUS_COMPLETED)
+        self.assertEqual(job_result.data['total'], 2)
+        self.assertEqual(job_result.data['exported'], 2)
+        self.assertEqual(job_result.data['filename'], 'netbox_sites.csv.gz')
+
+        lines = self._download(job_result).splitlines()
+        self.assertEqual(len(lines), 3)
+        self.assertTrue(lines[0].startswith('Name,'))
+        self.assertTrue(lines[1].startswith('Site 1,'))
+
+        response = self.client.get(reverse('extras:export_result', kwargs={'job_result_pk': job_result.pk}))
+        self.assertHttpStatus(response, 200)
+
+    def test_export_template(self):
+        ExportTemplate.objects.create(
+            content_type=ContentType.objects.get_for_model(Site),
+            name='Site names',
+            template_code='{% for site in queryset %}{{ site.name }}\n{% endfor %}',
+            file_extension='txt'
+        )
+        job_result = self._run_export('export=Site names&background=true')
+        self.assertEqual(job_result.status, JobResultStatusChoices.STATUS_COMPLETED)
+        self.assertEqual(job_result.data['filename'], 'netbox_sites.txt.gz')
+        self.assertEqual(self._download(job_result), 'Site 1\nSite 2\nSite 3\n')
+
+    def test_download_restricted_to_owner(self):
+        job_result = self._run_export('export&background=true')
+
+        # Another (non-superuser) user cannot view or download the export
+        self.client.force_login(User.objects.create_user(username='User 2'))
+        response = self.client.get(reverse('extras:export_result', kwargs={'job_result_pk': job_result.pk}))
+        self.assertHttpStatus(response, 404)
+        response = self.client.get(reverse('extras:export_download', kwargs={'job_result_pk': job_result.pk}))
+        self.assertHttpStatus(response, 404)
+
+    def test_export_not_served_as_media(self):
+        job_result = self._run_export('export&background=true')
+        self.assertNotIn('file', job_result.data)
+        self.assertTrue(get_export_storage().exists(get_export_path(job_result)))
+
+        # The exported file cannot be retrieved directly from the media path
+        for path in (
+            f'exports/{job_result.job_id}/{job_result.data["filename"]}',
+            get_export_path(job_result),
+        ):
+            response = self.client.get(f'/media/{path}')
+            self.assertHttpStatus(response, 404)
+
+    def test_delete_job_result_deletes_export(self):
+        job_result = self._run_export('export&background=true')
+        storage, path = get_export_storage(), get_export_path(job_result)
+        self.assertTrue(storage.exists(path))
+
+        job_result.delete()
+        self.assertFalse(storage.exists(path))
@@ -2,6 +2,7 @@ import platform
 import sys
 
 from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
 from django.core.cache import cache
 from django.http import HttpResponseServerError
 from django.shortcuts import redirect, render
@@ -19,11 +20,13 @@ from dcim.models import (
     Cable, ConsolePort, Device, DeviceType, Interface, PowerPanel, PowerFeed, PowerPort, Rack, Site,
 )
 from extras.models import ObjectChange
+from extras.search import filter_queryset, get_matched_object_types
 from extras.tables import ObjectChangeTable
 from ipam.models import Aggregate, IPAddress, IPRange, Prefix, VLAN, VRF
 from netbox.constants import SEARCH_MAX_RESULTS
 from netbox.forms import SearchForm
 from netbox.search import SEARCH_TYPES
+from netbox.stats import get_counts
 from tenancy.models import Tenant
 from virtualization.models import Cluster, VirtualMachine
 from wireless.models import WirelessLAN, WirelessLink
@@ -48,45 +51,45 @@ class HomeView(View):
 
         def build_stats():
             org = (
-                ("dcim.view_site", "Sites", Site.objects.restrict(request.user, 'view').count),
-                ("tenancy.view_tenant", "Tenants", Tenant.objects.restrict(request.user, 'view').count),
+                ("dcim.view_site", "Sites", Site.objects.restrict(request.user, 'view')),
+                ("tenancy.view_tenant", "Tenants", Tenant.objects.restrict(request.user, 'view')),
             )
             dcim = (
-                ("dcim.view_rack", "Racks", Rack.objects.restrict(request.user, 'view').count),
-                ("dcim.view_devicetype", "Device Types", DeviceType.objects.restrict(request.user, 'view').count),
-                ("dcim.view_device", "Devices", Device.objects.restrict(request.user, 'view').count),
+                ("dcim.view_rack", "Racks", Rack.objects.restrict(request.user, 'view')),
+                ("dcim.view_devicetype", "Device Types", DeviceType.objects.restrict(request.user, 'view')),
+                ("dcim.view_device", "Devices", Device.objects.restrict(request.user, 'view')),
             )
             ipam = (
-                ("ipam.view_vrf", "VRFs", VRF.objects.restrict(request.user, 'view').count),
-                ("ipam.view_aggregate", "Aggregates", Aggregate.objects.restrict(request.user, 'view').count),
-                ("ipam.view_prefix", "Prefixes", Prefix.objects.restrict(request.user, 'view').count),
-                ("ipam.view_iprange", "IP Ranges", IPRange.objects.restrict(request.user, 'view').count),
-                ("ipam.view_ipaddress", "IP Addresses", IPAddress.objects.restrict(request.user, 'view').count),
-                ("ipam.view_vlan", "VLANs", VLAN.objects.restrict(request.user, 'view').count)
+                ("ipam.view_vrf", "VRFs", VRF.objects.restrict(request.user, 'view')),
+                ("ipam.view_aggregate", "Aggregates", Aggregate.objects.restrict(request.user, 'view')),
+                ("ipam.view_prefix", "Prefixes", Prefix.objects.restrict(request.user, 'view')),
+                ("ipam.view_iprange", "IP Ranges", IPRange.objects.restrict(request.user, 'view')),
+                ("ipam.view_ipaddress", "IP Addresses", IPAddress.objects.restrict(request.user, 'view')),
+                ("ipam.view_vlan", "VLANs", VLAN.objects.restrict(request.user, 'view'))
 
             )
             circuits = (
-                ("circuits.view_provider", "Providers", Provider.objects.restrict(request.user, 'view').count),
-                ("circuits.view_circuit", "Circuits", Circuit.objects.restrict(request.user, 'view').count),
+                ("circuits.view_provider", "Providers", Provider.objects.restrict(request.user, 'view')),
+                ("circuits.view_circuit", "Circuits", Circuit.objects.restrict(request.user, 'view')),
             )
             virtualization = (
-                ("virtualization.view_cluster", "Clusters", Cluster.objects.restrict(request.user, 'view').count),
-                ("virtualization.view_virtualmachine", "Virtual Machines", VirtualMachine.objects.restrict(request.user, 'view').count),
+                ("virtualization.view_cluster", "Clusters", Cluster.objects.restrict(request.user, 'view')),
+                ("virtualization.view_virtualmachine", "Virtual Machines", VirtualMachine.objects.restrict(request.user, 'view')),
 
             )
             connections = (
-                ("dcim.view_cable", "Cables", Cable.objects.restrict(request.user, 'view').count),
-                ("dcim.view_consoleport", "Console", connected_consoleports.count),
-                ("dcim.view_interface", "Interfaces", connected_interfaces.count),
-                ("dcim.view_powerport", "Power Connections", connected_powerports.count),
+                ("dcim.view_cable", "Cables", Cable.objects.restrict(request.user, 'view')),
+                ("dcim.view_consoleport", "Console", connected_consoleports),
+                ("dcim.view_interface", "Interfaces", connected_interfaces),
+                ("dcim.view_powerport", "Power Connections", connected_powerports),
             )
             power = (
-                ("dcim.view_powerpanel", "Power Panels", PowerPanel.objects.restrict(request.user, 'view').count),
-                ("dcim.view_powerfeed", "Power Feeds", PowerFeed.objects.restrict(request.user, 'view').count),
+                ("dcim.view_powerpanel", "Power Panels", PowerPanel.objects.restrict(request.user, 'view')),
+                ("dcim.view_powerfeed", "Power Feeds", PowerFeed.objects.restrict(request.user, 'view')),
             )
             wireless = (
-                ("wireless.view_wirelesslan", "Wireless LANs", WirelessLAN.objects.restrict(request.user, 'view').count),
-                ("wireless.view_wirelesslink", "Wireless Links", WirelessLink.objects.restrict(request.user, 'view').count),
+                ("wireless.view_wirelesslan", "Wireless LANs", WirelessLAN.objects.restrict(request.user, 'view')),
+                ("wireless.view_wirelesslink", "Wireless Links", WirelessLink.objects.restrict(request.user, 'view')),
             )
             sections = (
                 ("Organization", org, "domain"),
@@ -99,10 +102,17 @@ class HomeView(View):
                 ("Wireless", wireless, "wifi"),
             )
 
+            # Retrieve the counts for all permitted items at once
+            querysets = [
+                queryset for section_label, section_items, icon_class in sections
+                for perm, item_label, queryset in section_items if request.user.has_perm(perm)
+            ]
+            counts = iter(get_counts(querysets))
+
             stats = []
             for section_label, section_items, icon_class in sections:
                 items = []
-                for perm, item_label, get_count in section_items:
+                for perm, item_label, queryset in section_items:
                     app, scope = perm.split(".")
                     url = ":".join((app, scope.replace("view_", "") + "_list"))
                     item = {
@@ -113,7 +123,7 @@ class HomeView(View):
                         "icon": icon_class,
                     }
                     if request.user.has_perm(perm):
-                        item["count"] = get_count()
+                        item["count"] = next(counts)
                         item["disabled"] = False
                     items.append(item)
                 stats.append((section_label, items, icon_class))
@@ -160,15 +170,20 @@ class SearchView(View):
                 url = reverse(SEARCH_TYPES[object_type]['url'])
                 return redirect(f"{url}?q={form.cleaned_data['q']}")
 
+            # Query the search index once to determine which types of objects have matches
+            matched_object_types = get_matched_object_types(form.cleaned_data['q'])
+
             for obj_type in SEARCH_TYPES.keys():
 
                 queryset = SEARCH_TYPES[obj_type]['queryset'].restrict(request.user, 'view')
-                filterset = SEARCH_TYPES[obj_type]['filterset']
                 table = SEARCH_TYPES[obj_type]['table']
                 url = SEARCH_TYPES[obj_type]['url']
 
+                if ContentType.objects.get_for_model(queryset.model).pk not in matched_object_types:
+                    continue
+
                 # Construct the results table for this object type
-                filtered_queryset = filterset({'q': form.cleaned_data['q']}, queryset=queryset).qs
+                filtered_queryset = filter_queryset(queryset, form.cleaned_data['q'])
                 table = table(filtered_queryset, orderable=False)
                 table.paginate(per_page=SEARCH_MAX_RESULTS)
 
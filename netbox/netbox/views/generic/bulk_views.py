@@ -1,28 +1,41 @@
 import logging
 import re
+import uuid
 from copy import deepcopy
+from itertools import islice
 
 from django.contrib import messages
 from django.contrib.contenttypes.models import ContentType
 from django.core.exceptions import FieldDoesNotExist, ValidationError
-from django.db import transaction, IntegrityError
-from django.db.models import ManyToManyField, ProtectedError
+from django.core.files.storage import default_storage
+from django.db import router, transaction, IntegrityError
+from django.db.models import ManyToManyField, Model, ProtectedError
 from django.db.models.fields.reverse_related import ManyToManyRel
+from django.db.models.signals import post_save, pre_save
 from django.forms import Form, ModelMultipleChoiceField, MultipleHiddenInput
-from django.http import HttpResponse
+from django.forms.models import BaseModelForm
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404, redirect, render
-from django_tables2.export import TableExport
+from django.urls import reverse
+from django.utils.module_loading import import_string
 from django.utils.safestring import mark_safe
 
-from extras.models import ExportTemplate
+from extras.choices import JobResultStatusChoices
+from extras.context_managers import change_logging
+from extras.exports import enqueue_export
+from extras.models import ExportTemplate, JobResult
 from extras.signals import clear_webhooks
+from netbox.config import get_config
 from utilities.error_handlers import handle_protectederror
 from utilities.exceptions import AbortRequest, PermissionsViolation
 from utilities.forms import (
-    BootstrapMixin, BulkRenameForm, ConfirmationForm, CSVDataField, CSVFileField, restrict_form_fields,
+    BootstrapMixin, BulkRenameForm, ConfirmationForm, CSVDataField, CSVFileField, prefetch_csv_objects,
+    restrict_form_fields,
 )
 from utilities.htmx import is_htmx
 from utilities.permissions import get_permission_for_model
+from utilities.querysets import chunked_iterator
+from utilities.utils import copy_safe_request, csv_rows
 from utilities.views import GetReturnURLMixin
 from .base import BaseMultiObjectView
 from .mixins import ActionsMixin, TableMixin
@@ -38,6 +51,12 @@ __all__ = (
     'ObjectListView',
 )
 
+# The number of CSV records validated and saved together during a bulk import
+IMPORT_BATCH_SIZE = 1000
+
+# The maximum number of invalid records reported for a bulk import
+MAX_IMPORT_ERRORS = 100
+
 
 class ObjectListView(BaseMultiObjectView, ActionsMixin, TableMixin):
     """
@@ -63,15 +82,15 @@ class ObjectListView(BaseMultiObjectView, ActionsMixin, TableMixin):
 
     def export_yaml(self):
         """
-        Export the queryset of objects as concatenated YAML documents.
+        Export the queryset of objects as concatenated YAML documents. Returns an iterator of the documents, retrieving
+        objects from the database in chunks.
         """
-        yaml_data = [obj.to_yaml() for obj in self.queryset]
-
-        return '---\n'.join(yaml_data)
+        for i, obj in enumerate(chunked_iterator(self.queryset)):
+            yield obj.to_yaml() if not i else f'---\n{obj.to_yaml()}'
 
     def export_table(self, table, columns=None, filename=None):
         """
-        Export all table data in CSV format.
+        Export all table data in CSV format. The CSV data is streamed to the client as it is generated.
 
         Args:
             table: The Table instance to export
@@ -85,14 +104,14 @@ class ObjectListView(BaseMultiObjectView, ActionsMixin, TableMixin):
             exclude_columns.update({
                 col for col in all_columns if col not in columns
             })
-        exporter = TableExport(
-            export_format=TableExport.CSV,
-            table=table,
-            exclude_columns=exclude_columns
-        )
-        return exporter.response(
-            filename=filename or f'netbox_{self.queryset.model._meta.verbose_name_plural}.csv'
+        response = StreamingHttpResponse(
+            csv_rows(table.as_values(exclude_columns=exclude_columns)),
+            content_type='text/csv; charset=utf-8'
         )
+        filename = filename or f'netbox_{self.queryset.model._meta.verbose_name_plural}.csv'
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+
+        return response
 
     def export_template(self, template, request):
         """
@@ -111,6 +130,28 @@ class ObjectListView(BaseMultiObjectView, ActionsMixin, TableMixin):
             query_params.pop('export')
             return redirect(f'{request.path}?{query_params.urlencode()}')
 
+    def _enqueue_export(self, request):
+        """
+        Enqueue a background job to export the current queryset in the format specified by the `export` query
+        parameter, and return its JobResult.
+        """
+        model = self.queryset.model
+        export = request.GET['export']
+
+        # Render an ExportTemplate
+        if export and export != 'table':
+            content_type = ContentType.objects.get_for_model(model)
+            template = get_object_or_404(ExportTemplate, content_type=content_type, name=export)
+            return enqueue_export(self.queryset, request.user, export_template=template)
+
+        # Export the current table view, or all table columns if the model does not support YAML export
+        if export or not hasattr(model, 'to_yaml'):
+            table = self.get_table(self.queryset, request, bulk_actions=False)
+            columns = [name for name, _ in table.selected_columns] if export else None
+            return enqueue_export(table.data.data, request.user, table=type(table), columns=columns)
+
+        return enqueue_export(self.queryset, request.user)
+
     #
     # Request handlers
     #
@@ -134,6 +175,19 @@ class ObjectListView(BaseMultiObjectView, ActionsMixin, TableMixin):
 
         if 'export' in request.GET:
 
+            # Export the objects by way of a background job
+            if request.GET.get('background') == 'true':
+                job_result = self._enqueue_export(request)
+                url = reverse('extras:export_result', kwargs={'job_result_pk': job_result.pk})
+                messages.info(request, mark_safe(
+                    f'The export will be completed by a background job. Once it has finished, the exported data can '
+                    f'be downloaded <a href="{url}">here</a>.'
+                ))
+                query_params = request.GET.copy()
+                query_params.pop('export')
+                query_params.pop('background')
+                return redirect(f'{request.path}?{query_params.urlencode()}')
+
             # Export the current table view
             if request.GET['export'] == 'table':
                 table = self.get_table(self.queryset, request, has_bulk_actions)
@@ -147,7 +201,7 @@ class ObjectListView(BaseMultiObjectView, ActionsMixin, TableMixin):
 
             # Check for YAML export support on the model
             elif hasattr(model, 'to_yaml'):
-                response = HttpResponse(self.export_yaml(), content_type='text/yaml')
+                response = StreamingHttpResponse(self.export_yaml(), content_type='text/yaml')
                 filename = 'netbox_{}.yaml'.format(self.queryset.model._meta.verbose_name_plural)
                 response['Content-Disposition'] = 'attachment; filename="{}"'.format(filename)
                 return response
@@ -321,24 +375,120 @@ class BulkImportView(GetReturnURLMixin, BaseMultiObjectView):
 
         return ImportForm(*args, **kwargs)
 
+    def _get_forms(self, records, headers, request):
+        """
+        Return a (row number, model form) pair for each of the given (row number, data) pairs. The related objects
+        referenced by all records are retrieved in bulk.
+        """
+        forms = []
+        for row, data in records:
+            obj_form = self.model_form(data, headers=headers)
+            restrict_form_fields(obj_form, request.user)
+            forms.append((row, obj_form))
+        prefetch_csv_objects([obj_form for row, obj_form in forms])
+
+        return forms
+
+    def _can_bulk_create(self):
+        """
+        Return True if imported objects may be saved using bulk_create(). This is possible only if neither the model,
+        its form, nor this view customizes the saving of objects, and the model performs no validation of its own
+        (which might depend on the objects created earlier in the import).
+        """
+        model = self.queryset.model
+        return (
+            type(self)._save_obj is BulkImportView._save_obj and
+            self.model_form.save is BaseModelForm.save and
+            model.save is Model.save and
+            model.clean.__module__ in ('django.db.models.base', 'netbox.models.features') and
+            model.validate_unique is Model.validate_unique
+        )
+
+    def _bulk_create_objects(self, forms):
+        """
+        Validate all forms and save their objects using bulk_create(), sending the pre_save and post_save signals for
+        each object as save() would. Returns the new objects, or None if any form fails validation.
+        """
+        model = self.queryset.model
+        if not all(obj_form.is_valid() for row, obj_form in forms):
+            return None
+
+        using = router.db_for_write(model)
+        new_objs = [obj_form.save(commit=False) for row, obj_form in forms]
+        for obj in new_objs:
+            pre_save.send(sender=model, instance=obj, raw=False, using=using, update_fields=None)
+        model.objects.using(using).bulk_create(new_objs)
+        for (row, obj_form), obj in zip(forms, new_objs):
+            # A new object has no many-to-many assignments until save_m2m() is called
+            obj._prefetched_objects_cache = {
+                field.name: getattr(obj, field.name).none() for field in model._meta.many_to_many
+            }
+            post_save.send(sender=model, instance=obj, created=True, update_fields=None, raw=False, using=using)
+            obj_form.save_m2m()
+
+        return new_objs
+
+    def _create_batch(self, records, headers, request):
+        """
+        Validate and save a batch of CSV records, given as (row number, data) pairs. Returns a list of the objects
+        created and a list of (row number, field name, message) tuples describing any invalid records.
+        """
+        if self._can_bulk_create():
+            try:
+                with transaction.atomic():
+                    new_objs = self._bulk_create_objects(self._get_forms(records, headers, request))
+                if new_objs is not None:
+                    return new_objs, []
+            except IntegrityError:
+                # Records conflict with one another
+                pass
+
+        # Validate and save each record in turn (e.g. to identify invalid records)
+        new_objs = []
+        errors = []
+        for row, obj_form in self._get_forms(records, headers, request):
+            if obj_form.is_valid():
+                new_objs.append(self._save_obj(obj_form, request))
+            else:
+                for field, err in obj_form.errors.items():
+                    errors.append((row, field, err[0]))
+
+        return new_objs, errors
+
     def _create_objects(self, form, request):
+        """
+        Create objects from the CSV records of the import form, in batches of IMPORT_BATCH_SIZE records. Records which
+        fail validation are reported as errors on the form.
+        """
         new_objs = []
+        errors = []
         if request.FILES:
             headers, records = form.cleaned_data['csv_file']
         else:
             headers, records = form.cleaned_data['csv']
+        records = enumerate(records, start=1)
 
-        for row, data in enumerate(records, start=1):
-            obj_form = self.model_form(data, headers=headers)
-            restrict_form_fields(obj_form, request.user)
-
-            if obj_form.is_valid():
-                obj = self._save_obj(obj_form, request)
-                new_objs.append(obj)
-            else:
-                for field, err in obj_form.errors.items():
-                    form.add_error('csv', f'Row {row} {field}: {err[0]}')
-                raise ValidationError("")
+        while len(errors) < MAX_IMPORT_ERRORS:
+            try:
+                batch = list(islice(records, IMPORT_BATCH_SIZE))
+            except ValidationError as e:
+                form.add_error('csv', e)
+                break
+            if not batch:
+                break
+            batch_objs, batch_errors = self._create_batch(batch, headers, request)
+
+            # Enforce object-level permissions
+            if self.queryset.filter(pk__in=[obj.pk for obj in batch_objs]).count() != len(batch_objs):
+                raise PermissionsViolation
+
+            new_objs.extend(batch_objs)
+            errors.extend(batch_errors)
+
+        for row, field, err in errors[:MAX_IMPORT_ERRORS]:
+            form.add_error('csv', f'Row {row} {field}: {err}')
+        if form.errors:
+            raise ValidationError("")
 
         return new_objs
 
@@ -348,6 +498,37 @@ class BulkImportView(GetReturnURLMixin, BaseMultiObjectView):
         """
         return obj_form.save()
 
+    def _enqueue_import(self, form, request):
+        """
+        Enqueue a background job to import the uploaded CSV file if it contains more than
+        BULK_IMPORT_BACKGROUND_THRESHOLD records, and return its JobResult. Otherwise, return None.
+        """
+        threshold = get_config().BULK_IMPORT_BACKGROUND_THRESHOLD
+        if not threshold:
+            return None
+
+        # Read no more records than necessary to determine whether the threshold has been exceeded
+        headers, records = form.cleaned_data['csv_file']
+        records = list(islice(records, threshold + 1))
+        if len(records) <= threshold:
+            form.cleaned_data['csv_file'] = (headers, records)
+            return None
+
+        model = self.queryset.model
+        path = default_storage.save(f'bulk-imports/{uuid.uuid4()}.csv', request.FILES['csv_file'])
+        job_request = copy_safe_request(request)
+        job_request.FILES = {}
+
+        return JobResult.enqueue_job(
+            run_bulk_import,
+            f'Import {model._meta.verbose_name_plural}',
+            ContentType.objects.get_for_model(model),
+            request.user,
+            view=f'{self.__module__}.{self.__class__.__name__}',
+            path=path,
+            request=job_request
+        )
+
     def get_required_permission(self):
         return get_permission_for_model(self.queryset.model, 'add')
 
@@ -372,15 +553,19 @@ class BulkImportView(GetReturnURLMixin, BaseMultiObjectView):
         if form.is_valid():
             logger.debug("Form validation was successful")
 
+            # Import large files in the background
+            if request.FILES and (job_result := self._enqueue_import(form, request)):
+                url = reverse('extras-api:jobresult-detail', kwargs={'pk': job_result.pk})
+                messages.info(request, mark_safe(
+                    f'The import will be completed by a background job (<a href="{url}">{job_result.job_id}</a>).'
+                ))
+                return redirect(self.get_return_url(request))
+
             try:
                 # Iterate through CSV data and bind each row to a new model form instance.
                 with transaction.atomic():
                     new_objs = self._create_objects(form, request)
 
-                    # Enforce object-level permissions
-                    if self.queryset.filter(pk__in=[obj.pk for obj in new_objs]).count() != len(new_objs):
-                        raise PermissionsViolation
-
                 # Compile a table containing the imported objects
                 obj_table = self.table(new_objs)
 
@@ -414,6 +599,49 @@ class BulkImportView(GetReturnURLMixin, BaseMultiObjectView):
         })
 
 
+def run_bulk_import(view, path, request, job_result):
+    """
+    Import objects from a CSV file saved to storage, using the named BulkImportView. This is run as a background job
+    for large files; the file is deleted once the import has completed.
+    """
+    logger = logging.getLogger('netbox.views.BulkImportView')
+    job_result.set_status(JobResultStatusChoices.STATUS_RUNNING)
+    job_result.save()
+
+    view = import_string(view)()
+    view.setup(request)
+    view.queryset = view.queryset.restrict(request.user, 'add')
+
+    with change_logging(request):
+        try:
+            with default_storage.open(path, 'rb') as csv_file:
+                request.FILES = {'csv_file': csv_file}
+                form = view._import_form(request.POST, request.FILES)
+                try:
+                    if not form.is_valid():
+                        raise ValidationError("")
+                    with transaction.atomic():
+                        new_objs = view._create_objects(form, request)
+                    job_result.data = {'created': len(new_objs)}
+                    job_result.set_status(JobResultStatusChoices.STATUS_COMPLETED)
+                    logger.info(f"Imported {len(new_objs)} {view.queryset.model._meta.verbose_name_plural}")
+                except (ValidationError, AbortRequest, PermissionsViolation) as e:
+                    errors = form.errors.get_json_data()
+                    if message := getattr(e, 'message', None):
+                        errors.setdefault('__all__', []).append({'message': message, 'code': ''})
+                    job_result.data = {'errors': errors}
+                    job_result.set_status(JobResultStatusChoices.STATUS_FAILED)
+                    clear_webhooks.send(sender=view)
+        except Exception as e:
+            logger.error(f"Exception raised during import: {e}")
+            job_result.data = {'errors': {'__all__': [{'message': str(e), 'code': ''}]}}
+            job_result.set_status(JobResultStatusChoices.STATUS_ERRORED)
+            clear_webhooks.send(sender=view)
+        finally:
+            job_result.save()
+            default_storage.delete(path)
+
+
 class BulkEditView(GetReturnURLMixin, BaseMultiObjectView):
     """
     Edit objects in bulk.
@@ -437,11 +665,13 @@ class BulkEditView(GetReturnURLMixin, BaseMultiObjectView):
         nullified_fields = request.POST.getlist('_nullify')
         updated_objects = []
 
-        for obj in self.queryset.filter(pk__in=form.cleaned_data['pk']):
+        objects = list(self.queryset.filter(pk__in=form.cleaned_data['pk']))
 
-            # Take a snapshot of change-logged models
-            if hasattr(obj, 'snapshot'):
-                obj.snapshot()
+        # Take a snapshot of change-logged models
+        if hasattr(self.queryset.model, 'snapshot_objects'):
+            self.queryset.model.snapshot_objects(objects)
+
+        for obj in objects:
 
             # Update standard fields. If a field is listed in _nullify, delete its value.
             for name in standard_fields:
@@ -714,10 +944,13 @@ class BulkDeleteView(GetReturnURLMixin, BaseMultiObjectView):
                 queryset = self.queryset.filter(pk__in=pk_list)
                 deleted_count = queryset.count()
                 try:
-                    for obj in queryset:
-                        # Take a snapshot of change-logged models
-                        if hasattr(obj, 'snapshot'):
-                            obj.snapshot()
+                    objects = list(queryset)
+
+                    # Take a snapshot of change-logged models
+                    if hasattr(queryset.model, 'snapshot_objects'):
+                        queryset.model.snapshot_objects(objects)
+
+                    for obj in objects:
                         obj.delete()
 
                 except ProtectedError as e:
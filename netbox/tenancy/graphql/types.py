@@ -1,6 +1,7 @@
 import graphene
 
 from tenancy import filtersets, models
+from netbox.graphql.optimizer import restrict_queryset
 from netbox.graphql.types import BaseObjectType, OrganizationalObjectType, NetBoxObjectType
 
 __all__ = (
@@ -17,7 +18,7 @@ class ContactAssignmentsMixin:
     assignments = graphene.List('tenancy.graphql.types.ContactAssignmentType')
 
     def resolve_assignments(self, info):
-        return self.assignments.restrict(info.context.user, 'view')
+        return restrict_queryset(self.assignments.all(), info)
 
 
 #
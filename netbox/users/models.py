@@ -6,7 +6,7 @@ from django.contrib.contenttypes.models import ContentType
 from django.contrib.postgres.fields import ArrayField
 from django.core.validators import MinLengthValidator
 from django.db import models
-from django.db.models.signals import post_save
+from django.db.models.signals import m2m_changed, post_delete, post_save
 from django.dispatch import receiver
 from django.utils import timezone
 from netaddr import IPNetwork
@@ -327,3 +327,27 @@ class ObjectPermission(models.Model):
         if type(self.constraints) is not list:
             return [self.constraints]
         return self.constraints
+
+
+@receiver((post_save, post_delete), sender=ObjectPermission)
+@receiver(post_delete, sender=Group)
+def invalidate_object_permissions(**kwargs):
+    """
+    Invalidate all cached object permissions when an ObjectPermission is modified or deleted, or a Group is deleted.
+    """
+    from netbox.authentication import invalidate_object_permission_cache
+    invalidate_object_permission_cache()
+
+
+@receiver(m2m_changed, sender=ObjectPermission.object_types.through)
+@receiver(m2m_changed, sender=ObjectPermission.groups.through)
+@receiver(m2m_changed, sender=ObjectPermission.users.through)
+@receiver(m2m_changed, sender=User.groups.through)
+def invalidate_object_permissions_on_m2m_change(action, **kwargs):
+    """
+    Invalidate all cached object permissions when the object types or assignment of an ObjectPermission, or the
+    membership of a Group, changes.
+    """
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        from netbox.authentication import invalidate_object_permission_cache
+        invalidate_object_permission_cache()
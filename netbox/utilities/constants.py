@@ -43,6 +43,7 @@ ADVISORY_LOCK_KEYS = {
     'available-prefixes': 100100,
     'available-ips': 100200,
     'available-vlans': 100300,
+    'config-context-cache': 100400,
 }
 
 #
@@ -1,5 +1,5 @@
 import csv
-from io import StringIO
+from io import StringIO, TextIOWrapper
 
 from django import forms
 from django.contrib.contenttypes.models import ContentType
@@ -7,7 +7,7 @@ from django.core.exceptions import MultipleObjectsReturned, ObjectDoesNotExist
 from django.db.models import Q
 
 from utilities.choices import unpack_grouped_choices
-from utilities.forms.utils import parse_csv, validate_csv
+from utilities.forms.utils import iter_csv, parse_csv, validate_csv
 from utilities.utils import content_type_identifier
 
 __all__ = (
@@ -69,8 +69,8 @@ class CSVFileField(forms.FileField):
     """
     A FileField (rendered as a file input button) which accepts a file containing CSV-formatted data. It returns
     data as a two-tuple: The first item is a dictionary of column headers, mapping field names to the attribute
-    by which they match a related object (where applicable). The second item is a list of dictionaries, each
-    representing a discrete row of CSV data.
+    by which they match a related object (where applicable). The second item is an iterator of dictionaries, each
+    representing a discrete row of CSV data. Rows are read from the file only as they are consumed.
 
     :param from_form: The form from which the field derives its validation rules.
     """
@@ -90,11 +90,11 @@ class CSVFileField(forms.FileField):
         if file is None:
             return None
 
-        csv_str = file.read().decode('utf-8').strip()
-        reader = csv.reader(StringIO(csv_str))
-        headers, records = parse_csv(reader)
-
-        return headers, records
+        reader = csv.reader(TextIOWrapper(file, encoding='utf-8', newline=''))
+        try:
+            return iter_csv(reader)
+        except StopIteration:
+            raise forms.ValidationError("The file is empty.")
 
     def validate(self, value):
         if value is None:
@@ -113,6 +113,12 @@ class CSVChoicesMixin:
         super().__init__(choices=choices, **kwargs)
         self.choices = unpack_grouped_choices(choices)
 
+    def __deepcopy__(self, memo):
+        # Static choices are shared by all copies of the field, rather than being copied for every instance of a form
+        result = forms.Field.__deepcopy__(self, memo)
+        result._choices = self._choices
+        return result
+
 
 class CSVChoiceField(CSVChoicesMixin, forms.ChoiceField):
     """
@@ -139,13 +145,26 @@ class CSVTypedChoiceField(forms.TypedChoiceField):
 
 class CSVModelChoiceField(forms.ModelChoiceField):
     """
-    Extends Django's `ModelChoiceField` to provide additional validation for CSV values.
+    Extends Django's `ModelChoiceField` to provide additional validation for CSV values. Objects retrieved in advance
+    (see prefetch_csv_objects()) are assigned to `prefetched_objects`, mapped by the string value of `to_field_name`.
     """
     default_error_messages = {
         'invalid_choice': 'Object not found.',
     }
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.prefetched_objects = None
+
     def to_python(self, value):
+        if self.prefetched_objects is not None and value not in self.empty_values:
+            objects = self.prefetched_objects.get(str(value), [])
+            if len(objects) == 1:
+                return objects[0]
+            if len(objects) > 1:
+                raise forms.ValidationError(
+                    f'"{value}" is not a unique value for this field; multiple objects were found'
+                )
         try:
             return super().to_python(value)
         except MultipleObjectsReturned:
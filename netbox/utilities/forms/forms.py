@@ -3,6 +3,9 @@ import re
 
 import yaml
 from django import forms
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import ForeignKey
+from django.forms.models import construct_instance
 
 from .widgets import APISelect, APISelectMultiple, ClearableFileInput, StaticSelect
 
@@ -130,6 +133,41 @@ class CSVModelForm(forms.ModelForm):
                 if to_field is not None:
                     self.fields[field].to_field_name = to_field
 
+    def _post_clean(self):
+        """
+        Mirror ModelForm._post_clean(), excluding from model field validation any foreign key which has been resolved
+        by a ModelChoiceField: The related object has been retrieved from the database already, so the model need not
+        query for its existence again. As with Django's handling of inline foreign keys, these fields remain subject to
+        the validation of unique constraints.
+        """
+        opts = self._meta
+        exclude = self._get_validation_exclusions()
+
+        for name, field in self.fields.items():
+            if not isinstance(field, forms.ModelChoiceField) or self.cleaned_data.get(name) is None:
+                continue
+            try:
+                model_field = self.instance._meta.get_field(name)
+            except FieldDoesNotExist:
+                continue
+            # The related object must still be validated against any limitation of the relation's choices
+            if isinstance(model_field, ForeignKey) and not model_field.get_limit_choices_to():
+                exclude.append(name)
+
+        try:
+            self.instance = construct_instance(self, self.instance, opts.fields, opts.exclude)
+        except ValidationError as e:
+            self._update_errors(e)
+
+        try:
+            self.instance.full_clean(exclude=exclude, validate_unique=False)
+        except ValidationError as e:
+            self._update_errors(e)
+
+        # Validate uniqueness against all fields
+        if self._validate_unique:
+            self.validate_unique()
+
 
 class ImportForm(BootstrapMixin, forms.Form):
     """
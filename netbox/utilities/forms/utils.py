@@ -1,6 +1,9 @@
 import re
+from collections import defaultdict
 
 from django import forms
+from django.core.exceptions import FieldError, ValidationError
+from django.db import DatabaseError, transaction
 from django.forms.models import fields_for_model
 
 from utilities.choices import unpack_grouped_choices
@@ -15,7 +18,9 @@ __all__ = (
     'get_selected_values',
     'parse_alphanumeric_range',
     'parse_numeric_range',
+    'prefetch_csv_objects',
     'restrict_form_fields',
+    'iter_csv',
     'parse_csv',
     'validate_csv',
 )
@@ -182,36 +187,93 @@ def restrict_form_fields(form, user, action='view'):
             field.queryset = field.queryset.restrict(user, action)
 
 
+def prefetch_csv_objects(forms):
+    """
+    Retrieve in bulk the related objects referenced by the CSVModelChoiceFields of a set of bound forms, such that the
+    fields need not query for them individually upon validation. Fields which reference objects by the same attribute
+    within identical querysets (e.g. the same field on each form) share a single query. Values which cannot be
+    resolved in this manner are left to be retrieved by the field itself.
+    """
+    lookups = {}
+
+    for form in forms:
+        for name, field in form.fields.items():
+            if not hasattr(field, 'prefetched_objects') or field.disabled:
+                continue
+            value = form.data.get(name)
+            if value in field.empty_values:
+                continue
+
+            # Fields may have had their querysets filtered individually (e.g. by the form's data)
+            to_field = field.to_field_name or 'pk'
+            query = field.queryset.query
+            key = (field.queryset.model, to_field, query.where, *query.alias_map.values())
+            try:
+                lookup = lookups.setdefault(key, (field.queryset, set(), []))
+            except TypeError:
+                # The query cannot be hashed
+                continue
+            lookup[1].add(value)
+            lookup[2].append(field)
+
+    for (model, to_field, *_), (queryset, values, fields) in lookups.items():
+        try:
+            with transaction.atomic():
+                objects = list(queryset.filter(**{f'{to_field}__in': values}))
+        except (DatabaseError, FieldError, TypeError, ValidationError, ValueError):
+            # One or more values is invalid for the attribute
+            continue
+
+        prefetched_objects = defaultdict(list)
+        for obj in objects:
+            prefetched_objects[str(getattr(obj, to_field))].append(obj)
+        for field in fields:
+            field.prefetched_objects = prefetched_objects
+
+
 def parse_csv(reader):
     """
     Parse a csv_reader object into a headers dictionary and a list of records dictionaries. Raise an error
     if the records are formatted incorrectly. Return headers and records as a tuple.
     """
-    records = []
+    headers, records = iter_csv(reader)
+
+    return headers, list(records)
+
+
+def iter_csv(reader):
+    """
+    Parse the column headers from a csv_reader object, returning the headers dictionary and an iterator which yields a
+    dictionary for each record as it is read. (This avoids holding all records in memory at once.) Blank lines are
+    ignored. An error is raised upon reaching a record which is formatted incorrectly.
+    """
     headers = {}
 
     # Consume the first line of CSV data as column headers. Create a dictionary mapping each header to an optional
     # "to" field specifying how the related object is being referenced. For example, importing a Device might use a
     # `site.slug` header, to indicate the related site is being referenced by its slug.
 
-    for header in next(reader):
+    for header in next(row for row in reader if row):
         if '.' in header:
             field, to_field = header.split('.', 1)
             headers[field] = to_field
         else:
             headers[header] = None
 
-    # Parse CSV rows into a list of dictionaries mapped from the column headers.
+    return headers, _iter_csv_records(reader, headers)
+
+
+def _iter_csv_records(reader, headers):
+    # Parse CSV rows into dictionaries mapped from the column headers.
     for i, row in enumerate(reader, start=1):
+        if not row:
+            continue
         if len(row) != len(headers):
             raise forms.ValidationError(
                 f"Row {i}: Expected {len(headers)} columns but found {len(row)}"
             )
         row = [col.strip() for col in row]
-        record = dict(zip(headers.keys(), row))
-        records.append(record)
-
-    return headers, records
+        yield dict(zip(headers.keys(), row))
 
 
 def validate_csv(headers, fields, required_fields):
@@ -2,9 +2,12 @@ from django.conf import settings
 from django.contrib.contenttypes.models import ContentType
 from django.db.models import Q
 
+from users.constants import CONSTRAINT_TOKEN_USER
+
 __all__ = (
     'get_permission_for_model',
     'permission_is_exempt',
+    'qs_filter_for_user',
     'qs_filter_from_constraints',
     'resolve_permission',
     'resolve_permission_ct',
@@ -104,3 +107,25 @@ def qs_filter_from_constraints(constraints, tokens=None):
             return Q()
 
     return params
+
+
+def qs_filter_for_user(user, permission):
+    """
+    Return the Q filter object matching all objects on which the given permission has been granted to a user by its
+    ObjectPermissions. Each filter is compiled once and retained with the user's cached permissions.
+
+    Args:
+        user: A User whose permissions have been loaded (i.e. by calling get_all_permissions())
+        permission: Permission name in the format <app_label>.<action>_<model>
+    """
+    if not hasattr(user, '_object_perm_filters'):
+        user._object_perm_filters = {}
+    filters = user._object_perm_filters
+
+    if permission not in filters:
+        tokens = {
+            CONSTRAINT_TOKEN_USER: user,
+        }
+        filters[permission] = qs_filter_from_constraints(user._object_perm_cache[permission], tokens)
+
+    return filters[permission]
@@ -1,18 +1,58 @@
-from django.db.models import QuerySet
+from functools import lru_cache
+from itertools import islice
 
-from users.constants import CONSTRAINT_TOKEN_USER
-from utilities.permissions import permission_is_exempt, qs_filter_from_constraints
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import QuerySet, prefetch_related_objects
+from django.db.models.constants import LOOKUP_SEP
+
+from utilities.permissions import permission_is_exempt, qs_filter_for_user
+
+
+@lru_cache(maxsize=None)
+def _lookup_is_multivalued(model, lookup):
+    """
+    Return True if the given filter lookup (e.g. "site__tenant__name") traverses a many-to-many or reverse foreign key
+    relationship, such that filtering on it may match an object more than once.
+    """
+    opts = model._meta
+    names = lookup.split(LOOKUP_SEP)
+    for i, name in enumerate(names):
+        try:
+            field = opts.pk if name == 'pk' else opts.get_field(name)
+        except FieldDoesNotExist:
+            # The final name may be a lookup or transform (e.g. "in"). Any other field which cannot be resolved is
+            # assumed to be multivalued, so that the permission is enforced safely (using a subquery).
+            return i < len(names) - 1
+        if field.many_to_many or field.one_to_many:
+            return True
+        if not field.is_relation or field.related_model is None:
+            return False
+        opts = field.related_model._meta
+
+    return False
+
+
+def _constraints_are_multivalued(model, constraints):
+    """
+    Return True if any of the given ObjectPermission constraints traverses a multi-valued relationship.
+    """
+    return any(
+        _lookup_is_multivalued(model, lookup) for constraint in constraints if constraint for lookup in constraint
+    )
 
 
 class RestrictedQuerySet(QuerySet):
 
-    def restrict(self, user, action='view'):
+    def restrict(self, user, action='view', subquery=None):
         """
         Filter the QuerySet to return only objects on which the specified user has been granted the specified
         permission.
 
         :param user: User instance
         :param action: The action which must be permitted (e.g. "view" for "dcim.view_site"); default is 'view'
+        :param subquery: If True, match permitted objects by primary key using a subquery. If False, apply the
+            permission's constraints to the QuerySet directly. By default, a subquery is used only if a constraint
+            traverses a many-to-many or reverse relationship.
         """
         # Resolve the full name of the required permission
         app_label = self.model._meta.app_label
@@ -29,13 +69,54 @@ class RestrictedQuerySet(QuerySet):
 
         # Filter the queryset to include only objects with allowed attributes
         else:
-            tokens = {
-                CONSTRAINT_TOKEN_USER: user,
-            }
-            attrs = qs_filter_from_constraints(user._object_perm_cache[permission_required], tokens)
-            # #8715: Avoid duplicates when JOIN on many-to-many fields without using DISTINCT.
-            # DISTINCT acts globally on the entire request, which may not be desirable.
-            allowed_objects = self.model.objects.filter(attrs)
-            qs = self.filter(pk__in=allowed_objects)
+            attrs = qs_filter_for_user(user, permission_required)
+            if subquery is None:
+                subquery = _constraints_are_multivalued(self.model, user._object_perm_cache[permission_required])
+            if subquery:
+                # #8715: Avoid duplicates when JOIN on many-to-many fields without using DISTINCT.
+                # DISTINCT acts globally on the entire request, which may not be desirable.
+                allowed_objects = self.model.objects.filter(attrs)
+                qs = self.filter(pk__in=allowed_objects)
+            else:
+                qs = self.filter(attrs)
 
         return qs
+
+
+def chunked_iterator(queryset, chunk_size=2000):
+    """
+    Iterate over the objects in a QuerySet without caching the entire result set in memory, retrieving them from the
+    database in chunks of the given size. Unlike QuerySet.iterator(), the QuerySet's prefetch_related() lookups are
+    applied to each chunk.
+    """
+    iterator = queryset.iterator(chunk_size=chunk_size)
+    while chunk := list(islice(iterator, chunk_size)):
+        if queryset._prefetch_related_lookups:
+            prefetch_related_objects(chunk, *queryset._prefetch_related_lookups)
+        yield from chunk
+
+
+class ChunkedQuerySet:
+    """
+    A proxy for a QuerySet which retrieves objects in chunks when iterated (see chunked_iterator()). This allows a
+    template to loop over a large QuerySet in constant memory. All other attributes are passed through to the
+    underlying QuerySet.
+    """
+    def __init__(self, queryset, chunk_size=2000):
+        self._queryset = queryset
+        self._chunk_size = chunk_size
+
+    def __iter__(self):
+        return chunked_iterator(self._queryset, self._chunk_size)
+
+    def __len__(self):
+        return self._queryset.count()
+
+    def __bool__(self):
+        return self._queryset.exists()
+
+    def __getitem__(self, k):
+        return self._queryset[k]
+
+    def __getattr__(self, name):
+        return getattr(self._queryset, name)
@@ -1,5 +1,6 @@
 from .api import *
 from .base import *
+from .benchmark import *
 from .filtersets import *
 from .utils import *
 from .views import *
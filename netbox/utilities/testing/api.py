@@ -154,6 +154,25 @@ class APIViewTestCases:
             self.assertEqual(len(response.data['results']), self._get_queryset().count())
             self.assertEqual(sorted(response.data['results'][0]), self.brief_fields)
 
+        @override_settings(EXEMPT_VIEW_PERMISSIONS=[])
+        def test_list_objects_cursor(self):
+            """
+            GET a list of objects one page at a time, using cursor pagination.
+            """
+            self.add_permissions(f'{self.model._meta.app_label}.view_{self.model._meta.model_name}')
+            url = f'{self._get_list_url()}?cursor=&limit=1'
+            pks = []
+
+            while url:
+                response = self.client.get(url, **self.header)
+                self.assertHttpStatus(response, status.HTTP_200_OK)
+                self.assertIsNone(response.data['count'])
+                pks.extend(result['id'] for result in response.data['results'])
+                url = response.data['next']
+
+            # Each object must be returned exactly once
+            self.assertEqual(sorted(pks), sorted(self._get_queryset().values_list('pk', flat=True)))
+
         @override_settings(EXEMPT_VIEW_PERMISSIONS=[])
         def test_list_objects_without_permission(self):
             """
@@ -0,0 +1,65 @@
+import time
+
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+
+__all__ = (
+    'BenchmarkTestCase',
+    'TransactionBenchmarkTestCase',
+)
+
+
+class BenchmarkMixin:
+    """
+    Records the number of database queries and the wall time consumed by each call to benchmark(), and reports them
+    once all tests in the class have completed.
+    """
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls._results = []
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        if cls._results:
+            print(f'\n{cls.__module__}.{cls.__name__}')
+            print(f'  {"Benchmark":<60} {"Queries":>10} {"Time (ms)":>12}')
+            for name, queries, elapsed in cls._results:
+                print(f'  {name:<60} {queries:>10} {elapsed * 1000:>12.1f}')
+
+    def benchmark(self, name, func, *args, **kwargs):
+        """
+        Call func with the given arguments and record the number of queries executed and the time taken under the given
+        name. Returns the result of func.
+        """
+        with CaptureQueriesContext(connection) as queries:
+            start = time.perf_counter()
+            result = func(*args, **kwargs)
+            elapsed = time.perf_counter() - start
+        self._results.append((name, len(queries), elapsed))
+
+        return result
+
+
+class BenchmarkTestCase(BenchmarkMixin, TestCase):
+    """
+    Base class for performance benchmarks. Benchmarks are kept in modules named benchmarks.py (rather than test_*.py)
+    so that they are excluded from normal test discovery. Run them explicitly, e.g.:
+
+        ./manage.py test dcim.tests.benchmarks
+
+    The number of database queries and the wall time consumed by each call to benchmark() are reported once all tests
+    in the class have completed.
+    """
+    pass
+
+
+class TransactionBenchmarkTestCase(BenchmarkMixin, TransactionTestCase):
+    """
+    Base class for benchmarks which exercise concurrent database connections (e.g. from multiple threads). Unlike
+    BenchmarkTestCase, data is committed, so that it is visible to all connections; the database is restored once
+    each test completes. Only queries executed by the main thread's connection are counted.
+    """
+    serialized_rollback = True
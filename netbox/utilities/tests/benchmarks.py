@@ -0,0 +1,91 @@
+import json
+
+from django.contrib.auth.models import User
+from django.contrib.contenttypes.models import ContentType
+from django.core.serializers import serialize
+from django.db import connection
+from django.test import override_settings
+
+from dcim.models import Device, Region, Site
+from extras.models import Tag
+from users.models import ObjectPermission
+from utilities.testing import BenchmarkTestCase
+from utilities.utils import count_related, serialize_object, serialize_objects
+
+
+class SerializeObjectBenchmark(BenchmarkTestCase):
+    """
+    Compare serialize_object() and serialize_objects() with a round trip through Django's JSON serializer, for many
+    tagged objects.
+    """
+    OBJECTS = 1000
+
+    @classmethod
+    def setUpTestData(cls):
+        tag = Tag.objects.create(name='Tag 1', slug='tag-1')
+        Site.objects.bulk_create([Site(name=f'Site {i}', slug=f'site-{i}') for i in range(cls.OBJECTS)])
+        for site in Site.objects.all():
+            site.tags.add(tag)
+
+    def test_serialize(self):
+        sites = list(Site.objects.all())
+
+        def legacy_serialize():
+            return [
+                {**json.loads(serialize('json', [site]))[0]['fields'], 'tags': [t.name for t in site.tags.all()]}
+                for site in sites
+            ]
+
+        self.benchmark(f'serialize() + json.loads() ({self.OBJECTS} objects)', legacy_serialize)
+        self.benchmark(
+            f'serialize_object() ({self.OBJECTS} objects)', lambda: [serialize_object(site) for site in sites]
+        )
+        data = self.benchmark(f'serialize_objects() ({self.OBJECTS} objects)', serialize_objects, sites)
+        self.assertEqual(data, [serialize_object(site) for site in sites])
+
+
+@override_settings(EXEMPT_VIEW_PERMISSIONS=[])
+class RestrictBenchmark(BenchmarkTestCase):
+    """
+    Compare listing objects as a superuser with listing them as a user whose permission is constrained, with the
+    constraints applied directly and via a subquery.
+    """
+    OBJECTS = 50000
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.superuser = User.objects.create_superuser(username='superuser')
+        cls.user = User.objects.create_user(username='testuser')
+        regions = [Region.objects.create(name=f'Region {i}', slug=f'region-{i}') for i in range(2)]
+        Site.objects.bulk_create([
+            Site(name=f'Site {i}', slug=f'site-{i}', region=regions[i % 2]) for i in range(cls.OBJECTS)
+        ])
+
+        obj_perm = ObjectPermission.objects.create(
+            name='Test permission',
+            constraints=[{'region__slug': 'region-0'}, {'region__slug': 'region-1', 'name__endswith': '1'}],
+            actions=['view']
+        )
+        obj_perm.users.add(cls.user)
+        obj_perm.object_types.add(ContentType.objects.get_for_model(Site))
+
+        # Collect planner statistics for the new rows, as autovacuum would
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+
+    def test_list(self):
+
+        def list_sites(user, **kwargs):
+            queryset = Site.objects.annotate(
+                device_count=count_related(Device, 'site')
+            ).restrict(user, 'view', **kwargs).order_by('name')
+            return queryset.count(), list(queryset[:50])
+
+        # Load the user's permissions beforehand
+        self.user.get_all_permissions()
+
+        self.benchmark('List sites (superuser)', list_sites, self.superuser)
+        count, sites = self.benchmark('List sites (constrained, subquery)', list_sites, self.user, subquery=True)
+        self.assertEqual((count, len(sites)), (30000, 50))
+        count, sites = self.benchmark('List sites (constrained, direct)', list_sites, self.user)
+        self.assertEqual((count, len(sites)), (30000, 50))
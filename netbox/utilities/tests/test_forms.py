@@ -2,8 +2,9 @@ from django import forms
 from django.test import TestCase
 
 from ipam.forms import IPAddressCSVForm
+from ipam.models import VRF
 from utilities.forms.fields import CSVDataField
-from utilities.forms.utils import expand_alphanumeric_pattern, expand_ipaddress_pattern
+from utilities.forms.utils import expand_alphanumeric_pattern, expand_ipaddress_pattern, prefetch_csv_objects
 
 
 class ExpandIPAddress(TestCase):
@@ -365,3 +366,34 @@ class CSVDataFieldTest(TestCase):
         """
         with self.assertRaises(forms.ValidationError):
             self.field.clean(input)
+
+
+class PrefetchCSVObjectsTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        VRF.objects.bulk_create((
+            VRF(name='VRF 1', rd='65000:1'),
+            VRF(name='VRF 2', rd='65000:2'),
+        ))
+
+    def test_prefetch_objects(self):
+        forms = [
+            IPAddressCSVForm({'address': f'192.0.2.{i}/24', 'status': 'active', 'vrf': f'VRF {i % 2 + 1}'})
+            for i in range(1, 5)
+        ]
+        # A single query (within a savepoint) retrieves all VRFs
+        with self.assertNumQueries(3):
+            prefetch_csv_objects(forms)
+
+        # Related objects are resolved without further queries
+        with self.assertNumQueries(0):
+            vrfs = [form.fields['vrf'].clean(form.data['vrf']) for form in forms]
+        self.assertEqual([vrf.name for vrf in vrfs], ['VRF 2', 'VRF 1', 'VRF 2', 'VRF 1'])
+
+    def test_prefetch_objects_not_found(self):
+        form = IPAddressCSVForm({'address': '192.0.2.1/24', 'status': 'active', 'vrf': 'VRF 3'})
+        prefetch_csv_objects([form])
+
+        self.assertFalse(form.is_valid())
+        self.assertIn('vrf', form.errors)
@@ -0,0 +1,109 @@
+from django.contrib.contenttypes.models import ContentType
+from django.test import override_settings
+
+from dcim.models import Region, Site
+from extras.models import Tag
+from users.models import ObjectPermission
+from utilities.querysets import _lookup_is_multivalued, ChunkedQuerySet, chunked_iterator
+from utilities.testing import TestCase
+
+
+@override_settings(EXEMPT_VIEW_PERMISSIONS=[])
+class RestrictedQuerySetTestCase(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        regions = (
+            Region.objects.create(name='Region 1', slug='region-1'),
+            Region.objects.create(name='Region 2', slug='region-2'),
+        )
+        sites = (
+            Site(name='Site 1', slug='site-1', region=regions[0]),
+            Site(name='Site 2', slug='site-2', region=regions[0]),
+            Site(name='Site 3', slug='site-3', region=regions[1]),
+        )
+        Site.objects.bulk_create(sites)
+
+        tags = (
+            Tag.objects.create(name='Tag 1', slug='tag-1'),
+            Tag.objects.create(name='Tag 2', slug='tag-2'),
+        )
+        sites[0].tags.set(tags)
+        sites[2].tags.set(tags[1:])
+
+    def add_constraints(self, constraints, model=Site):
+        obj_perm = ObjectPermission.objects.create(name='Test permission', constraints=constraints, actions=['view'])
+        obj_perm.users.add(self.user)
+        obj_perm.object_types.add(ContentType.objects.get_for_model(model))
+
+    def test_restrict_without_permission(self):
+        self.assertFalse(Site.objects.restrict(self.user, 'view').exists())
+
+    def test_restrict_direct(self):
+        self.add_constraints([{'region__name': 'Region 1'}, {'name': 'Site 3'}])
+        queryset = Site.objects.restrict(self.user, 'view')
+
+        # Constraints which follow only foreign keys are applied directly, rather than via a subquery
+        self.assertEqual(str(queryset.query).count('SELECT'), 1)
+        self.assertEqual(sorted(queryset.values_list('name', flat=True)), ['Site 1', 'Site 2', 'Site 3'])
+
+    def test_restrict_many_to_many(self):
+        self.add_constraints({'tags__slug__in': ['tag-1', 'tag-2']})
+        queryset = Site.objects.restrict(self.user, 'view')
+
+        # Each matching object must be returned only once
+        self.assertEqual(str(queryset.query).count('SELECT'), 2)
+        self.assertEqual(sorted(queryset.values_list('name', flat=True)), ['Site 1', 'Site 3'])
+
+    def test_restrict_reverse_relation(self):
+        self.add_constraints({'sites__name__in': ['Site 1', 'Site 2']}, model=Region)
+        queryset = Region.objects.restrict(self.user, 'view')
+
+        self.assertEqual(str(queryset.query).count('SELECT'), 2)
+        self.assertEqual(list(queryset.values_list('name', flat=True)), ['Region 1'])
+
+    def test_restrict_subquery(self):
+        self.add_constraints({'region__name': 'Region 2'})
+
+        queryset = Site.objects.restrict(self.user, 'view', subquery=True)
+        self.assertEqual(str(queryset.query).count('SELECT'), 2)
+        self.assertEqual(list(queryset.values_list('name', flat=True)), ['Site 3'])
+
+        queryset = Site.objects.restrict(self.user, 'view', subquery=False)
+        self.assertEqual(str(queryset.query).count('SELECT'), 1)
+        self.assertEqual(list(queryset.values_list('name', flat=True)), ['Site 3'])
+
+    def test_lookup_is_multivalued(self):
+        self.assertFalse(_lookup_is_multivalued(Site, 'name__iexact'))
+        self.assertFalse(_lookup_is_multivalued(Site, 'region__pk__in'))
+        self.assertTrue(_lookup_is_multivalued(Site, 'tags__slug'))
+        self.assertTrue(_lookup_is_multivalued(Region, 'sites__name'))
+
+        # An intermediate name which cannot be resolved is treated as multivalued
+        self.assertTrue(_lookup_is_multivalued(Site, 'unknown__name'))
+
+
+class ChunkedIteratorTestCase(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        region = Region.objects.create(name='Region 1', slug='region-1')
+        Site.objects.bulk_create([Site(name=f'Site {i}', slug=f'site-{i}', region=region) for i in range(1, 6)])
+
+    def test_chunked_iterator(self):
+        queryset = Site.objects.prefetch_related('region').order_by('name')
+
+        # One query to retrieve the sites, plus one for each chunk of two sites to prefetch their regions
+        with self.assertNumQueries(4):
+            sites = list(chunked_iterator(queryset, chunk_size=2))
+            self.assertEqual([site.region.name for site in sites], ['Region 1'] * 5)
+        self.assertEqual(sites, list(queryset))
+
+    def test_chunked_queryset(self):
+        queryset = ChunkedQuerySet(Site.objects.order_by('name'), chunk_size=2)
+
+        self.assertEqual([site.name for site in queryset], [f'Site {i}' for i in range(1, 6)])
+        self.assertEqual(len(queryset), 5)
+        self.assertEqual(queryset[0].name, 'Site 1')
+        self.assertEqual(queryset.filter(name='Site 2').count(), 1)
+        self.assertFalse(ChunkedQuerySet(Site.objects.none()))
@@ -1,7 +1,17 @@
+import json
+from decimal import Decimal
+
+from django.contrib.contenttypes.models import ContentType
+from django.core.serializers import serialize
 from django.http import QueryDict
 from django.test import TestCase
+from mptt.models import MPTTModel
 
-from utilities.utils import deepmerge, dict_to_filter_params, normalize_querydict
+from dcim.models import Region, Site
+from extras.choices import CustomFieldTypeChoices
+from extras.models import ConfigContext, CustomField, Tag
+from ipam.models import ASN, RIR
+from utilities.utils import deepmerge, dict_to_filter_params, normalize_querydict, serialize_object, serialize_objects
 
 
 class DictToFilterParamsTest(TestCase):
@@ -128,3 +138,71 @@ class DeepMergeTest(TestCase):
             deepmerge(dict1, dict2),
             merged
         )
+
+
+class SerializeObjectTest(TestCase):
+    """
+    Validate that serialize_object() and serialize_objects() produce output identical to that of Django's built-in
+    JSON serializer.
+    """
+    @classmethod
+    def setUpTestData(cls):
+        cf = CustomField.objects.create(name='cf1', type=CustomFieldTypeChoices.TYPE_DATE)
+        cf.content_types.set([ContentType.objects.get_for_model(Site)])
+        tags = (
+            Tag.objects.create(name='Tag B', slug='tag-b'),
+            Tag.objects.create(name='Tag A', slug='tag-a'),
+        )
+        rir = RIR.objects.create(name='RIR 1', slug='rir-1')
+        asns = (
+            ASN.objects.create(asn=65002, rir=rir),
+            ASN.objects.create(asn=65001, rir=rir),
+        )
+
+        region = Region.objects.create(name='Region 1', slug='region-1')
+        sites = (
+            Site(
+                name='Site 1', slug='site-1', region=region, latitude=Decimal('12.345678'), time_zone='UTC',
+                custom_field_data={'cf1': '2022-01-01'}
+            ),
+            Site(name='Site 2', slug='site-2'),
+        )
+        for site in sites:
+            site.save()
+        sites[0].tags.set(tags)
+        sites[0].asns.set(asns)
+
+        configcontext = ConfigContext.objects.create(name='Config Context 1', data={'a': [1, 2.5, None, {'b': 'c'}]})
+        configcontext.regions.set([region])
+
+    @staticmethod
+    def legacy_serialize_object(obj):
+        data = json.loads(serialize('json', [obj]))[0]['fields']
+        if isinstance(obj, MPTTModel):
+            for field in ['level', 'lft', 'rght', 'tree_id']:
+                data.pop(field)
+        if hasattr(obj, 'custom_field_data'):
+            data['custom_fields'] = data.pop('custom_field_data')
+        if hasattr(obj, 'tags'):
+            data['tags'] = sorted([tag.name for tag in obj.tags.all()])
+        return {k: v for k, v in data.items() if not k.startswith('_')}
+
+    def test_serialize_object(self):
+        for model in (Site, Region, ConfigContext):
+            for obj in model.objects.all():
+                self.assertEqual(
+                    json.dumps(serialize_object(obj)),
+                    json.dumps(self.legacy_serialize_object(obj))
+                )
+
+    def test_serialize_objects(self):
+        for model in (Site, Region, ConfigContext):
+            objects = list(model.objects.all())
+            ContentType.objects.get_for_model(model)
+            # One query for each many-to-many relationship (including tags)
+            with self.assertNumQueries(len(model._meta.local_many_to_many)):
+                data = serialize_objects(objects)
+            self.assertEqual(
+                json.dumps(data),
+                json.dumps([self.legacy_serialize_object(obj) for obj in objects])
+            )
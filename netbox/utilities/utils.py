@@ -1,14 +1,18 @@
+import csv
 import datetime
 import decimal
+import io
 import json
 from decimal import Decimal
 from itertools import count, groupby
 
 import bleach
-from django.core.serializers import serialize
+from django.contrib.contenttypes.models import ContentType
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db.models import Count, OuterRef, Subquery
 from django.db.models.functions import Coalesce
 from django.http import QueryDict
+from django.utils.encoding import is_protected_type
 from jinja2.sandbox import SandboxedEnvironment
 from mptt.models import MPTTModel
 
@@ -82,6 +86,23 @@ def csv_format(data):
     return ','.join(csv)
 
 
+def csv_rows(rows, buffer_size=65536):
+    """
+    Encode an iterable of rows as CSV data (in the default dialect of Python's csv module), yielding the encoded rows
+    in chunks of approximately the given size (in characters).
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow(row)
+        if buffer.tell() >= buffer_size:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
 def foreground_color(bg_color, dark='000000', light='ffffff'):
     """
     Return the ideal foreground color (dark or light) for a given background color in hexadecimal RGB format.
@@ -126,15 +147,50 @@ def count_related(model, field):
     return Coalesce(subquery, 0)
 
 
-def serialize_object(obj, extra=None):
+_serialized_fields = {}
+_json_encoder = DjangoJSONEncoder()
+
+
+def _get_serialized_fields(model):
+    """
+    Return the concrete fields and many-to-many fields of the given model which are included by serialize_object(), as
+    selected by Django's built-in serializer. These are cached per model.
+    """
+    if model not in _serialized_fields:
+        opts = model._meta.concrete_model._meta
+        _serialized_fields[model] = (
+            [field for field in opts.local_fields if field.serialize],
+            [
+                field for field in opts.local_many_to_many
+                if field.serialize and field.remote_field.through._meta.auto_created
+            ],
+        )
+    return _serialized_fields[model]
+
+
+def _serialize_field_value(obj, field):
     """
-    Return a generic JSON representation of an object using Django's built-in serializer. (This is used for things like
-    change logging, not the REST API.) Optionally include a dictionary to supplement the object data. A list of keys
-    can be provided to exclude them from the returned dictionary. Private fields (prefaced with an underscore) are
-    implicitly excluded.
+    Return the value of the given field on obj as it would be represented after a round trip through Django's JSON
+    serializer.
     """
-    json_str = serialize('json', [obj])
-    data = json.loads(json_str)[0]['fields']
+    value = field.value_from_object(obj)
+    if is_protected_type(value):
+        # Dates, times, and decimals are rendered as strings; all other protected types are native to JSON
+        if isinstance(value, (datetime.date, datetime.time, Decimal)):
+            return _json_encoder.default(value)
+        return value
+    value = field.value_to_string(obj)
+    if not isinstance(value, str):
+        # Some fields (e.g. JSONField) return structured data rather than a string
+        value = json.loads(json.dumps(value, cls=DjangoJSONEncoder))
+    return value
+
+
+def _serialize(obj, m2m_values, tags, extra):
+    fields, m2m_fields = _get_serialized_fields(obj.__class__)
+    data = {field.name: _serialize_field_value(obj, field) for field in fields}
+    for field in m2m_fields:
+        data[field.name] = m2m_values[field.name]
 
     # Exclude any MPTTModel fields
     if issubclass(obj.__class__, MPTTModel):
@@ -145,9 +201,8 @@ def serialize_object(obj, extra=None):
     if hasattr(obj, 'custom_field_data'):
         data['custom_fields'] = data.pop('custom_field_data')
 
-    # Include any tags. Check for tags cached on the instance; fall back to using the manager.
-    if is_taggable(obj):
-        tags = getattr(obj, '_tags', None) or obj.tags.all()
+    # Include any tags
+    if tags is not None:
         data['tags'] = sorted([tag.name for tag in tags])
 
     # Append any extra data
@@ -163,6 +218,81 @@ def serialize_object(obj, extra=None):
     return data
 
 
+def serialize_object(obj, extra=None):
+    """
+    Return a generic JSON representation of an object, equivalent to that produced by Django's built-in serializer.
+    (This is used for things like change logging, not the REST API.) Optionally include a dictionary to supplement the
+    object data. A list of keys can be provided to exclude them from the returned dictionary. Private fields (prefaced
+    with an underscore) are implicitly excluded.
+    """
+    m2m_values = {}
+    prefetched = getattr(obj, '_prefetched_objects_cache', {})
+    for field in _get_serialized_fields(obj.__class__)[1]:
+        related_objects = prefetched.get(field.name, getattr(obj, field.name).iterator())
+        m2m_values[field.name] = [
+            _serialize_field_value(related, related._meta.pk) for related in related_objects
+        ]
+
+    # Include any tags. Check for tags cached on the instance; fall back to using the manager.
+    tags = None
+    if is_taggable(obj):
+        tags = getattr(obj, '_tags', None) or obj.tags.all()
+
+    return _serialize(obj, m2m_values, tags, extra)
+
+
+def serialize_objects(objects, extra=None):
+    """
+    Serialize a list of objects of the same model as serialize_object() would. Tags and many-to-many assignments not
+    already cached on the instances are retrieved for all objects at once, rather than individually.
+    """
+    if not objects:
+        return []
+    model = objects[0].__class__
+    pks = [obj.pk for obj in objects]
+
+    # Retrieve many-to-many assignments, in the order in which the related managers would return them
+    m2m_values = {pk: {} for pk in pks}
+    for field in _get_serialized_fields(model)[1]:
+        if field.remote_field.is_hidden():
+            # No reverse relation to query; fall back to the related manager of each object
+            for obj in objects:
+                m2m_values[obj.pk][field.name] = [related.pk for related in getattr(obj, field.name).iterator()]
+            continue
+        query_name = field.related_query_name()
+        for pk in pks:
+            m2m_values[pk][field.name] = []
+        for pk, related_pk in field.related_model._default_manager.filter(
+            **{f'{query_name}__in': pks}
+        ).values_list(query_name, 'pk'):
+            m2m_values[pk][field.name].append(related_pk)
+    for obj in objects:
+        for name, related_objects in getattr(obj, '_prefetched_objects_cache', {}).items():
+            if name in m2m_values[obj.pk]:
+                m2m_values[obj.pk][name] = [related.pk for related in related_objects]
+
+    # Retrieve tags for all objects which have none cached
+    tags = {pk: None for pk in pks}
+    if is_taggable(objects[0]):
+        uncached = {
+            obj.pk for obj in objects
+            if not getattr(obj, '_tags', None) and 'tags' not in getattr(obj, '_prefetched_objects_cache', {})
+        }
+        tagged_items = model.tags.through.objects.filter(
+            content_type=ContentType.objects.get_for_model(model),
+            object_id__in=uncached
+        ).select_related('tag') if uncached else []
+        for pk in pks:
+            tags[pk] = []
+        for tagged_item in tagged_items:
+            tags[tagged_item.object_id].append(tagged_item.tag)
+        for obj in objects:
+            if obj.pk not in uncached:
+                tags[obj.pk] = getattr(obj, '_tags', None) or obj.tags.all()
+
+    return [_serialize(obj, m2m_values[obj.pk], tags[obj.pk], extra) for obj in objects]
+
+
 def dict_to_filter_params(d, prefix=''):
     """
     Translate a dictionary of attributes to a nested set of parameters suitable for QuerySet filtering. For example:
@@ -270,13 +400,20 @@ def to_meters(length, unit):
     raise ValueError(f"Unknown unit {unit}. Must be 'km', 'm', 'cm', 'mi', 'ft', or 'in'.")
 
 
-def render_jinja2(template_code, context):
+def compile_jinja2(template_code):
     """
-    Render a Jinja2 template with the provided context. Return the rendered content.
+    Compile and return a sandboxed Jinja2 template from the provided template code.
     """
     environment = SandboxedEnvironment()
     environment.filters.update(get_config().JINJA2_FILTERS)
-    return environment.from_string(source=template_code).render(**context)
+    return environment.from_string(source=template_code)
+
+
+def render_jinja2(template_code, context):
+    """
+    Render a Jinja2 template with the provided context. Return the rendered content.
+    """
+    return compile_jinja2(template_code).render(**context)
 
 
 def prepare_cloned_fields(instance):
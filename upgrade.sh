@@ -93,6 +93,11 @@ COMMAND="mkdocs build"
 echo "Building documentation ($COMMAND)..."
 eval $COMMAND || exit 1
 
+# Rebuild the search index
+COMMAND="python3 netbox/manage.py reindex"
+echo "Rebuilding the search index ($COMMAND)..."
+eval $COMMAND || exit 1
+
 # Collect static files
 COMMAND="python3 netbox/manage.py collectstatic --no-input"
 echo "Collecting static files ($COMMAND)..."